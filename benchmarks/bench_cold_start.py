@@ -0,0 +1,114 @@
+"""コールドスタートの所要時間とメモリ使用量を計測するベンチマーク.
+
+新しいPythonプロセスで`import lambda_handler`から最初の検索が完了するまでを、
+ニュース取得モード（trend/positive）と感情分析の方式ごとに計測します.
+GNewsと記事の取得はスタブに置き換えるため、ネットワークには接続しません.
+
+使い方:
+    python benchmarks/bench_cold_start.py [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# 子プロセスで実行するスクリプト（各段階の経過時間と最大RSSをJSONで出力）
+CHILD_SCRIPT = """
+import json, resource, time
+start = time.perf_counter()
+marks = {}
+
+def mark(name):
+    marks[name] = {
+        "seconds": time.perf_counter() - start,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+import lambda_handler
+mark("import")
+
+from datetime import datetime
+from services.google_news import GoogleNewsScraper
+from services.notion import NotionClient
+
+scraper = GoogleNewsScraper()
+NotionClient(seen_urls=scraper.seen_urls)
+mark("init")
+
+published = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")
+scraper.gnews.get_news = lambda query: [
+    {"link": "https://example.com/a", "title": "研究が成功", "description": "画期的な発見",
+     "published date": published, "publisher": {"title": "example"}}
+]
+scraper.fetcher.fetch = lambda url, timeout: "研究チームは画期的な発見に成功した。" * 20
+scraper.search_news("ニュース 話題")
+mark("first_query")
+print(json.dumps(marks))
+"""
+
+
+def run_child(mode: str, strategy: str) -> Dict[str, Dict[str, float]]:
+    """新しいプロセスでコールドスタートを1回計測します.
+
+    Args:
+        mode: NEWS_MODEの値
+        strategy: SENTIMENT_STRATEGYの値
+
+    Returns:
+        Dict[str, Dict[str, float]]: 段階ごとの経過時間（秒）と最大RSS（MB）
+    """
+    env = dict(
+        os.environ,
+        NEWS_MODE=mode,
+        SENTIMENT_STRATEGY=strategy,
+        CACHE_ENABLED="false",
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数（中央値を表示）")
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':>9} {'strategy':>10} {'import(s)':>10} {'init(s)':>8} "
+        f"{'first query(s)':>15} {'RSS(MB)':>8}"
+    )
+    for mode, strategy in (
+        ("trend", "dictionary"),
+        ("positive", "dictionary"),
+        ("positive", "janome"),
+    ):
+        runs: List[Dict[str, Dict[str, float]]] = [
+            run_child(mode, strategy) for _ in range(args.repeat)
+        ]
+
+        def median(stage: str, key: str) -> float:
+            values = sorted(run[stage][key] for run in runs)
+            return values[len(values) // 2]
+
+        print(
+            f"{mode:>9} {strategy:>10} {median('import', 'seconds'):>10.2f} "
+            f"{median('init', 'seconds'):>8.2f} {median('first_query', 'seconds'):>15.2f} "
+            f"{median('first_query', 'rss_mb'):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""記事本文の逐次取得と並列取得の実行時間を比較するベンチマーク.
+
+ローカルのモックHTTPサーバーに対して、5/25/100件のURLを
+逐次取得した場合とArticleFetcherで並列取得した場合の所要時間を計測します.
+
+使い方:
+    python benchmarks/bench_concurrent_fetch.py [--latency 0.2] [--hosts 10]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from services.google_news import GoogleNewsScraper  # noqa: E402
+
+HTML = (
+    '<html><head><meta name="description" content="{path} のモック記事です。"></head>'
+    '<body><article class="article">本文</article></body></html>'
+)
+
+
+def start_server(latency: float) -> ThreadingHTTPServer:
+    """応答ごとに指定秒数だけ待機するモックHTTPサーバーを起動します.
+
+    Args:
+        latency: 1リクエストあたりの応答遅延（秒）
+
+    Returns:
+        ThreadingHTTPServer: 起動したサーバー
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            time.sleep(latency)
+            body = HTML.format(path=self.path).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_urls(port: int, count: int, hosts: int) -> List[str]:
+    """複数のループバックアドレスに分散したURLを生成します.
+
+    Args:
+        port: サーバーのポート番号
+        count: URL数
+        hosts: 分散させるホスト数
+
+    Returns:
+        List[str]: URLのリスト
+    """
+    return [f"http://127.0.0.{i % hosts + 1}:{port}/article/{i}" for i in range(count)]
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2, help="応答遅延（秒）")
+    parser.add_argument("--hosts", type=int, default=10, help="分散させるホスト数")
+    args = parser.parse_args()
+
+    server = start_server(args.latency)
+    port = server.server_address[1]
+    scraper = GoogleNewsScraper()
+    fetcher = scraper.fetcher
+
+    print(
+        f"latency={args.latency}s hosts={args.hosts} "
+        f"workers={fetcher.max_workers} per_host={fetcher.max_per_host}"
+    )
+    print(f"{'urls':>5} {'sequential(s)':>14} {'concurrent(s)':>14} {'speedup':>8}")
+    for count in (5, 25, 100):
+        urls = build_urls(port, count, args.hosts)
+
+        start = time.perf_counter()
+        sequential = [scraper._extract_article_content(url) for url in urls]
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = fetcher.fetch_all(urls)
+        concurrent_time = time.perf_counter() - start
+
+        assert sequential == concurrent, "並列取得の結果が逐次取得と一致しません"
+        print(
+            f"{count:>5} {sequential_time:>14.2f} {concurrent_time:>14.2f} "
+            f"{sequential_time / concurrent_time:>7.1f}x"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""記事の解析をプロセスプールで行った場合のワーカー数ごとの処理速度を計測するベンチマーク.
+
+合成した記事ページのHTMLを、記事の取得と同じく複数のスレッドからCPUPool.extractに渡して
+本文を抽出し、続けてCPUPool.analyzeで本文の判定・MinHash・感情分析を行います.
+ワーカー数1はプロセスプールを使用しない従来の処理です. 高速化の度合いはマシンのコア数に依存します.
+
+使い方:
+    python benchmarks/bench_cpu_pool.py [--pages 200] [--workers 1 2 4 8] [--page-kb 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+from config.settings import MAX_FETCH_WORKERS  # noqa: E402
+from services.article import Article  # noqa: E402
+from services.cpu_pool import CPUPool  # noqa: E402
+
+SENTENCES = [
+    "研究チームは新しい技術の開発に成功したと発表した。",
+    "地域の活性化に向けた取り組みが始まり、住民からは期待の声が上がっている。",
+    "同社は来年度から新サービスの提供を開始する予定だ。",
+    "専門家は今回の成果が今後の研究に大きく貢献すると評価している。",
+]
+
+
+def build_pages(count: int, page_kb: int, seed: int) -> List[bytes]:
+    """本文の前後に大きなナビゲーションやスクリプトを含む記事ページを生成します.
+
+    Args:
+        count: ページ数
+        page_kb: 1ページのおおよそのサイズ（KB）
+        seed: 乱数のシード
+
+    Returns:
+        List[bytes]: HTMLのバイト列のリスト
+    """
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        body = "".join(f"<p>{rng.choice(SENTENCES)}{i}-{j}</p>" for j in range(40))
+        filler = "<li><a href='/x'>関連リンク</a></li>" * (page_kb * 1024 // 120)
+        pages.append(
+            (
+                f"<html><head><title>記事{i}</title></head><body><nav><ul>{filler}</ul></nav>"
+                f"<div class='article-body'>{body}</div><footer>フッター</footer></body></html>"
+            ).encode("utf-8")
+        )
+    return pages
+
+
+def run(workers: int, pages: List[bytes]) -> float:
+    """本文の抽出と判定を行い、所要時間を返します.
+
+    Args:
+        workers: ワーカープロセスの数
+        pages: HTMLのバイト列のリスト
+
+    Returns:
+        float: 所要時間（秒）。プロセスの起動時間は含めない
+    """
+    pool = CPUPool(workers)
+    if pool.enabled:
+        pool.analyze([Article("準備", "", "", datetime.now(), content="準備")] * workers, True)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as threads:
+        results = list(threads.map(lambda page: pool.extract(page, "utf-8"), pages))
+    contents = [content for content, _ in results]
+    articles = [
+        Article(f"記事{i}", f"https://example.com/{i}", "概要", datetime.now(), content=content)
+        for i, content in enumerate(contents)
+    ]
+    for i in range(0, len(articles), MAX_FETCH_WORKERS):
+        pool.analyze(articles[i : i + MAX_FETCH_WORKERS], True)
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return elapsed
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200, help="ページ数")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="ワーカー数")
+    parser.add_argument("--page-kb", type=int, default=200, help="1ページのおおよそのサイズ（KB）")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    args = parser.parse_args()
+
+    pages = build_pages(args.pages, args.page_kb, args.seed)
+    print(f"pages={args.pages} page_size={args.page_kb}KB cpus={os.cpu_count()}")
+    print(f"{'workers':>8} {'seconds':>8} {'pages/sec':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        elapsed = run(workers, pages)
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>8} {elapsed:>8.2f} {args.pages / elapsed:>10.1f} "
+            f"{baseline / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
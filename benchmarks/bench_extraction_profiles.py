@@ -0,0 +1,185 @@
+"""配信元ごとの抽出方法の有無による、1ページあたりの本文抽出時間を比較するベンチマーク.
+
+保存済みのページ（--fixturesで指定、省略時は合成したページ）について、
+配信元ごとに最初のページで抽出方法を学習し、次の2つの方法で全ページの抽出時間を計測します.
+
+- generic: 抽出方法を使わず、ページ全体を構文解析して主要なコンテンツ領域を探す
+- profile: 学習した抽出方法で、本文の要素だけを構文解析する
+
+--fixturesにはbench_replay.py recordで保存したディレクトリ（manifest.jsonで配信元を判定）か、
+HTMLファイルを置いたディレクトリ（ファイルごとに別の配信元とみなす）を指定します.
+
+使い方:
+    python benchmarks/bench_extraction_profiles.py [--fixtures DIR] [--publishers 20] [--repeat 3]
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+from config.settings import MAX_DOWNLOAD_BYTES  # noqa: E402
+from services.extractor import ExtractionProfile, extract_with_profile, parser_backend  # noqa: E402
+
+# 配信元ごとのページの構成（本文の要素名とクラス）
+TEMPLATES = [
+    ("div", "article-body"),
+    ("article", "post-content"),
+    ("div", "main-text"),
+    ("section", "story-body"),
+    ("div", "entry-content"),
+]
+SENTENCES = [
+    "研究チームは新しい技術の開発に成功したと発表した。",
+    "地域の活性化に向けた取り組みが始まり、住民からは期待の声が上がっている。",
+    "同社は来年度から新サービスの提供を開始する予定だ。",
+]
+SCRIPT = "<script>var x = {};" + "x['k'] = 'v';" * 200 + "</script>"
+
+# (配信元, ページ名, HTML)
+Fixture = Tuple[str, str, bytes]
+
+
+def synthetic_fixtures(publishers: int, pages: int, seed: int) -> List[Fixture]:
+    """配信元ごとに同じ構成の記事ページを生成します.
+
+    Args:
+        publishers: 配信元の数
+        pages: 配信元ごとのページ数
+        seed: 乱数のシード
+
+    Returns:
+        List[Fixture]: 配信元、ページ名、HTML
+    """
+    rng = random.Random(seed)
+    fixtures = []
+    for p in range(publishers):
+        tag, class_name = TEMPLATES[p % len(TEMPLATES)]
+        for i in range(pages):
+            body = "".join(f"<p>{rng.choice(SENTENCES)}{i}</p>" for _ in range(30))
+            nav = "".join(f"<li><a href='/c/{j}'>カテゴリ{j}</a></li>" for j in range(300))
+            related = "".join(f"<li><a href='/a/{j}'>関連記事{j}</a></li>" for j in range(100))
+            html = (
+                f"<html><head><meta charset='utf-8'><title>記事{i}</title>{SCRIPT * 5}</head>"
+                f"<body><header><nav><ul>{nav}</ul></nav></header>"
+                f"<{tag} class='{class_name} p{p}'>{body}{SCRIPT}</{tag}>"
+                f"<aside><ul>{related}</ul></aside><footer>{SCRIPT * 3}</footer></body></html>"
+            )
+            fixtures.append((f"publisher{p}.example", f"publisher{p}/{i}", html.encode("utf-8")))
+    return fixtures
+
+
+def load_fixtures(directory: str) -> List[Fixture]:
+    """保存済みのページを読み込みます.
+
+    Args:
+        directory: bench_replay.py recordの保存先、またはHTMLファイルのディレクトリ
+
+    Returns:
+        List[Fixture]: 配信元、ページ名、HTML
+    """
+    manifest_path = os.path.join(directory, "manifest.json")
+    fixtures = []
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        for url, page in manifest["pages"].items():
+            if page.get("status") != 200:
+                continue
+            with open(os.path.join(directory, "pages", page["file"]), "rb") as f:
+                fixtures.append((urlsplit(url).netloc.lower(), url, f.read()))
+        return fixtures
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        with open(path, "rb") as f:
+            name = os.path.basename(path)
+            fixtures.append((name, name, f.read()))
+    return fixtures
+
+
+def best_time(
+    data: bytes, profile: Optional[ExtractionProfile], repeat: int
+) -> Tuple[float, Optional[str], Optional[ExtractionProfile]]:
+    """1ページの抽出の最短時間を計測します.
+
+    Args:
+        data: HTML
+        profile: 抽出方法
+        repeat: 繰り返し回数
+
+    Returns:
+        Tuple[float, Optional[str], Optional[ExtractionProfile]]:
+            最短時間（秒）、抽出した本文、本文を抽出できた方法
+    """
+    best = float("inf")
+    result: Tuple[Optional[str], Optional[ExtractionProfile]] = (None, None)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract_with_profile(data, "utf-8", profile)
+        best = min(best, time.perf_counter() - start)
+    return best, result[0], result[1]
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", help="保存済みのページのディレクトリ")
+    parser.add_argument("--publishers", type=int, default=20, help="合成する配信元の数")
+    parser.add_argument("--pages", type=int, default=5, help="合成する配信元ごとのページ数")
+    parser.add_argument("--repeat", type=int, default=3, help="時間計測の繰り返し回数")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+    else:
+        fixtures = synthetic_fixtures(args.publishers, args.pages, args.seed)
+    fixtures = [(host, name, data[:MAX_DOWNLOAD_BYTES]) for host, name, data in fixtures]
+
+    # 配信元ごとに最初のページで抽出方法を学習する
+    profiles: Dict[str, ExtractionProfile] = {}
+    for host, _, data in fixtures:
+        if host not in profiles:
+            _, learned = extract_with_profile(data, "utf-8")
+            if learned is not None:
+                profiles[host] = learned
+
+    generic_total = profile_total = 0.0
+    same = fallbacks = 0
+    for host, _, data in fixtures:
+        generic, generic_content, _ = best_time(data, None, args.repeat)
+        profile = profiles.get(host)
+        with_profile, profile_content, succeeded = best_time(data, profile, args.repeat)
+        generic_total += generic
+        profile_total += with_profile
+        same += generic_content == profile_content
+        fallbacks += profile is not None and succeeded != profile
+
+    count = len(fixtures)
+    kinds: Dict[str, int] = {}
+    for profile in profiles.values():
+        kinds[profile.strategy] = kinds.get(profile.strategy, 0) + 1
+    print(
+        f"parser backend: {parser_backend()} pages={count} "
+        f"publishers={len({host for host, _, _ in fixtures})} profiles={kinds}"
+    )
+    if not count:
+        return
+    print(f"{'method':>8} {'total(s)':>9} {'per page(ms)':>13}")
+    print(f"{'generic':>8} {generic_total:>9.3f} {generic_total / count * 1000:>13.2f}")
+    print(f"{'profile':>8} {profile_total:>9.3f} {profile_total / count * 1000:>13.2f}")
+    print(
+        f"speedup={generic_total / profile_total:.2f}x same_content={same}/{count} "
+        f"fallbacks={fallbacks}"
+    )
+
+
+if __name__ == "__main__":
+    main()
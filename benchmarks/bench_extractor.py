@@ -0,0 +1,183 @@
+"""記事本文抽出の従来方式とストリーミング方式を比較するベンチマーク.
+
+保存済みのHTMLファイル（--fixturesで指定、省略時は合成したページ）について、
+従来の「全体を読み込んでhtml.parserで構文解析する」方式と、
+services.extractorの「上限付きストリーミング＋必要な場合だけ構文解析する」方式の
+1ページあたりの処理時間とピークメモリを比較します.
+
+使い方:
+    python benchmarks/bench_extractor.py [--fixtures DIR] [--repeat 5]
+"""
+
+import argparse
+import glob
+import io
+import os
+import re
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import requests  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+from config.settings import MAX_CONTENT_LENGTH  # noqa: E402
+from services.extractor import (  # noqa: E402
+    detect_encoding,
+    extract_content,
+    parser_backend,
+    read_html,
+)
+
+PARAGRAPH = "<p>研究チームは新しい技術の開発に成功したと発表した。今後の展開が期待される。</p>"
+SCRIPT = "<script>var x = {};" + "x['k'] = 'v';" * 200 + "</script>"
+
+
+def synthetic_fixtures() -> Dict[str, bytes]:
+    """合成したHTMLページを生成します.
+
+    Returns:
+        Dict[str, bytes]: ページ名とHTMLの対応
+    """
+    body = f'<article class="article-body">{PARAGRAPH * 40}</article>'
+    sidebar = f"<aside>{PARAGRAPH * 20}{SCRIPT}</aside>"
+    with_description = '<meta name="description" content="記事の概要です。">'
+
+    def page(head_extra: str, padding: int) -> bytes:
+        return (
+            f'<html><head><meta charset="utf-8"><title>記事</title>{SCRIPT * 5}{head_extra}</head>'
+            f"<body><nav>{'<a href=#>リンク</a>' * 200}</nav>{body}{sidebar * padding}</body></html>"
+        ).encode("utf-8")
+
+    return {
+        "small+description": page(with_description, 1),
+        "small": page("", 1),
+        "portal 3MB+description": page(with_description, 500),
+        "portal 3MB": page("", 500),
+    }
+
+
+def load_fixtures(directory: str) -> Dict[str, bytes]:
+    """ディレクトリ内の保存済みHTMLファイルを読み込みます.
+
+    Args:
+        directory: HTMLファイルのディレクトリ
+
+    Returns:
+        Dict[str, bytes]: ファイル名とHTMLの対応
+    """
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        with open(path, "rb") as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def make_response(data: bytes) -> requests.Response:
+    """HTMLを本文に持つレスポンスを生成します.
+
+    Args:
+        data: レスポンス本文
+
+    Returns:
+        requests.Response: ストリーミング読み込みできるレスポンス
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/html"
+    response.encoding = "ISO-8859-1"  # charsetなしのtext/htmlに対するrequestsの既定値
+    response.raw = io.BytesIO(data)
+    return response
+
+
+def legacy_extract(response: requests.Response) -> Optional[str]:
+    """従来の_extract_article_contentと同じ方法で本文を抽出します.
+
+    Args:
+        response: レスポンス
+
+    Returns:
+        Optional[str]: 抽出された本文
+    """
+    soup = BeautifulSoup(response.text, "html.parser")
+    meta_desc = soup.find("meta", {"name": "description"})
+    if meta_desc and meta_desc.get("content"):
+        return meta_desc.get("content")
+    main_content = soup.find(
+        ["article", "main", "div"], class_=re.compile(r"(article|content|main|body)")
+    )
+    if main_content:
+        for tag in main_content.find_all(["script", "style", "nav", "header", "footer"]):
+            tag.decompose()
+        text = " ".join(main_content.stripped_strings)
+        return re.sub(r"\s+", " ", text).strip()[:MAX_CONTENT_LENGTH]
+    return None
+
+
+def streaming_extract(response: requests.Response) -> Optional[str]:
+    """services.extractorで本文を抽出します.
+
+    Args:
+        response: レスポンス
+
+    Returns:
+        Optional[str]: 抽出された本文
+    """
+    html_bytes = read_html(response)
+    return extract_content(html_bytes, detect_encoding(response, html_bytes))
+
+
+def measure(
+    func: Callable[[requests.Response], Optional[str]], data: bytes, repeat: int
+) -> Dict[str, float]:
+    """1ページの抽出にかかる時間とピークメモリを計測します.
+
+    Args:
+        func: 抽出関数
+        data: HTML
+        repeat: 時間計測の繰り返し回数
+
+    Returns:
+        Dict[str, float]: 最短時間（ミリ秒）とピークメモリ（MB）
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        response = make_response(data)
+        start = time.perf_counter()
+        func(response)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(make_response(data))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ms": best * 1000, "mb": peak / 2**20}
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", help="保存済みHTMLファイルのディレクトリ")
+    parser.add_argument("--repeat", type=int, default=5, help="時間計測の繰り返し回数")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures()
+    print(f"parser backend: {parser_backend()}")
+    print(
+        f"{'page':>24} {'size(KB)':>9} {'legacy(ms)':>11} {'stream(ms)':>11} "
+        f"{'legacy(MB)':>11} {'stream(MB)':>11}"
+    )
+    for name, data in fixtures.items():
+        legacy = measure(legacy_extract, data, args.repeat)
+        streaming = measure(streaming_extract, data, args.repeat)
+        print(
+            f"{name[:24]:>24} {len(data) / 1024:>9.0f} {legacy['ms']:>11.1f} "
+            f"{streaming['ms']:>11.1f} {legacy['mb']:>11.1f} {streaming['mb']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
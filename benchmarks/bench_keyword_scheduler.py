@@ -0,0 +1,127 @@
+"""キーワードの逐次検索とKeywordSchedulerによる並行検索の所要時間を比較するベンチマーク.
+
+GNewsの検索と記事本文の取得を遅延付きのスタブに置き換え、
+従来の「検索→固定の待機→本文取得」を1キーワードずつ繰り返す方式と、
+レート制限付きで複数キーワードを並行して処理する方式の所要時間を計測します.
+クエリの間隔（--delay）は実際の設定値（3秒）より短くして計測時間を抑えています.
+
+使い方:
+    python benchmarks/bench_keyword_scheduler.py [--keywords 9] [--delay 0.5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+from services.google_news import GoogleNewsScraper  # noqa: E402
+from services.scheduler import KeywordScheduler  # noqa: E402
+from utils.rate_limit import TokenBucket  # noqa: E402
+
+CONTENT = "研究チームは新しい技術の開発に成功したと発表した。今後の展開が期待されている。" * 20
+
+
+def build_scraper(
+    search_latency: float, fetch_latency: float, delay: float, articles: int
+) -> GoogleNewsScraper:
+    """検索と本文取得をスタブに置き換えたスクレイパーを生成します.
+
+    Args:
+        search_latency: 1回の検索にかかる時間（秒）
+        fetch_latency: 1件の本文取得にかかる時間（秒）
+        delay: クエリの最小間隔（秒）
+        articles: 1回の検索で返す記事数
+
+    Returns:
+        GoogleNewsScraper: スタブを設定したスクレイパー
+    """
+    scraper = GoogleNewsScraper()
+    scraper.query_limiter = TokenBucket(1 / delay, capacity=1)
+    published = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+    def get_news(query: str) -> List[Dict[str, Any]]:
+        time.sleep(search_latency)
+        return [
+            {
+                "link": f"https://publisher{i}.example.com/{abs(hash(query))}",
+                "title": f"{query}の記事{i}",
+                "description": "記事の概要",
+                "published date": published,
+                "publisher": {"title": "example"},
+            }
+            for i in range(articles)
+        ]
+
+    def fetch(url: str, timeout: float) -> str:
+        time.sleep(fetch_latency)
+        return CONTENT
+
+    scraper.gnews.get_news = get_news
+    scraper.fetcher.fetch = fetch
+    return scraper
+
+
+def run_sequential(scraper: GoogleNewsScraper, queries: List[str], delay: float) -> int:
+    """従来と同じく1キーワードずつ検索し、検索ごとに固定時間待機します.
+
+    Args:
+        scraper: スクレイパー
+        queries: キーワードのリスト
+        delay: 検索ごとの待機時間（秒）
+
+    Returns:
+        int: 取得した記事数
+    """
+    scraper.query_limiter = TokenBucket(1e9)  # 待機はtime.sleepで行う
+    gnews_get_news = scraper.gnews.get_news
+
+    def get_news_and_sleep(query: str) -> List[Dict[str, Any]]:
+        results = gnews_get_news(query)
+        time.sleep(delay)
+        return results
+
+    scraper.gnews.get_news = get_news_and_sleep
+    return sum(len(scraper.search_news(query)) for query in queries)
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keywords", type=int, default=9, help="キーワード数")
+    parser.add_argument("--delay", type=float, default=0.5, help="クエリの最小間隔（秒）")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="検索の遅延（秒）")
+    parser.add_argument("--fetch-latency", type=float, default=0.5, help="本文取得の遅延（秒）")
+    parser.add_argument("--articles", type=int, default=10, help="1回の検索で返す記事数")
+    parser.add_argument("--workers", type=int, default=3, help="並行して処理するキーワード数")
+    args = parser.parse_args()
+
+    queries = [f"キーワード{i}" for i in range(args.keywords)]
+    stub = (args.search_latency, args.fetch_latency, args.delay, args.articles)
+
+    scraper = build_scraper(*stub)
+    start = time.perf_counter()
+    count = run_sequential(scraper, queries, args.delay)
+    sequential = time.perf_counter() - start
+    print(f"sequential: {sequential:.2f}s ({count} articles, {scraper.query_count} queries)")
+
+    scraper = build_scraper(*stub)
+    start = time.perf_counter()
+    count = len(
+        KeywordScheduler(scraper, workers=args.workers).run(
+            [(query, priority) for priority, query in enumerate(queries)]
+        )
+    )
+    scheduled = time.perf_counter() - start
+    print(
+        f"scheduler(workers={args.workers}): {scheduled:.2f}s "
+        f"({count} articles, {scraper.query_count} queries, {sequential / scheduled:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
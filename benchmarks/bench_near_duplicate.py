@@ -0,0 +1,119 @@
+"""近似重複の索引の読み込み時間・照合時間・メモリ使用量を計測するベンチマーク.
+
+10k/100k件の記事を登録した索引ファイルを作成し、コールドスタート時の読み込み時間、
+1件あたりの照合時間（登録済みの複製と未登録の記事）、読み込み後のメモリ使用量
+（tracemalloc）を計測します. あわせて1記事あたりのMinHash署名の計算時間も表示します.
+
+使い方:
+    python benchmarks/bench_near_duplicate.py [--sizes 10000 100000] [--lookups 10000]
+"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from services.near_duplicate import (  # noqa: E402
+    MAGIC,
+    NUM_BANDS,
+    RECORD_FORMAT,
+    NearDuplicateIndex,
+    band_keys,
+    minhash,
+)
+
+ARTICLE = (
+    "政府は18日、物価高への対応を柱とする新たな経済対策を閣議決定した。財政支出は約21兆円規模で、"
+    "電気・ガス料金の補助を来年3月まで延長するほか、低所得世帯への給付金を盛り込んだ。"
+    "首相は記者会見で「賃上げの流れを地方にも広げたい」と述べた。与党内からは規模の拡大を求める声も"
+    "上がっていたが、財源の確保が課題となる。補正予算案は臨時国会に提出される見通しだ。"
+)
+
+
+def write_index(path: str, size: int, rng: random.Random) -> None:
+    """ランダムなキーの記事をsize件登録した索引ファイルを作成します.
+
+    Args:
+        path: 索引ファイルのパス
+        size: 記事数
+        rng: 乱数生成器
+    """
+    now = int(time.time())
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for _ in range(size):
+            keys = [rng.getrandbits(32) for _ in range(NUM_BANDS)]
+            f.write(RECORD_FORMAT.pack(now, *keys))
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="登録件数")
+    parser.add_argument("--lookups", type=int, default=10000, help="照合する記事数")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for _ in range(100):
+        band_keys(minhash(ARTICLE))
+    print(f"minhash+band_keys: {(time.perf_counter() - start) * 10:.2f} ms/article")
+
+    print(
+        f"{'signatures':>10} {'file(KB)':>9} {'load(ms)':>9} {'memory(MB)':>11} "
+        f"{'hit(us)':>8} {'miss(us)':>9} {'false positives':>16}"
+    )
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"index_{size}.bin")
+            write_index(path, size, rng)
+
+            index = NearDuplicateIndex(path, ttl=24 * 60 * 60)
+            start = time.perf_counter()
+            index.load()
+            load_time = time.perf_counter() - start
+
+            # 読み込み後に保持しているメモリ（tracemalloc下では遅くなるため別に読み込む）
+            tracemalloc.start()
+            measured = NearDuplicateIndex(path, ttl=24 * 60 * 60)
+            measured.load()
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del measured
+
+            # 登録済みの記事と1バンドだけ一致する複製
+            with open(path, "rb") as f:
+                body = f.read()[len(MAGIC) :]
+            stored = [
+                RECORD_FORMAT.unpack_from(body, i * RECORD_FORMAT.size)[1:] for i in range(size)
+            ]
+            hits = [
+                tuple(keys[0:1]) + tuple(rng.getrandbits(32) for _ in range(NUM_BANDS - 1))
+                for keys in rng.choices(stored, k=args.lookups)
+            ]
+            misses = [
+                tuple(rng.getrandbits(32) for _ in range(NUM_BANDS)) for _ in range(args.lookups)
+            ]
+
+            start = time.perf_counter()
+            assert all(index.is_duplicate(keys) for keys in hits)
+            hit_time = time.perf_counter() - start
+            start = time.perf_counter()
+            false_positives = sum(index.is_duplicate(keys) for keys in misses)
+            miss_time = time.perf_counter() - start
+
+            print(
+                f"{size:>10} {os.path.getsize(path) / 1024:>9.0f} {load_time * 1000:>9.1f} "
+                f"{memory / 2**20:>11.1f} {hit_time / args.lookups * 1e6:>8.1f} "
+                f"{miss_time / args.lookups * 1e6:>9.1f} {false_positives:>16}"
+            )
+
+
+if __name__ == "__main__":
+    main()
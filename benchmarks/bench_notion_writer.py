@@ -0,0 +1,173 @@
+"""NotionWriterの書き込みスループットを計測するベンチマーク.
+
+ローカルの擬似Notion APIサーバーに対して、従来の逐次保存（save_news_to_notion）と
+NotionWriterによる保存を比較します. 擬似サーバーは1秒あたりのリクエスト数を制限し、
+上限を超えた場合や一定の確率で429（Retry-After付き）や503を返します.
+
+使い方:
+    python benchmarks/bench_notion_writer.py [--pages 60] [--latency 0.2] [--error-rate 0.1]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from notion_client import Client  # noqa: E402
+
+from services.article import Article  # noqa: E402
+from services.notion import NotionClient  # noqa: E402
+from services.notion_index import NotionPageIndex  # noqa: E402
+from services.notion_writer import NotionWriter  # noqa: E402
+from utils.cache import MemoryCache  # noqa: E402
+from utils.rate_limit import TokenBucket  # noqa: E402
+
+
+class FakeNotionServer:
+    """pages.createだけに応答する擬似Notion APIサーバーです."""
+
+    def __init__(self, rate: float, latency: float, error_rate: float, retry_after: str) -> None:
+        """サーバーを起動します.
+
+        Args:
+            rate: サーバー側で許容する1秒あたりのリクエスト数
+            latency: 1リクエストあたりの応答遅延（秒）
+            error_rate: レート制限とは別に429/503を返す確率
+            retry_after: 429応答のRetry-Afterヘッダーの値
+        """
+        self.created = 0
+        self.responses: Dict[int, int] = {}
+        bucket = TokenBucket(rate)
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(latency)
+                roll = random.random()
+                if not bucket.acquire(timeout=0) or roll < error_rate / 2:
+                    self._reply(429, {"code": "rate_limited", "message": "Rate limited"})
+                elif roll < error_rate:
+                    self._reply(503, {"code": "service_unavailable", "message": "Unavailable"})
+                else:
+                    with lock:
+                        server.created += 1
+                    self._reply(200, {"object": "page", "id": str(uuid.uuid4())})
+
+            def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+                with lock:
+                    server.responses[status] = server.responses.get(status, 0) + 1
+                if status != 200:
+                    payload = {"object": "error", "status": status, **payload}
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def reset(self) -> None:
+        """集計をリセットします."""
+        self.created = 0
+        self.responses = {}
+
+    def shutdown(self) -> None:
+        """サーバーを停止します."""
+        self._server.shutdown()
+
+
+def build_items(count: int) -> List[Article]:
+    """保存する記事を生成します.
+
+    Args:
+        count: 記事数
+
+    Returns:
+        List[Article]: 記事のリスト
+    """
+    return [
+        Article(
+            title=f"記事{i}",
+            link=f"https://example.com/news/{uuid.uuid4()}",
+            snippet="説明文",
+            published_at=datetime(2024, 1, 1),
+            sentiment_score=1.0,
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=60, help="保存する記事数")
+    parser.add_argument("--rate", type=float, default=3.0, help="サーバー側のレート上限（件/秒）")
+    parser.add_argument("--latency", type=float, default=0.2, help="応答遅延（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="429/503を返す確率")
+    parser.add_argument("--retry-after", default="1", help="429応答のRetry-After（秒）")
+    args = parser.parse_args()
+
+    server = FakeNotionServer(args.rate, args.latency, args.error_rate, args.retry_after)
+    index_dir = tempfile.TemporaryDirectory()
+
+    def new_client() -> NotionClient:
+        api = Client(auth="dummy", base_url=server.url, timeout_ms=10_000)
+        index = NotionPageIndex(os.path.join(index_dir.name, f"{uuid.uuid4()}.bin"))
+        index.load()  # 空の索引から開始し、データベースの読み込みは行わない
+        return NotionClient(seen_urls=MemoryCache(), client=api, page_index=index)
+
+    print(
+        f"pages={args.pages} server_rate={args.rate}/s latency={args.latency}s "
+        f"error_rate={args.error_rate}"
+    )
+    print(f"{'mode':>12} {'pages/sec':>10} {'saved':>6} {'failed':>7} {'429':>5} {'503':>5}")
+
+    # 従来の逐次保存（失敗した記事はログに出力されるだけで失われる）
+    items = build_items(args.pages)
+    start = time.perf_counter()
+    new_client().save_news_to_notion(items)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'sequential':>12} {server.created / elapsed:>10.2f} {server.created:>6} "
+        f"{args.pages - server.created:>7} {server.responses.get(429, 0):>5} "
+        f"{server.responses.get(503, 0):>5}"
+    )
+
+    server.reset()
+    items = build_items(args.pages)
+    writer = NotionWriter(new_client())
+    writer.submit_all(items)
+    dead_letters = writer.close()
+    print(
+        f"{'NotionWriter':>12} {writer.pages_per_second():>10.2f} {writer.written:>6} "
+        f"{len(dead_letters):>7} {server.responses.get(429, 0):>5} "
+        f"{server.responses.get(503, 0):>5}"
+    )
+
+    server.shutdown()
+    index_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""除外パターン照合の従来ループとPatternMatcherを比較するベンチマーク.
+
+合成した日本語の記事本文コーパスに対して、パターンごとにre.searchを呼ぶ従来の方式と、
+1つの正規表現にまとめたPatternMatcherの処理時間を計測し、判定結果が一致することを確認します.
+
+使い方:
+    python benchmarks/bench_pattern_matcher.py [--articles 5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config.settings import POOR_QUALITY_PATTERNS, POSITIVE_IRRELEVANT_PATTERNS  # noqa: E402
+from services.google_news import ADDITIONAL_IRRELEVANT_PATTERNS  # noqa: E402
+from services.patterns import PatternMatcher  # noqa: E402
+
+WORDS = [
+    "政府",
+    "発表",
+    "企業",
+    "研究",
+    "開発",
+    "地域",
+    "住民",
+    "市場",
+    "技術",
+    "環境",
+    "教育",
+    "医療",
+    "支援",
+    "計画",
+    "調査",
+    "結果",
+    "関係者",
+    "専門家",
+    "今後",
+    "影響",
+]
+TRIGGERS = ["広告", "まとめ", "速報", "ランキング", "続きはこちら", "提供：", "2024年", "[PR]"]
+
+
+def build_corpus(size: int, seed: int = 0) -> List[str]:
+    """合成した記事本文のコーパスを生成します.
+
+    約3割の記事には除外パターンに一致する語を本文の後半に混ぜます.
+
+    Args:
+        size: 記事数
+        seed: 乱数シード
+
+    Returns:
+        List[str]: 記事本文のリスト（1件あたり約1000文字）
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        sentences = [
+            "".join(rng.choice(WORDS) + "の" for _ in range(8)) + "状況について述べた。" for _ in range(20)
+        ]
+        if rng.random() < 0.3:
+            sentences.insert(rng.randrange(10, 20), rng.choice(TRIGGERS))
+        corpus.append("".join(sentences)[:1000])
+    return corpus
+
+
+def legacy_search(patterns: List[str], extra: List[str], text: str) -> Optional[str]:
+    """従来の実装と同じく、呼び出しごとにリストを連結してパターンを順に照合します.
+
+    Args:
+        patterns: 除外パターン
+        extra: 追加の除外パターン
+        text: 照合する文字列
+
+    Returns:
+        Optional[str]: 一致したパターン。一致しない場合はNone
+    """
+    for pattern in patterns + extra:
+        if re.search(pattern, text):
+            return pattern
+    return None
+
+
+def measure(func: Callable[[str], Optional[str]], corpus: List[str], repeat: int) -> float:
+    """コーパス全体の照合にかかる最短時間を計測します.
+
+    Args:
+        func: 1件の本文を照合する関数
+        corpus: 記事本文のリスト
+        repeat: 計測の繰り返し回数
+
+    Returns:
+        float: 最短の所要時間（秒）
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=5000, help="コーパスの記事数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.articles)
+    # 最もパターン数の多いポジティブモードの設定で比較する
+    patterns = list(POSITIVE_IRRELEVANT_PATTERNS)
+    matcher = PatternMatcher(patterns + ADDITIONAL_IRRELEVANT_PATTERNS + POOR_QUALITY_PATTERNS)
+
+    def legacy(text: str) -> Optional[str]:
+        return legacy_search(patterns, ADDITIONAL_IRRELEVANT_PATTERNS + POOR_QUALITY_PATTERNS, text)
+
+    legacy_rejected = sum(legacy(text) is not None for text in corpus)
+    matcher_rejected = sum(matcher.search(text) is not None for text in corpus)
+    assert legacy_rejected == matcher_rejected, "判定結果が一致しません"
+
+    legacy_time = measure(legacy, corpus, args.repeat)
+    matcher_time = measure(matcher.search, corpus, args.repeat)
+
+    print(f"articles={len(corpus)} patterns={len(matcher.patterns)} rejected={matcher_rejected}")
+    print(f"{'method':>14} {'total(ms)':>10} {'per article(us)':>16}")
+    for name, elapsed in (("legacy loop", legacy_time), ("PatternMatcher", matcher_time)):
+        print(f"{name:>14} {elapsed * 1000:>10.1f} {elapsed / len(corpus) * 1e6:>16.1f}")
+    print(f"speedup: {legacy_time / matcher_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""キーワードをOR検索にまとめた場合の検索できるキーワード数と、振り分けの正確さのシミュレーション.
+
+設定の検索キーワード（トレンド・ポジティブの両方）に、同じ語を共有する合成のキーワードを加え、
+1回の実行のクエリ数（MAX_QUERIES_PER_EXECUTION）に収まるキーワード数を
+まとめるキーワード数（QUERY_GROUP_SIZE）ごとに比較します.
+
+振り分けの正確さは、キーワードごとに記事を乱数で生成して再現します. 記事のタイトルと説明文には、
+元のキーワードの語がそれぞれ--term-recallの確率で含まれ、他のキーワードの語も一定の確率で
+含まれます. OR検索の結果は、まとめたキーワードの記事を混ぜて上位の件数だけ返すものとします.
+
+- accuracy: 振り分けた記事のうち、元のキーワードに振り分けた割合
+- unmatched: どのキーワードの語も含まず、振り分けずに除外した割合
+- coverage: 単独で検索した場合に得られるキーワードごとの件数（上限MAX_RESULTS_PER_QUERY）に
+  対する、まとめた検索で正しく振り分けた件数の割合
+
+使い方:
+    python benchmarks/bench_query_groups.py [--synthetic 60] [--rounds 200] [--term-recall 0.7]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+from config.settings import (  # noqa: E402
+    MAX_QUERIES_PER_EXECUTION,
+    MAX_RESULTS_PER_QUERY,
+    POSITIVE_SEARCH_QUERIES,
+    QUERY_GROUP_OVERSAMPLING,
+    TREND_SEARCH_QUERIES,
+)
+from services.query_planner import (  # noqa: E402
+    QueryPlanner,
+    attribute_results,
+    group_queries,
+    query_terms,
+)
+from utils.cache import MemoryCache  # noqa: E402
+
+# 合成のキーワードに使う語（話題の語と、多くのキーワードで共有する語）
+TOPICS = [
+    "宇宙",
+    "ロケット",
+    "AI",
+    "半導体",
+    "ロボット",
+    "医療",
+    "再生医療",
+    "農業",
+    "漁業",
+    "観光",
+    "鉄道",
+    "空港",
+    "スポーツ",
+    "サッカー",
+    "野球",
+    "将棋",
+    "映画",
+    "アニメ",
+    "料理",
+    "温泉",
+    "教育",
+    "大学",
+    "子ども",
+    "高齢者",
+    "福祉",
+    "防災",
+    "森林",
+    "海洋",
+    "水族館",
+    "植物",
+]
+SHARED = ["ニュース", "最新", "成功", "話題", "注目", "発表"]
+
+
+def synthetic_queries(count: int, rng: random.Random) -> List[Tuple[str, int]]:
+    """話題の語と共有する語を組み合わせたキーワードを生成します.
+
+    Args:
+        count: キーワード数
+        rng: 乱数生成器
+
+    Returns:
+        List[Tuple[str, int]]: キーワードと優先度
+    """
+    queries: Dict[str, int] = {}
+    while len(queries) < count:
+        words = rng.sample(TOPICS, rng.choice((1, 1, 2))) + rng.sample(SHARED, rng.choice((1, 2)))
+        queries.setdefault(" ".join(words), rng.randint(2, 4))
+    return list(queries.items())
+
+
+def poisson(rng: random.Random, mean: float) -> int:
+    """ポアソン分布に従う乱数を返します.
+
+    Args:
+        rng: 乱数生成器
+        mean: 平均
+
+    Returns:
+        int: 乱数
+    """
+    threshold, count, product = math.exp(-mean), 0, rng.random()
+    while product > threshold:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def make_article(
+    query: str, vocabulary: List[str], term_recall: float, noise: float, rng: random.Random
+) -> Dict[str, str]:
+    """キーワードで検索される記事の検索結果を生成します.
+
+    Args:
+        query: 記事を検索したキーワード
+        vocabulary: 全キーワードの語
+        term_recall: キーワードの各語がタイトルと説明文に含まれる確率
+        noise: 他のキーワードの各語が含まれる確率
+        rng: 乱数生成器
+
+    Returns:
+        Dict[str, str]: タイトルと説明文
+    """
+    words = [word for word in query.split() if rng.random() < term_recall]
+    words += [word for word in vocabulary if rng.random() < noise]
+    rng.shuffle(words)
+    return {"title": "の".join(words) + "について", "description": "詳細は本文で"}
+
+
+def simulate_attribution(
+    groups: List[List[str]], args: argparse.Namespace, rng: random.Random
+) -> Tuple[int, int, int, int, int]:
+    """まとめた検索の結果の振り分けを再現します.
+
+    Args:
+        groups: 検索のまとまり
+        args: コマンドライン引数
+        rng: 乱数生成器
+
+    Returns:
+        Tuple[int, int, int, int, int]: 振り分けた件数、正しく振り分けた件数、どの語も含まない件数、
+            まとめた検索で正しく得られたキーワードごとの件数の合計、単独の検索で得られる件数の合計
+    """
+    vocabulary = sorted({word for group in groups for query in group for word in query.split()})
+    total = correct = unmatched = covered = expected = 0
+    for _ in range(args.rounds):
+        for group in groups:
+            pool: List[Tuple[str, Dict[str, str]]] = []
+            for query in group:
+                count = poisson(rng, args.articles)
+                pool += [
+                    (query, make_article(query, vocabulary, args.term_recall, args.noise, rng))
+                    for _ in range(count)
+                ]
+                expected += min(count, MAX_RESULTS_PER_QUERY)
+            rng.shuffle(pool)
+            returned = pool[: MAX_RESULTS_PER_QUERY * len(group) * QUERY_GROUP_OVERSAMPLING]
+            items = [item for _, item in returned]
+            origins = {id(item): query for query, item in returned}
+            attributed, missed = attribute_results(items, group)
+            unmatched += missed
+            for query, assigned in attributed.items():
+                hits = sum(origins[id(item)] == query for item in assigned)
+                total += len(assigned)
+                correct += hits
+                covered += min(hits, MAX_RESULTS_PER_QUERY)
+    return total, correct, unmatched, covered, expected
+
+
+def main() -> None:
+    """シミュレーションを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--synthetic", type=int, default=60, help="合成するキーワード数")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--rounds", type=int, default=200, help="振り分けを再現する回数")
+    parser.add_argument("--articles", type=float, default=6.0, help="キーワードごとの記事数の平均")
+    parser.add_argument("--term-recall", type=float, default=0.7, help="元のキーワードの語を含む確率")
+    parser.add_argument("--noise", type=float, default=0.02, help="他のキーワードの語を含む確率")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    configured = TREND_SEARCH_QUERIES + POSITIVE_SEARCH_QUERIES
+    candidates = configured + [
+        (query, priority)
+        for query, priority in synthetic_queries(args.synthetic, rng)
+        if query not in dict(configured)
+    ]
+    print(
+        f"keywords={len(candidates)} (configured={len(configured)}) "
+        f"budget={MAX_QUERIES_PER_EXECUTION} queries/execution "
+        f"shared_terms={sum(len(query_terms(q) & set(SHARED)) > 0 for q, _ in candidates)}"
+    )
+    print(
+        f"{'group':>5} {'keywords':>9} {'queries':>8} {'accuracy':>9} {'unmatched':>10} "
+        f"{'coverage':>9}"
+    )
+    for size in args.sizes:
+        planned = QueryPlanner(MemoryCache()).plan(candidates, MAX_QUERIES_PER_EXECUTION, size)
+        groups = [[query for query, _ in group] for group in group_queries(planned, size)]
+        total, correct, unmatched, covered, expected = simulate_attribution(
+            groups, args, random.Random(args.seed)
+        )
+        print(
+            f"{size:>5} {len(planned):>9} {len(groups):>8} {correct / max(total, 1):>9.1%} "
+            f"{unmatched / max(total + unmatched, 1):>10.1%} {covered / max(expected, 1):>9.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""キーワードの選び方ごとに、1クエリあたりの新しい記事の件数を比較するシミュレーション.
+
+キーワードごとに新しい記事が出る頻度、他のキーワードと重複する割合、絞り込みで除外される割合を
+乱数で決め、数日分の実行を再現します. 比較する選び方は次の3つです.
+
+- fixed: 従来のcalculate_query_batch（時間帯ごとに SEARCH_QUERIES を6分割した1区切り）
+- static: 設定の優先度の順に、実行ごとのクエリ数まで選ぶ
+- planner: QueryPlannerで実績（新しい記事の件数）と探索項に基づいて選ぶ
+
+使い方:
+    python benchmarks/bench_query_planner.py [--queries 30] [--budget 8] [--days 14]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+from config.settings import MAX_RESULTS_PER_QUERY, SEARCH_PERIOD_HOURS  # noqa: E402
+from services.query_planner import QueryPlanner  # noqa: E402
+from utils.cache import MemoryCache  # noqa: E402
+
+
+class Keyword:
+    """シミュレーション上のキーワードです."""
+
+    def __init__(self, name: str, priority: int, rng: random.Random) -> None:
+        """キーワードの性質を乱数で決めます.
+
+        Args:
+            name: キーワード
+            priority: 設定の優先度
+            rng: 乱数生成器
+        """
+        self.name = name
+        self.priority = priority
+        self.rate = rng.lognormvariate(-1.5, 1.2)  # 1時間あたりの新しい記事の件数
+        self.duplicate_rate = rng.uniform(0.0, 0.6)  # 検索結果に含まれる既知の記事の割合
+        self.rejection_rate = rng.uniform(0.1, 0.7)  # 絞り込みで除外される割合
+
+
+def poisson(rng: random.Random, mean: float) -> int:
+    """ポアソン分布に従う乱数を返します.
+
+    Args:
+        rng: 乱数生成器
+        mean: 平均
+
+    Returns:
+        int: 乱数
+    """
+    threshold, count, product = math.exp(-mean), 0, rng.random()
+    while product > threshold:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def search(
+    keyword: Keyword, gap_hours: float, rng: random.Random
+) -> Tuple[Dict[str, Dict[str, int]], int]:
+    """1回の検索を再現します.
+
+    Args:
+        keyword: キーワード
+        gap_hours: 前回の検索からの経過時間
+        rng: 乱数生成器
+
+    Returns:
+        Tuple[Dict[str, Dict[str, int]], int]: 段階ごとの入出力件数と、通過した新しい記事の件数
+    """
+    window = min(gap_hours, SEARCH_PERIOD_HOURS)
+    new = poisson(rng, keyword.rate * window)
+    known = poisson(rng, keyword.rate * SEARCH_PERIOD_HOURS * keyword.duplicate_rate)
+    pool = [True] * new + [False] * known
+    rng.shuffle(pool)
+    results = pool[:MAX_RESULTS_PER_QUERY]
+    fresh = sum(results)
+    accepted = sum(1 for _ in range(fresh) if rng.random() >= keyword.rejection_rate)
+    stats = {
+        "日付": {"in": len(results), "out": len(results)},
+        "URL重複": {"in": len(results), "out": fresh},
+        "本文の関連性": {"in": fresh, "out": accepted},
+    }
+    return stats, accepted
+
+
+def fixed_batch(queries: List[str], hour: int) -> List[str]:
+    """従来のcalculate_query_batchと同じ方法でキーワードを選びます.
+
+    Args:
+        queries: キーワードのリスト
+        hour: 実行時刻（時）
+
+    Returns:
+        List[str]: 選んだキーワード
+    """
+    batch_size = len(queries) // 6
+    batch_number = hour // 4
+    start = batch_number * batch_size
+    end = start + batch_size if batch_number < 5 else len(queries)
+    return queries[start:end]
+
+
+def simulate(
+    strategy: str, keywords: List[Keyword], budget: int, days: int, interval: int, seed: int
+) -> Tuple[int, int]:
+    """選び方ごとに実行を再現します.
+
+    Args:
+        strategy: "fixed"、"static"、"planner"のいずれか
+        keywords: キーワード
+        budget: 1回の実行で使用できるクエリ数
+        days: 日数
+        interval: 実行の間隔（時間）
+        seed: 乱数のシード
+
+    Returns:
+        Tuple[int, int]: 使用したクエリ数と、通過した新しい記事の件数
+    """
+    rng = random.Random(seed)
+    by_name = {keyword.name: keyword for keyword in keywords}
+    ordered = sorted(keywords, key=lambda k: k.priority)
+    planner = QueryPlanner(MemoryCache(ttl=days * 86400 + 1))
+    last_searched: Dict[str, float] = {}
+    used = accepted_total = 0
+
+    for hour in range(0, days * 24, interval):
+        if strategy == "fixed":
+            selected = fixed_batch([k.name for k in keywords], hour % 24)[:budget]
+        elif strategy == "static":
+            selected = [k.name for k in ordered[:budget]]
+        else:
+            planned = planner.plan([(k.name, k.priority) for k in keywords], budget)
+            selected = [name for name, _ in planned]
+
+        for name in selected:
+            gap = hour - last_searched.get(name, -SEARCH_PERIOD_HOURS)
+            stats, accepted = search(by_name[name], gap, rng)
+            planner.record(name, stats, accepted)
+            last_searched[name] = hour
+            used += 1
+            accepted_total += accepted
+    return used, accepted_total
+
+
+def main() -> None:
+    """シミュレーションを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=30, help="キーワード数")
+    parser.add_argument("--budget", type=int, default=8, help="1回の実行で使用できるクエリ数")
+    parser.add_argument("--days", type=int, default=14, help="日数")
+    parser.add_argument("--interval", type=int, default=6, help="実行の間隔（時間）")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keywords = [Keyword(f"キーワード{i}", rng.randint(1, 3), rng) for i in range(args.queries)]
+    print(
+        f"queries={args.queries} budget={args.budget}/run interval={args.interval}h "
+        f"days={args.days}"
+    )
+    print(f"{'strategy':>8} {'queries':>8} {'accepted':>9} {'per query':>10}")
+    for strategy in ("fixed", "static", "planner"):
+        used, accepted = simulate(
+            strategy, keywords, args.budget, args.days, args.interval, args.seed
+        )
+        per_query = accepted / used if used else 0.0
+        print(f"{strategy:>8} {used:>8} {accepted:>9} {per_query:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
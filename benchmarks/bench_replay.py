@@ -0,0 +1,791 @@
+"""記録した実行を再生して、検索→絞り込み→保存の全体の性能を計測するベンチマーク.
+
+recordで実際のGNewsの検索結果と記事ページのHTML、Notionデータベースの読み込み結果を
+ディレクトリに記録し、replayで記録をローカルの擬似サーバーから配信して
+GoogleNewsScraperとNotionClient（NotionWriter経由）に通します.
+擬似サーバーには応答遅延とエラー率を設定できます.
+記録を指定しない場合は合成した記録を使用するため、外部サービスには接続しません.
+
+Notionへの書き込みはページを実際に作成してしまうため記録せず、
+擬似Notion APIサーバー（pages.createとdatabases.queryに応答）で置き換えます.
+
+計測結果（記事数/秒、全体の所要時間、処理ごとのCPU時間、フェーズごとのRSS）は
+--save-baselineでJSONに保存でき、--baselineで保存した結果と比較します.
+いずれかの指標が--max-regressionを超えて悪化した場合は終了コード1で終了します.
+
+使い方:
+    python benchmarks/bench_replay.py record --out fixtures/replay [--queries AI 半導体]
+    python benchmarks/bench_replay.py replay [--recording fixtures/replay] [--latency 0.05]
+        [--error-rate 0.05] [--save-baseline baseline.json] [--baseline baseline.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("CACHE_ENABLED", "false")
+os.environ.setdefault("NOTION_DATABASE_ID", "replay")
+
+from notion_client import Client  # noqa: E402
+
+from config.settings import HTTP_TRANSPORT, NEAR_DUPLICATE_TTL_SECONDS, SEARCH_QUERIES  # noqa: E402
+from services.article import Article  # noqa: E402
+from services.google_news import GoogleNewsScraper  # noqa: E402
+from services.near_duplicate import NearDuplicateIndex  # noqa: E402
+from services.notion import NotionClient  # noqa: E402
+from services.notion_index import NotionPageIndex  # noqa: E402
+from services.notion_writer import NotionWriter  # noqa: E402
+from services.scheduler import KeywordScheduler  # noqa: E402
+from services.transport import create_transport  # noqa: E402
+from services.url_resolver import URLResolver  # noqa: E402
+from utils.cache import MemoryCache  # noqa: E402
+from utils.host_health import HostHealth  # noqa: E402
+from utils.http_cache import HTTPCache  # noqa: E402
+from utils.metrics import metrics  # noqa: E402
+from utils.rate_limit import TokenBucket  # noqa: E402
+
+MANIFEST = "manifest.json"
+DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
+
+# ベースラインとの比較に使う指標と、値が大きいほど良いかどうか
+COMPARED_METRICS = {
+    "articles_per_second": True,
+    "wall_seconds": False,
+    "cpu_seconds": False,
+    "peak_rss_mb": False,
+}
+
+
+def rss_mb() -> float:
+    """プロセスの最大RSSを返します.
+
+    Returns:
+        float: 最大RSS（MB）
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ---------------------------------------------------------------------------
+# 記録
+# ---------------------------------------------------------------------------
+
+
+def record(out_dir: str, queries: List[str], with_notion: bool) -> None:
+    """実際のGNewsの検索結果と記事ページを記録します.
+
+    Args:
+        out_dir: 記録の保存先ディレクトリ
+        queries: 検索キーワード
+        with_notion: Notionデータベースの読み込み結果（databases.query）も記録するかどうか
+    """
+    os.makedirs(os.path.join(out_dir, "pages"), exist_ok=True)
+    scraper = GoogleNewsScraper(content_cache=MemoryCache(), seen_urls=MemoryCache())
+    scraper.gnews.period = "12h"
+    manifest: Dict[str, Any] = {
+        "recorded_at": datetime.utcnow().strftime(DATE_FORMAT),
+        "queries": {},
+        "pages": {},
+    }
+
+    for query in queries:
+        scraper.query_limiter.acquire()
+        results = scraper.gnews.get_news(query)
+        manifest["queries"][query] = results
+        print(f"{query}: {len(results)}件")
+        for item in results:
+            url = item.get("link")
+            if not url or url in manifest["pages"]:
+                continue
+            name = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".html"
+            try:
+                with scraper.transport.get(url, timeout=10) as response:
+                    status = response.status_code
+                    body = b"".join(response.iter_content(64 * 1024))
+                    content_type = response.headers.get("Content-Type", "text/html")
+            except Exception as e:
+                print(f"記事ページを取得できませんでした: {url} - {str(e)}")
+                status, body, content_type = 599, b"", "text/plain"
+            with open(os.path.join(out_dir, "pages", name), "wb") as f:
+                f.write(body)
+            manifest["pages"][url] = {
+                "file": name,
+                "status": status,
+                "content_type": content_type,
+            }
+
+    if with_notion:
+        notion = NotionClient(seen_urls=MemoryCache())
+        started_at = time.perf_counter()
+        response = notion.client.databases.query(database_id=notion.database_id, page_size=100)
+        manifest["notion"] = {
+            "query": response,
+            "latency": time.perf_counter() - started_at,
+        }
+
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    print(f"{len(manifest['queries'])}キーワード、{len(manifest['pages'])}ページを記録しました: {out_dir}")
+
+
+def synthesize(out_dir: str, queries: int, articles: int, seed: int) -> None:
+    """合成した記録を生成します.
+
+    一部の記事は他の記事の複製（近似重複）、本文が短い記事、取得できない記事にします.
+
+    Args:
+        out_dir: 記録の保存先ディレクトリ
+        queries: キーワード数
+        articles: 1キーワードあたりの記事数
+        seed: 乱数のシード
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out_dir, "pages"), exist_ok=True)
+    katakana = [chr(c) for c in range(ord("ァ"), ord("ヺ"))]
+    subjects = ["研究チーム", "同社", "市", "政府", "開発者", "大学", "スタートアップ"]
+    predicates = ["を発表した", "に成功した", "を開始する", "の導入を進めている", "を公開した"]
+    published = datetime.utcnow() - timedelta(hours=1)
+    manifest: Dict[str, Any] = {
+        "recorded_at": datetime.utcnow().strftime(DATE_FORMAT),
+        "queries": {},
+        "pages": {},
+    }
+    bodies: List[str] = []
+
+    for q in range(queries):
+        query = f"キーワード{q}"
+        results = []
+        for a in range(articles):
+            url = f"https://publisher{rng.randrange(20)}.example.com/news/{q}-{a}"
+            roll = rng.random()
+            if bodies and roll < 0.1:
+                body = rng.choice(bodies)  # 配信元が異なる同一記事
+            elif roll < 0.2:
+                body = "<p>続きは会員登録が必要です。</p>"
+            else:
+                sentences = []
+                for _ in range(rng.randrange(10, 30)):
+                    word = "".join(rng.choice(katakana) for _ in range(6))
+                    sentences.append(
+                        f"{rng.choice(subjects)}は{word}{rng.choice(predicates)}。"
+                        f"{query}に関する取り組みとして{rng.randrange(1000)}件の事例がある。"
+                    )
+                body = "".join(f"<p>{s}</p>" for s in sentences)
+                bodies.append(body)
+            html = (
+                f"<html><head><title>{query}の記事{a}</title></head>"
+                f'<body><nav>メニュー</nav><article class="article-body">{body}</article>'
+                "<footer>フッター</footer></body></html>"
+            )
+            status = 404 if rng.random() < 0.05 else 200
+            name = f"{q}-{a}.html"
+            with open(os.path.join(out_dir, "pages", name), "w", encoding="utf-8") as f:
+                f.write(html)
+            manifest["pages"][url] = {
+                "file": name,
+                "status": status,
+                "content_type": "text/html; charset=utf-8",
+            }
+            results.append(
+                {
+                    "title": f"{query}の記事{a}",
+                    "description": f"{query}の記事{a}の概要",
+                    "published date": (published - timedelta(minutes=a)).strftime(DATE_FORMAT),
+                    "url": url,
+                    "link": url,
+                    "publisher": {"href": url, "title": f"publisher{a}"},
+                }
+            )
+        manifest["queries"][query] = results
+
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# 擬似サーバー
+# ---------------------------------------------------------------------------
+
+
+def start_server(handler: type) -> Tuple[ThreadingHTTPServer, str]:
+    """ローカルのHTTPサーバーを別スレッドで起動します.
+
+    Args:
+        handler: リクエストハンドラーのクラス
+
+    Returns:
+        Tuple[ThreadingHTTPServer, str]: サーバーとベースURL
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class ArticleServer:
+    """記録した記事ページを配信する擬似サーバーです.
+
+    URLのパスに元のホスト名を残すため、記事ページは /<ホスト名>/<番号> で配信します.
+    """
+
+    def __init__(
+        self,
+        recording_dir: str,
+        pages: Dict[str, Dict[str, Any]],
+        latency: float,
+        error_rate: float,
+        seed: int,
+    ) -> None:
+        """サーバーを起動します.
+
+        Args:
+            recording_dir: 記録のディレクトリ
+            pages: 元のURLと記録したページの情報
+            latency: 1リクエストあたりの応答遅延（秒）
+            error_rate: 記録に関係なく503を返す確率
+            seed: 乱数のシード
+        """
+        self.requests = 0
+        self.errors = 0
+        self.urls: Dict[str, str] = {}
+        routes: Dict[str, Tuple[int, str, bytes]] = {}
+        rng = random.Random(seed)
+        lock = threading.Lock()
+        server = self
+
+        for i, (url, page) in enumerate(pages.items()):
+            host = url.split("/")[2] if "://" in url else "unknown"
+            path = f"/{host}/{i}"
+            with open(os.path.join(recording_dir, "pages", page["file"]), "rb") as f:
+                routes[path] = (page["status"], page["content_type"], f.read())
+            self.urls[url] = path
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # 配信元と同じく接続を維持する
+
+            def do_GET(self) -> None:  # noqa: N802
+                time.sleep(latency)
+                with lock:
+                    server.requests += 1
+                    failed = rng.random() < error_rate
+                    if failed:
+                        server.errors += 1
+                status, content_type, body = routes.get(self.path, (404, "text/plain", b""))
+                if failed:
+                    status, body = 503, b""
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._server, self.url = start_server(Handler)
+        self.urls = {url: self.url + path for url, path in self.urls.items()}
+
+    def shutdown(self) -> None:
+        """サーバーを停止します."""
+        self._server.shutdown()
+
+
+class RedirectServer:
+    """Google Newsのリダイレクトを模した擬似サーバーです.
+
+    /<番号> へのリクエストに、対応する記事ページのURLへの302を返します.
+    """
+
+    def __init__(self, targets: List[str], latency: float) -> None:
+        """サーバーを起動します.
+
+        Args:
+            targets: リダイレクト先のURL
+            latency: 1リクエストあたりの応答遅延（秒）
+        """
+        self.requests = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                time.sleep(latency)
+                with lock:
+                    server.requests += 1
+                try:
+                    target: Optional[str] = targets[int(self.path.lstrip("/"))]
+                except (ValueError, IndexError):
+                    target = None
+                self.send_response(302 if target else 404)
+                if target:
+                    self.send_header("Location", target)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._server, self.url = start_server(Handler)
+        self.host = self.url.split("/")[2]
+        self.links = [f"{self.url}/{i}" for i in range(len(targets))]
+
+    def shutdown(self) -> None:
+        """サーバーを停止します."""
+        self._server.shutdown()
+
+
+class ReplayNotionServer:
+    """pages.create、pages.update、databases.queryに応答する擬似Notion APIサーバーです."""
+
+    def __init__(
+        self,
+        query_response: Optional[Dict[str, Any]],
+        latency: float,
+        error_rate: float,
+        rate: float,
+        seed: int,
+    ) -> None:
+        """サーバーを起動します.
+
+        Args:
+            query_response: databases.queryの応答。Noneの場合は空のデータベースとして応答
+            latency: 1リクエストあたりの応答遅延（秒）
+            error_rate: レート制限とは別に429/503を返す確率
+            rate: サーバー側で許容する1秒あたりのリクエスト数
+            seed: 乱数のシード
+        """
+        self.created = 0
+        self.responses: Dict[int, int] = defaultdict(int)
+        query_payload = dict(query_response or {"object": "list", "results": []})
+        query_payload.update({"has_more": False, "next_cursor": None})
+        bucket = TokenBucket(rate)
+        rng = random.Random(seed)
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                self._handle()
+
+            def do_PATCH(self) -> None:  # noqa: N802
+                self._handle()
+
+            def _handle(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(latency)
+                with lock:
+                    roll = rng.random()
+                if not bucket.acquire(timeout=0) or roll < error_rate / 2:
+                    self._reply(429, {"code": "rate_limited", "message": "Rate limited"})
+                elif roll < error_rate:
+                    self._reply(503, {"code": "service_unavailable", "message": "Unavailable"})
+                elif self.path.endswith("/query"):
+                    self._reply(200, query_payload)
+                else:
+                    with lock:
+                        server.created += 1
+                    self._reply(200, {"object": "page", "id": str(uuid.uuid4())})
+
+            def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+                with lock:
+                    server.responses[status] += 1
+                if status != 200:
+                    payload = {"object": "error", "status": status, **payload}
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._server, self.url = start_server(Handler)
+
+    def shutdown(self) -> None:
+        """サーバーを停止します."""
+        self._server.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# 再生
+# ---------------------------------------------------------------------------
+
+
+class StageProfiler:
+    """処理ごとの呼び出し回数、所要時間、CPU時間を記録します.
+
+    CPU時間はスレッドごとのCPU時間（time.thread_time）で計測するため、
+    並行して実行される処理でも処理ごとに分けて集計できます.
+    """
+
+    def __init__(self) -> None:
+        """記録を初期化します."""
+        self.stages: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0}
+        )
+        self._lock = threading.Lock()
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """関数を計測付きの関数で包みます.
+
+        Args:
+            name: 処理の名前
+            func: 対象の関数
+
+        Returns:
+            Callable[..., Any]: 計測付きの関数
+        """
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+                with self._lock:
+                    stage = self.stages[name]
+                    stage["calls"] += 1
+                    stage["wall_seconds"] += wall
+                    stage["cpu_seconds"] += cpu
+
+        return wrapper
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """処理ごとの記録を返します.
+
+        Returns:
+            Dict[str, Dict[str, float]]: 処理の名前と記録
+        """
+        return {
+            name: {key: round(value, 4) for key, value in stage.items()}
+            for name, stage in sorted(self.stages.items())
+        }
+
+
+def load_recording(recording_dir: str) -> Dict[str, Any]:
+    """記録を読み込み、公開日時を記録時刻からの経過分だけずらします.
+
+    検索の対象期間（直近12時間）から外れないよう、記録時と同じ相対時刻に揃えます.
+
+    Args:
+        recording_dir: 記録のディレクトリ
+
+    Returns:
+        Dict[str, Any]: 記録の内容
+    """
+    with open(os.path.join(recording_dir, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    shift = datetime.utcnow() - datetime.strptime(manifest["recorded_at"], DATE_FORMAT)
+    for results in manifest["queries"].values():
+        for item in results:
+            try:
+                published = datetime.strptime(item["published date"], DATE_FORMAT)
+            except (KeyError, ValueError):
+                continue
+            item["published date"] = (published + shift).strftime(DATE_FORMAT)
+    return manifest
+
+
+def replay(args: argparse.Namespace, recording_dir: str) -> Dict[str, Any]:
+    """記録を擬似サーバーから配信して全体の処理を実行します.
+
+    Args:
+        args: コマンドライン引数
+        recording_dir: 記録のディレクトリ
+
+    Returns:
+        Dict[str, Any]: 計測結果
+    """
+    manifest = load_recording(recording_dir)
+    articles = ArticleServer(
+        recording_dir, manifest["pages"], args.latency, args.error_rate, args.seed
+    )
+    notion_record = manifest.get("notion", {})
+    notion_latency = args.notion_latency
+    if notion_latency is None:
+        notion_latency = notion_record.get("latency", 0.1)
+    notion = ReplayNotionServer(
+        notion_record.get("query"),
+        notion_latency,
+        args.notion_error_rate,
+        args.notion_rate,
+        args.seed,
+    )
+    redirects = RedirectServer(list(articles.urls.values()), args.latency)
+    index_dir = tempfile.TemporaryDirectory()
+    profiler = StageProfiler()
+    metrics.reset()
+
+    # 検索結果のリンクを擬似サーバーのURL（既定ではリダイレクトURL）に置き換える
+    links = articles.urls
+    if not args.no_redirects:
+        links = dict(zip(articles.urls, redirects.links))
+    results_by_query = {
+        query: [dict(item, link=links.get(item.get("link", ""), "")) for item in results]
+        for query, results in manifest["queries"].items()
+    }
+    transport = create_transport(args.transport)
+    search_latency = args.search_latency
+
+    def get_news(query: str) -> List[Dict[str, Any]]:
+        time.sleep(search_latency)
+        # OR検索にまとめたクエリ（QUERY_GROUP_SIZE）は、各キーワードの記録を合わせて返す
+        queries = [part.strip("()") for part in query.split(" OR ")]
+        return [dict(item) for q in queries for item in results_by_query.get(q, [])]
+
+    scraper = GoogleNewsScraper(
+        content_cache=MemoryCache(),
+        seen_urls=MemoryCache(),
+        http_cache=HTTPCache(MemoryCache()),
+        near_duplicates=NearDuplicateIndex(None, ttl=NEAR_DUPLICATE_TTL_SECONDS),
+        transport=transport,
+        url_resolver=URLResolver(transport, MemoryCache(), redirect_hosts=[redirects.host]),
+        host_health=HostHealth(MemoryCache()),
+    )
+    scraper.query_limiter = TokenBucket(1 / args.query_delay if args.query_delay > 0 else 1e9)
+    scraper.gnews.get_news = profiler.wrap("gnews_search", get_news)
+    scraper.fetcher.fetch = profiler.wrap("fetch_article", scraper.fetcher.fetch)
+    scraper.url_resolver.resolve_all = profiler.wrap(  # type: ignore[method-assign]
+        "resolve_urls", scraper.url_resolver.resolve_all
+    )
+    scraper._is_relevant_content = profiler.wrap(  # type: ignore[method-assign]
+        "filter_relevance", scraper._is_relevant_content
+    )
+    scraper._is_first_copy = profiler.wrap(  # type: ignore[method-assign]
+        "near_duplicate", scraper._is_first_copy
+    )
+    scraper._score_sentiment = profiler.wrap(  # type: ignore[method-assign]
+        "sentiment", scraper._score_sentiment
+    )
+    scraper.cpu_pool.extract = profiler.wrap(  # type: ignore[method-assign]
+        "extract_content", scraper.cpu_pool.extract
+    )
+
+    notion_client = NotionClient(
+        seen_urls=MemoryCache(),
+        client=Client(auth="dummy", base_url=notion.url, timeout_ms=10_000),
+        page_index=NotionPageIndex(os.path.join(index_dir.name, "index.bin")),
+    )
+    notion_client.upsert_page = profiler.wrap(  # type: ignore[method-assign]
+        "notion_upsert", notion_client.upsert_page
+    )
+
+    phases: Dict[str, Dict[str, float]] = {}
+    found = 0
+    rss_start = rss_mb()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    try:
+        writer = NotionWriter(notion_client, workers=args.notion_workers)
+        scheduler = KeywordScheduler(scraper, workers=args.workers)
+
+        def on_results(query: str, news_items: List[Article]) -> None:
+            writer.submit_all(news_items)
+
+        queries = list(results_by_query)
+        found = len(
+            scheduler.run(
+                [(query, priority) for priority, query in enumerate(queries)], on_results=on_results
+            )
+        )
+        search_wall, search_cpu = time.perf_counter(), time.process_time()
+        phases["search"] = {
+            "wall_seconds": round(search_wall - start_wall, 3),
+            "cpu_seconds": round(search_cpu - start_cpu, 3),
+            "peak_rss_mb": round(rss_mb(), 1),
+        }
+        dead_letters = writer.close()
+        end_wall, end_cpu = time.perf_counter(), time.process_time()
+        phases["write_drain"] = {
+            "wall_seconds": round(end_wall - search_wall, 3),
+            "cpu_seconds": round(end_cpu - search_cpu, 3),
+            "peak_rss_mb": round(rss_mb(), 1),
+        }
+    finally:
+        articles.shutdown()
+        redirects.shutdown()
+        notion.shutdown()
+        index_dir.cleanup()
+
+    wall = end_wall - start_wall
+    return {
+        "recording": recording_dir,
+        "queries": len(results_by_query),
+        "gnews_calls": scraper.query_count,
+        "search_results": sum(len(results) for results in results_by_query.values()),
+        "articles": found,
+        "written": writer.written,
+        "dead_letters": len(dead_letters),
+        "wall_seconds": round(wall, 3),
+        "articles_per_second": round(found / wall, 2) if wall > 0 else 0.0,
+        "cpu_seconds": round(end_cpu - start_cpu, 3),
+        "rss_start_mb": round(rss_start, 1),
+        "peak_rss_mb": round(rss_mb(), 1),
+        "phases": phases,
+        "stages": profiler.report(),
+        "article_server": {"requests": articles.requests, "injected_errors": articles.errors},
+        "redirect_server": {"requests": redirects.requests},
+        "notion_server": dict(notion.responses),
+        "rejection_reasons": dict(scraper.rejection_reasons),
+        "transport": scraper.transport.stats(),
+        "hosts": scraper.host_health.stats(),
+        "metrics": metrics.summary()["timings"],
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    """計測結果を表示します.
+
+    Args:
+        result: replayの計測結果
+    """
+    print(
+        f"queries={result['queries']} gnews_calls={result.get('gnews_calls', '-')} "
+        f"search_results={result['search_results']} "
+        f"articles={result['articles']} written={result['written']} "
+        f"dead_letters={result['dead_letters']}"
+    )
+    print(
+        f"wall={result['wall_seconds']:.2f}s articles/sec={result['articles_per_second']:.2f} "
+        f"cpu={result['cpu_seconds']:.2f}s rss={result['rss_start_mb']:.1f}"
+        f"->{result['peak_rss_mb']:.1f}MB"
+    )
+    for name, phase in result["phases"].items():
+        print(
+            f"  phase {name:<12} wall={phase['wall_seconds']:.2f}s "
+            f"cpu={phase['cpu_seconds']:.2f}s peak_rss={phase['peak_rss_mb']:.1f}MB"
+        )
+    print(f"{'stage':>18} {'calls':>6} {'wall(s)':>8} {'cpu(s)':>8}")
+    for name, stage in result["stages"].items():
+        print(
+            f"{name:>18} {int(stage['calls']):>6} {stage['wall_seconds']:>8.3f} "
+            f"{stage['cpu_seconds']:>8.3f}"
+        )
+    print(
+        f"article_server={result['article_server']} redirect_server={result['redirect_server']} "
+        f"notion_server={result['notion_server']}"
+    )
+    print(f"rejection_reasons={result['rejection_reasons']}")
+    print(f"transport={result['transport']}")
+    print(f"hosts={result['hosts']}")
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> bool:
+    """計測結果をベースラインと比較します.
+
+    Args:
+        result: 今回の計測結果
+        baseline: 保存したベースライン
+        max_regression: 許容する悪化の割合（0.2なら20%）
+
+    Returns:
+        bool: いずれかの指標が許容範囲を超えて悪化した場合True
+    """
+    regressed = False
+    print(f"{'metric':>20} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, higher_is_better in COMPARED_METRICS.items():
+        before, after = baseline.get(name), result.get(name)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > max_regression:
+            regressed = True
+            flag = " REGRESSION"
+        print(f"{name:>20} {before:>10.2f} {after:>10.2f} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="実際の検索結果と記事ページを記録")
+    record_parser.add_argument("--out", required=True, help="記録の保存先ディレクトリ")
+    record_parser.add_argument("--queries", nargs="+", help="検索キーワード（省略時は設定の先頭）")
+    record_parser.add_argument("--limit", type=int, default=3, help="--queries省略時のキーワード数")
+    record_parser.add_argument("--with-notion", action="store_true", help="Notionデータベースの読み込み結果も記録")
+
+    replay_parser = commands.add_parser("replay", help="記録を再生して計測")
+    replay_parser.add_argument("--recording", help="記録のディレクトリ（省略時は合成した記録）")
+    replay_parser.add_argument("--synthetic-queries", type=int, default=6, help="合成するキーワード数")
+    replay_parser.add_argument(
+        "--synthetic-articles", type=int, default=20, help="合成する1キーワードあたりの記事数"
+    )
+    replay_parser.add_argument("--latency", type=float, default=0.05, help="記事ページの応答遅延（秒）")
+    replay_parser.add_argument("--error-rate", type=float, default=0.05, help="記事ページの503の確率")
+    replay_parser.add_argument("--search-latency", type=float, default=0.3, help="検索の遅延（秒）")
+    replay_parser.add_argument("--query-delay", type=float, default=0.2, help="クエリの最小間隔（秒）")
+    replay_parser.add_argument("--notion-latency", type=float, help="Notionの応答遅延（秒）。省略時は記録の値か0.1")
+    replay_parser.add_argument(
+        "--notion-error-rate", type=float, default=0.05, help="Notionの429/503の確率"
+    )
+    replay_parser.add_argument("--notion-rate", type=float, default=10.0, help="Notion側のレート上限（件/秒）")
+    replay_parser.add_argument("--workers", type=int, default=3, help="並行して処理するキーワード数")
+    replay_parser.add_argument("--notion-workers", type=int, default=3, help="Notionの書き込みワーカー数")
+    replay_parser.add_argument(
+        "--no-redirects",
+        action="store_true",
+        help="検索結果のリンクをリダイレクトURLにせず、記事ページのURLを直接使う",
+    )
+    replay_parser.add_argument(
+        "--transport",
+        choices=["requests", "httpx"],
+        default=HTTP_TRANSPORT,
+        help="記事ページの取得に使用する通信",
+    )
+    replay_parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    replay_parser.add_argument("--save-baseline", help="計測結果をベースラインとして保存するパス")
+    replay_parser.add_argument("--baseline", help="比較するベースラインのパス")
+    replay_parser.add_argument(
+        "--max-regression", type=float, default=0.2, help="許容する悪化の割合（0.2なら20%%）"
+    )
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.out, args.queries or SEARCH_QUERIES[: args.limit], args.with_notion)
+        return
+
+    with tempfile.TemporaryDirectory() as synthetic_dir:
+        recording_dir = args.recording
+        if not recording_dir:
+            synthesize(synthetic_dir, args.synthetic_queries, args.synthetic_articles, args.seed)
+            recording_dir = synthetic_dir
+        result = replay(args, recording_dir)
+    if not args.recording:
+        result["recording"] = "synthetic"
+    print_report(result)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"ベースラインを保存しました: {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""感情分析の方式ごとの処理速度とメモリ使用量を計測するベンチマーク.
+
+合成した日本語の記事本文に対して、最長一致（dictionary）と形態素解析（janome）の
+2つの方式について、初期化時間、1秒あたりの処理件数、ピークメモリ（tracemalloc）を計測します.
+同じ本文を再度分析した場合（キャッシュヒット時）の処理速度もあわせて表示します.
+
+使い方:
+    python benchmarks/bench_sentiment.py [--articles 3000] [--memory-sample 100]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config.settings import POSITIVE_WORDS  # noqa: E402
+from services.sentiment import SentimentAnalyzer  # noqa: E402
+
+NOUNS = ["研究チーム", "企業", "自治体", "大学", "病院", "学生", "地域", "団体", "市場", "開発者"]
+VERBS = ["発表した", "取り組んでいる", "明らかにした", "進めている", "計画している"]
+
+
+def build_corpus(size: int, seed: int = 0) -> List[str]:
+    """ポジティブワードを含む合成記事本文のコーパスを生成します.
+
+    Args:
+        size: 記事数
+        seed: 乱数シード
+
+    Returns:
+        List[str]: 記事本文のリスト（1件あたり約1000文字）
+    """
+    rng = random.Random(seed)
+    words = sorted(POSITIVE_WORDS)
+    corpus = []
+    for _ in range(size):
+        sentences = []
+        while sum(len(s) for s in sentences) < 1000:
+            word = rng.choice(words) if rng.random() < 0.3 else "取り組み"
+            sentences.append(
+                f"{rng.choice(NOUNS)}は新しい{word}について{rng.choice(NOUNS)}と{rng.choice(VERBS)}。"
+            )
+        corpus.append("".join(sentences)[:1000])
+    return corpus
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=3000, help="コーパスの記事数")
+    parser.add_argument("--memory-sample", type=int, default=100, help="ピークメモリの計測に使う記事数")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.articles)
+    print(f"articles={len(corpus)}")
+    print(
+        f"{'strategy':>10} {'init(s)':>8} {'init peak(MB)':>14} {'texts/sec':>10} "
+        f"{'peak(MB)':>9} {'cached texts/sec':>17}"
+    )
+    for strategy in ("dictionary", "janome"):
+        # tracemalloc下ではjanomeが大幅に遅くなるため、メモリは一部の記事だけで計測する
+        tracemalloc.start()
+        analyzer = SentimentAnalyzer(strategy=strategy, cache_size=len(corpus))
+        init_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        analyzer.analyze_batch(corpus[: args.memory_sample])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        analyzer = SentimentAnalyzer(strategy=strategy, cache_size=len(corpus))
+        init_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analyzer.analyze_batch(corpus)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analyzer.analyze_batch(corpus)
+        cached_elapsed = time.perf_counter() - start
+
+        print(
+            f"{strategy:>10} {init_time:>8.2f} {init_peak / 2**20:>14.1f} "
+            f"{len(corpus) / elapsed:>10.0f} {peak / 2**20:>9.1f} "
+            f"{len(corpus) / cached_elapsed:>17.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
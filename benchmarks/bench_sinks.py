@@ -0,0 +1,150 @@
+"""出力先ごとに記事を書き込むスループットを計測するベンチマーク.
+
+合成した記事（既定で10万件）を、JSON Lines・SQLite・Parquet（pyarrowがある場合）の
+出力先に一時ディレクトリへ書き込み、1秒あたりの件数とファイルサイズを表示します.
+比較のため、1件ごとに書き込む場合（batch=1）を少ない件数で計測し、Notionについては
+書き込みのレート上限（NOTION_REQUESTS_PER_SECOND）から求めた所要時間を表示します.
+
+使い方:
+    python benchmarks/bench_sinks.py [--records 100000] [--batch-size 500] [--unbatched 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config.settings import NOTION_REQUESTS_PER_SECOND  # noqa: E402
+from services.article import Article  # noqa: E402
+from services.sinks import BufferedSink, JSONLSink, ParquetSink, SQLiteSink  # noqa: E402
+
+SENTENCES = [
+    "研究チームは新しい技術の開発に成功したと発表した。",
+    "地域の活性化に向けた取り組みが始まり、住民からは期待の声が上がっている。",
+    "同社は来年度から新サービスの提供を開始する予定だ。",
+    "専門家は今後の動向を注視する必要があると指摘している。",
+]
+
+
+def make_articles(count: int, seed: int) -> List[Article]:
+    """合成した記事を生成します.
+
+    Args:
+        count: 記事数
+        seed: 乱数のシード
+
+    Returns:
+        List[Article]: 記事のリスト
+    """
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, 9, 0)
+    return [
+        Article(
+            title=f"新技術の開発に成功 {i}",
+            link=f"https://publisher{i % 50}.example/articles/{i}?utm_source=gnews",
+            snippet=rng.choice(SENTENCES),
+            published_at=base + timedelta(minutes=i),
+            publisher=f"配信元{i % 50}",
+            content="".join(rng.choice(SENTENCES) for _ in range(8)),
+            sentiment_score=rng.random(),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(factory: Callable[[], BufferedSink], items: List[Article]) -> Tuple[float, int, str]:
+    """出力先に記事を投入し、閉じるまでの時間を計測します.
+
+    Args:
+        factory: 出力先を生成する関数
+        items: 書き込む記事
+
+    Returns:
+        Tuple[float, int, str]: 所要時間（秒）、書き込んだ件数、出力したファイルのパス
+    """
+    sink = factory()
+    start = time.perf_counter()
+    sink.submit_all(items)
+    dead_letters = sink.close()
+    elapsed = time.perf_counter() - start
+    if dead_letters:
+        print(f"{sink.name}: {len(dead_letters)}件の書き込みに失敗しました: {dead_letters[0].error}")
+    return elapsed, sink.written, getattr(sink, "path", "")
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示します."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100_000, help="書き込む記事数")
+    parser.add_argument("--batch-size", type=int, default=500, help="まとめて書き込む件数")
+    parser.add_argument("--unbatched", type=int, default=2000, help="1件ごとに書き込む場合の記事数")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    args = parser.parse_args()
+
+    items = make_articles(args.records, args.seed)
+    try:
+        import pyarrow  # noqa: F401
+
+        has_pyarrow = True
+    except ImportError:
+        has_pyarrow = False
+        print("pyarrowがインストールされていないため、Parquetは計測しません")
+
+    print(
+        f"{'sink':>8} {'batch':>6} {'records':>8} {'time(s)':>9} {'records/s':>11} "
+        f"{'size(MB)':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = []
+        for batch_size, count in ((args.batch_size, args.records), (1, args.unbatched)):
+            options = {"batch_size": batch_size, "flush_interval": 0}
+            run = f"{batch_size}-{count}"
+            cases.append(
+                (
+                    "jsonl",
+                    batch_size,
+                    count,
+                    lambda o=options, r=run: JSONLSink(os.path.join(tmp, f"{r}.jsonl"), **o),
+                )
+            )
+            cases.append(
+                (
+                    "sqlite",
+                    batch_size,
+                    count,
+                    lambda o=options, r=run: SQLiteSink(os.path.join(tmp, f"{r}.sqlite3"), **o),
+                )
+            )
+            if has_pyarrow:
+                cases.append(
+                    (
+                        "parquet",
+                        batch_size,
+                        count,
+                        lambda o=options, r=run: ParquetSink(os.path.join(tmp, r), **o),
+                    )
+                )
+
+        for name, batch_size, count, factory in cases:
+            elapsed, written, path = measure(factory, items[:count])
+            size = os.path.getsize(path) / 1e6 if os.path.exists(path) else 0.0
+            print(
+                f"{name:>8} {batch_size:>6} {written:>8} {elapsed:>9.3f} "
+                f"{written / elapsed:>11,.0f} {size:>9.1f}"
+            )
+
+    estimate = args.records / NOTION_REQUESTS_PER_SECOND
+    print(
+        f"{'notion':>8} {1:>6} {args.records:>8} {estimate:>9.0f} "
+        f"{NOTION_REQUESTS_PER_SECOND:>11,.1f} {'-':>9}  (レート上限からの推定)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@
 
 import os
 import sys
-from typing import List, Tuple, Set
+from typing import Dict, List, Set, Tuple
 
 # ニュース取得モードの設定
 NEWS_MODE = os.getenv("NEWS_MODE", "trend")  # "trend" または "positive"
@@ -17,21 +17,117 @@ NEWS_MODE = os.getenv("NEWS_MODE", "trend")  # "trend" または "positive"
 # GNewsの制限に関する定数
 DAILY_QUERY_LIMIT = 100  # GNewsの1日あたりの最大クエリ数
 MAX_RESULTS_PER_QUERY = 5  # 1回の検索で取得する最大記事数（質を重視して減らす）
+SEARCH_PERIOD_HOURS = 12  # 検索の対象期間（時間）。前回の検索が新しい場合はその間隔まで短縮する
 DELAY_BETWEEN_QUERIES = 3  # クエリ間の待機時間（秒）（負荷を考慮して増やす）
+KEYWORD_WORKERS = int(os.getenv("KEYWORD_WORKERS", "3"))  # 並行して処理するキーワード数
 
 # Lambda実行回数に基づく制限
 LAMBDA_EXECUTIONS_PER_DAY = 4  # 1日のLambda実行回数（コスト最適化）
 MAX_QUERIES_PER_EXECUTION = int(DAILY_QUERY_LIMIT / LAMBDA_EXECUTIONS_PER_DAY)
+QUERIES_PER_KEYWORD = 1  # 1キーワードあたりのGNewsクエリ数（search_newsは1回だけ検索する）
+
+# キーワードごとの実績（新しい記事の件数）に基づくクエリ数の配分
+QUERY_YIELD_TTL_SECONDS = 30 * 24 * 60 * 60  # キーワードごとの実績を保持する期間
+QUERY_YIELD_DECAY = 0.8  # 検索のたびに過去の実績に掛ける減衰率（直近の実績を重視する）
+QUERY_EXPLORATION = 1.0  # 実績の少ないキーワードを試す度合い（UCBの探索項の係数）
+
+# 複数のキーワードを1回のOR検索にまとめ、検索結果をタイトルと説明文でキーワードに振り分ける
+QUERY_GROUP_SIZE = int(os.getenv("QUERY_GROUP_SIZE", "1"))  # 1回の検索にまとめるキーワード数の上限（1はまとめない）
+QUERY_GROUP_OVERSAMPLING = 2  # まとめた検索で取得する件数の倍率（キーワード数×MAX_RESULTS_PER_QUERYに掛ける）
 
 # スクレイピング設定
 MIN_CONTENT_LENGTH = 200  # 記事本文の最小文字数（短すぎる記事を除外）
 MAX_CONTENT_LENGTH = 1000  # 記事本文の最大文字数（長めに設定して内容を確保）
 REQUEST_TIMEOUT = 15  # 記事取得時のタイムアウト（秒）（遅いサイトに対応）
+MAX_DOWNLOAD_BYTES = 512 * 1024  # 記事ページから読み込む最大バイト数（巨大なページの読み込みを打ち切る）
+
+# 記事本文の並列取得設定
+MAX_FETCH_WORKERS = int(os.getenv("MAX_FETCH_WORKERS", "8"))  # 同時に取得する記事数の上限
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("MAX_CONNECTIONS_PER_HOST", "2"))  # 同一ホストへの同時接続数
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", "0"))  # 記事の解析を行うワーカープロセス数（1以下はプロセスプールを使わない）
+DEADLINE_SAFETY_MARGIN = 10  # Lambdaのタイムアウト前に処理を打ち切るための余裕（秒）
+WRITE_TIME_RESERVE = 20  # 新しいキーワードの検索を打ち切った後、Notionへの書き込みに残す時間（秒）
+
+# 記事ページの取得に使用する通信の設定（同じ配信元への接続を使い回す）
+HTTP_TRANSPORT = os.getenv("HTTP_TRANSPORT", "requests")  # "requests" または "httpx"（h2があればHTTP/2）
+HTTP_POOL_HOSTS = 32  # 接続を保持する配信元（ホスト）の数。ホストごとの接続数はMAX_CONNECTIONS_PER_HOST
+HTTP_MAX_RETRIES = 2  # 接続の確立の失敗や429/5xx応答時の最大リトライ回数（GET/HEADのみ）
+HTTP_BACKOFF_FACTOR = 0.3  # リトライの待機時間の係数（指数バックオフ）
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)  # リトライするステータスコード
+HTTP_DRAIN_MAX_BYTES = 64 * 1024  # 本文の読み込みを打ち切った後、残りがこのサイズ以下なら読み切って接続を再利用する
+DNS_CACHE_TTL_SECONDS = int(os.getenv("DNS_CACHE_TTL_SECONDS", "300"))  # 名前解決の結果を保持する期間（0で無効）
+DNS_CACHE_MAX_ENTRIES = 256  # 名前解決の結果を保持する最大件数（ホスト数）
+
+# 配信元（ホスト）ごとの応答時間と障害の記録（失敗が続く配信元は一定時間取得しない）
+HOST_HEALTH_TTL_SECONDS = 30 * 24 * 60 * 60  # 配信元ごとの記録を保持する期間
+HOST_LATENCY_SAMPLES = 20  # タイムアウトの算出に使う直近の応答時間の件数
+HOST_MIN_LATENCY_SAMPLES = 5  # これより少ない場合はREQUEST_TIMEOUTを使う
+HOST_TIMEOUT_PERCENTILE = 0.95  # タイムアウトの基準にする応答時間の百分位
+HOST_TIMEOUT_MULTIPLIER = 3.0  # 基準の応答時間に掛ける倍率
+HOST_MIN_TIMEOUT = 3  # 配信元ごとのタイムアウトの下限（秒）。上限はREQUEST_TIMEOUT
+HOST_FAILURE_THRESHOLD = 3  # 連続してこの回数失敗した配信元は取得を停止する
+HOST_COOLDOWN_SECONDS = 3 * 60 * 60  # 取得を停止してから再度試すまでの時間
+HOST_COOLDOWN_MAX_SECONDS = 48 * 60 * 60  # 再度試して失敗するたびに倍にする停止時間の上限
+
+# 実行をまたいで使用するキャッシュの設定（Lambdaでは書き込み可能な/tmpに配置）
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_DIR = os.getenv("CACHE_DIR", "/tmp" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else ".cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "scrap_line_cache.sqlite3")
+CACHE_TTL_SECONDS = 12 * 60 * 60  # 検索期間（12時間）と同じだけ保持
+CACHE_MAX_ENTRIES = 5000  # 用途ごとに保持する最大件数
+CACHE_TOUCH_INTERVAL_SECONDS = 60  # 参照日時（削除する順序）を更新する最短の間隔。参照のたびには書き込まない
+CACHE_EVICT_RATIO = 0.05  # 件数上限を超えた際に、次の削除までの余裕として上限からさらに削除する割合
+HTTP_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60  # 記事ページの検証子（ETag/Last-Modified）を保持する期間
+HTTP_CACHE_MAX_ENTRIES = 2000  # 検証子と抽出済み本文を保持する最大ページ数
+REDIRECT_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # Google NewsのリダイレクトURLと記事の正規URLの対応を保持する期間
+REDIRECT_CACHE_MAX_ENTRIES = 20000  # リダイレクトURLと正規URLの対応を保持する最大件数
+# リダイレクトURLの解決でnews.google.comへ同時に送るリクエスト数（応答はLocationヘッダーのみで軽い）
+REDIRECT_MAX_CONNECTIONS = int(os.getenv("REDIRECT_MAX_CONNECTIONS", "4"))
+EXTRACTION_PROFILE_TTL_SECONDS = 30 * 24 * 60 * 60  # 配信元ごとに学習した本文の抽出方法を保持する期間
+NEAR_DUPLICATE_TTL_SECONDS = 24 * 60 * 60  # 近似重複の判定に使用する記事を保持する期間
+NEAR_DUPLICATE_INDEX_PATH = os.path.join(CACHE_DIR, "near_duplicate_index.bin")
+CHECKPOINT_PATH = os.path.join(CACHE_DIR, "checkpoint.json")  # 打ち切った処理を次回に再開するための記録
+WATERMARK_OVERLAP_SECONDS = 30 * 60  # 前回の最新の公開日時より前でも再確認する期間（検索への反映の遅れを考慮）
+
+# 配信元ごとの本文の抽出方法（学習した方法より優先する）
+# ホスト: ("meta",) または ("selector", 要素名, クラス) の形式で指定する
+# 例: "www.example.co.jp": ("selector", "div", "article-body")
+EXTRACTION_PROFILES: Dict[str, Tuple[str, ...]] = {}
+
+# 処理時間と件数の計測（無効にすると計測のオーバーヘッドがほぼなくなる）
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
 
 # Notion API認証情報（必須）
 NOTION_API_KEY = os.getenv("NOTION_API_KEY", "")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID", "")
 
+# Notionへの書き込み設定（Notion APIの上限は平均で約3リクエスト/秒）
+NOTION_REQUESTS_PER_SECOND = 2.8  # 書き込みのレート上限（上限ちょうどだと429が増えるため少し下回る値）
+NOTION_WRITE_WORKERS = 3  # 同時に書き込むワーカー数
+NOTION_WRITE_QUEUE_SIZE = 100  # 書き込み待ちの最大件数（超えると投入側が待機）
+NOTION_MAX_RETRIES = 5  # 429/5xx応答時の最大リトライ回数
+NOTION_BACKOFF_BASE = 0.5  # 指数バックオフの初期待機時間（秒）
+NOTION_BACKOFF_MAX = 30  # 指数バックオフの最大待機時間（秒）
+NOTION_UPSERT_MODE = os.getenv("NOTION_UPSERT_MODE", "skip")  # 既存URLの扱い: "skip" または "update"
+NOTION_INDEX_PATH = os.path.join(  # URL→ページIDの索引（データベースごとに分ける）
+    CACHE_DIR, f"notion_page_index_{NOTION_DATABASE_ID or 'default'}.bin"
+)
+
+# 記事の出力先（"notion"、"jsonl"、"sqlite"、"parquet"をカンマ区切りで指定。先頭が主な出力先）
+OUTPUT_SINKS = [
+    name.strip() for name in os.getenv("OUTPUT_SINKS", "notion").split(",") if name.strip()
+]
+OUTPUT_DIR = os.getenv(
+    "OUTPUT_DIR", "/tmp/output" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "output"
+)
+JSONL_OUTPUT_PATH = os.path.join(OUTPUT_DIR, "articles.jsonl")  # 追記のみのJSON Lines
+SQLITE_OUTPUT_PATH = os.path.join(OUTPUT_DIR, "articles.sqlite3")  # 正規URLを主キーとする表
+PARQUET_OUTPUT_DIR = os.path.join(OUTPUT_DIR, "parquet")  # 実行ごとに1ファイル（pyarrowが必要）
+SINK_BATCH_SIZE = int(os.getenv("SINK_BATCH_SIZE", "500"))  # この件数がたまったらまとめて書き込む
+SINK_FLUSH_INTERVAL_SECONDS = float(  # 件数に達しなくても、この間隔で書き込む
+    os.getenv("SINK_FLUSH_INTERVAL_SECONDS", "5")
+)
+
 # トレンド記事用の検索キーワード
 TREND_SEARCH_QUERIES: List[Tuple[str, int]] = [
     # 一般ニュース
@@ -125,6 +221,19 @@ POSITIVE_IRRELEVANT_PATTERNS = [
 # ポードに応じて使用する除外パターンを選択
 IRRELEVANT_PATTERNS = TREND_IRRELEVANT_PATTERNS if NEWS_MODE == "trend" else POSITIVE_IRRELEVANT_PATTERNS
 
+# 質の低い記事の特徴を示すパターン
+POOR_QUALITY_PATTERNS = [
+    r'クリック(?:して|により)',  # クリックベイト
+    r'(?:詳しくは|続きは)こちら',  # 誘導文
+    r'お得な?(?:情報|ニュース)',
+    r'速報',  # 速報系は避ける（質が低いことが多い）
+    r'まとめ',
+    r'\[\s*PR\s*\]',  # PRマーク
+    r'提供：',
+    r'コラボ(?:レーション)?',
+    r'タイアップ',
+]
+
 # ポジティブワードリスト（カテゴリごとに整理）
 POSITIVE_WORDS: Set[str] = {
     # 革新・発展
@@ -152,5 +261,12 @@ POSITIVE_WORDS: Set[str] = {
     "実証", "検証", "革新", "進化", "向上",
 }
 
+# 感情分析の設定
+# "dictionary": ポジティブワードの最長一致（形態素解析なし・高速）
+# "janome": 形態素解析（分かち書き）した単語との完全一致
+SENTIMENT_STRATEGY = os.getenv("SENTIMENT_STRATEGY", "dictionary")
+SENTIMENT_SATURATION = 3  # スコアが1.0になるポジティブワードの出現数
+SENTIMENT_CACHE_SIZE = 10000  # 本文のハッシュごとにスコアを保持する最大件数
+
 # 記事の質を判定するための最小スコア（0-1の範囲）
 MIN_SENTIMENT_SCORE = 0.7 if NEWS_MODE == "positive" else 0.0  # トレンドモードでは感情分析を無効化
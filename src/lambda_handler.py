@@ -2,31 +2,67 @@
 
 import json
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Dict, List
 
 from config.settings import (
+    DEADLINE_SAFETY_MARGIN,
+    MAX_QUERIES_PER_EXECUTION,
     MAX_RESULTS_PER_QUERY,
-    SEARCH_QUERIES
+    PRIORITIZED_SEARCH_QUERIES,
+    WRITE_TIME_RESERVE,
 )
+from services.article import Article
 from services.google_news import GoogleNewsScraper
-from services.notion import NotionClient
+from services.query_planner import QueryPlanner, group_queries
+from services.scheduler import KeywordScheduler
+from services.sinks import create_sinks
+from utils.cache import SEEN_URLS_NAMESPACE, open_cache
+from utils.checkpoint import CheckpointStore, FileCheckpointStore, create_checkpoint
+from utils.deadline import Deadline
+from utils.metrics import metrics
 
+# 打ち切った処理の保存先（ローカルファイル以外に保存する場合は差し替える）
+checkpoint_store: CheckpointStore = FileCheckpointStore()
+
+
+def plan_queries(planner: QueryPlanner, carried_over: List[str]) -> List[str]:
+    """今回の実行で検索するキーワードを決定します.
+
+    前回の実行から持ち越したキーワードを先頭にし、残りのクエリ数を
+    キーワードごとの実績（新しい記事の件数）に基づいて配分します.
 
-def calculate_query_batch(current_hour: int) -> list:
-    """実行時間帯に応じて検索するキーワードを決定します.
-    
     Args:
-        current_hour (int): 現在の時間（0-23）
-        
+        planner: キーワードごとの実績を保持する配分クラス
+        carried_over: 前回の実行で検索できなかったキーワード
+
     Returns:
-        list: 現在のバッチで検索するキーワードのリスト
+        List[str]: 検索するキーワードのリスト（優先度順）
     """
-    batch_size = len(SEARCH_QUERIES) // 6  # 6回に分割
-    batch_number = current_hour // 4  # 4時間ごとに実行
-    
-    start_idx = batch_number * batch_size
-    end_idx = start_idx + batch_size if batch_number < 5 else len(SEARCH_QUERIES)
-    return SEARCH_QUERIES[start_idx:end_idx]
+    candidates = [
+        (query, priority)
+        for query, priority in PRIORITIZED_SEARCH_QUERIES
+        if query not in carried_over
+    ]
+    # 持ち越したキーワードも検索のまとまりに分けて、使用するクエリ数を数える
+    carried_queries = len(group_queries([(query, i) for i, query in enumerate(carried_over)]))
+    planned = planner.plan(candidates, MAX_QUERIES_PER_EXECUTION - carried_queries)
+    return carried_over + [query for query, _ in planned]
+
+
+def save_checkpoint(keywords: List[str], items: List[Article]) -> None:
+    """未処理のキーワードと未保存の記事を次回の実行のために保存します.
+
+    どちらもない場合は、以前のチェックポイントを削除します.
+
+    Args:
+        keywords: 実行期限までに検索できなかったキーワード
+        items: 実行期限までに出力先（Notion）へ書き込めなかった記事
+    """
+    if keywords or items:
+        checkpoint_store.save(create_checkpoint(keywords, [item.to_dict() for item in items]))
+        print(f"処理を次回に持ち越します。(キーワード: {len(keywords)}件, 記事: {len(items)}件)")
+    else:
+        checkpoint_store.clear()
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -40,24 +76,66 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Dict[str, Any]: 実行結果を含むレスポンス
     """
     try:
-        # 実行時間帯に応じたキーワードバッチを取得
+        # ウォームスタート時に前回の実行の計測結果を持ち越さない
+        metrics.reset()
+
         current_hour = datetime.now().hour
-        current_batch = calculate_query_batch(current_hour)
-        
+
+        # 前回の実行で打ち切った処理があれば、そのキーワードから再開する
+        checkpoint = checkpoint_store.load()
+        if checkpoint:
+            print(
+                f"{checkpoint.saved_at}の実行から再開します。"
+                f"(キーワード: {len(checkpoint.keywords)}件, 記事: {len(checkpoint.items)}件)"
+            )
+
+        # 実績に基づいて今回検索するキーワードを選ぶ
+        planner = QueryPlanner()
+        current_batch = plan_queries(planner, checkpoint.keywords if checkpoint else [])
+
+        # Lambdaの残り実行時間から期限を設定（検索はNotionへの書き込みの時間を残して打ち切る）
+        deadline = Deadline.from_lambda_context(context, margin=DEADLINE_SAFETY_MARGIN)
+        search_deadline = deadline.before(WRITE_TIME_RESERVE)
+
+        # 保存済みURLのキャッシュはスクレイパーと出力先で共有
+        seen_urls = open_cache(SEEN_URLS_NAMESPACE)
+
         # Google News スクレイパーの初期化
-        scraper = GoogleNewsScraper()
+        scraper = GoogleNewsScraper(
+            deadline=search_deadline, seen_urls=seen_urls, query_planner=planner
+        )
         
-        # Notion クライアントの初期化
-        notion_client = NotionClient()
+        # 出力先の初期化（書き込みは次のキーワードの検索と並行して行う）
+        writer = create_sinks(seen_urls=seen_urls, deadline=deadline)
+        if checkpoint:
+            writer.carry_over([Article.from_dict(item) for item in checkpoint.items])
         
         print(f"現在のバッチのキーワード数: {len(current_batch)}")
         print(f"処理するキーワード: {current_batch}")
         
-        # 各キーワードで検索を実行
-        for query in current_batch:
-            news_items = scraper.search_news(query, max_results=MAX_RESULTS_PER_QUERY)
-            notion_client.save_news_to_notion(news_items)
+        def on_results(query: str, news_items: List[Article]) -> None:
+            writer.submit_all(news_items)
             print(f"キーワード '{query}' の検索が完了しました。(使用クエリ数: {scraper.query_count})")
+
+        # 各キーワードで並行して検索を実行（バッチ内の順序を優先度とする）
+        scheduler = KeywordScheduler(scraper, max_results=MAX_RESULTS_PER_QUERY)
+        try:
+            scheduler.run(
+                [(query, priority) for priority, query in enumerate(current_batch)],
+                on_results=on_results,
+            )
+        finally:
+            dead_letters = writer.close()
+            # ウォームスタートで実行ごとのスレッドや接続、ワーカープロセスが残り続けないよう、ここで閉じる
+            scraper.close()
+            pending_keywords = [query for query, _ in scheduler.pending]
+            save_checkpoint(pending_keywords, writer.pending)
+        print(f"記事ページの取得結果: {scraper.http_cache.format_stats()}")
+        print(f"記事ページの通信: {scraper.transport.format_stats()}")
+        print(f"配信元ごとの取得結果: {scraper.host_health.format_stats()}")
+        print(f"キーワードごとの実績: {planner.format_stats(current_batch)}")
+        metrics_summary = metrics.log_summary()
+        print(f"保存が完了しました。({writer.format_stats()})")
         
         return {
             'statusCode': 200,
@@ -65,6 +143,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'message': 'Success',
                 'processed_keywords': len(current_batch),
                 'total_queries': scraper.query_count,
+                'saved_pages': writer.written,
+                'sinks': writer.stats(),
+                'http_cache': scraper.http_cache.stats(),
+                'transport': scraper.transport.stats(),
+                'hosts': scraper.host_health.stats(),
+                'pending_keywords': pending_keywords,
+                'pending_items': len(writer.pending),
+                'metrics': metrics_summary,
+                'failed_items': [
+                    {'link': dead.item.link, 'error': dead.error, 'sink': dead.sink}
+                    for dead in dead_letters
+                ],
                 'batch_time': f"{current_hour}時台"
             }, ensure_ascii=False)
         }
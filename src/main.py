@@ -1,40 +1,73 @@
-"""Google Newsからポジティブなニュースを収集し、Notionに保存するスクリプト."""
+"""Google Newsからポジティブなニュースを収集し、Notionなどの出力先に保存するスクリプト."""
+
+from typing import List
 
 from config.settings import (
-    DAILY_QUERY_LIMIT,
+    MAX_QUERIES_PER_EXECUTION,
     MAX_RESULTS_PER_QUERY,
+    PRIORITIZED_SEARCH_QUERIES,
     QUERIES_PER_KEYWORD,
-    SEARCH_QUERIES,
+    QUERY_GROUP_SIZE,
 )
+from services.article import Article
 from services.google_news import GoogleNewsScraper
-from services.notion import NotionClient
+from services.query_planner import QueryPlanner, group_queries
+from services.scheduler import KeywordScheduler
+from services.sinks import create_sinks
+from utils.cache import SEEN_URLS_NAMESPACE, open_cache
 from utils.logger import logger
+from utils.metrics import metrics
 
 
 def main() -> None:
     """メインの実行関数です.
 
-    Google Newsから記事を取得し、Notionデータベースに保存します。
+    Google Newsから記事を取得し、設定した出力先（既定ではNotionデータベース）に保存します。
     """
     try:
+        # 保存済みURLのキャッシュはスクレイパーと出力先で共有
+        seen_urls = open_cache(SEEN_URLS_NAMESPACE)
+
         # Google News スクレイパーの初期化
-        scraper = GoogleNewsScraper()
+        planner = QueryPlanner()
+        scraper = GoogleNewsScraper(seen_urls=seen_urls, query_planner=planner)
 
-        # キーワード数を制限（75クエリ÷3回=最大25キーワード）
-        max_keywords = DAILY_QUERY_LIMIT // QUERIES_PER_KEYWORD
-        search_queries = SEARCH_QUERIES[:max_keywords]
+        # 実行ごとのクエリ数の上限に収まるだけ、実績（新しい記事の件数）の多いキーワードから選ぶ
+        # （QUERY_GROUP_SIZEが2以上の場合は、1回の検索に複数のキーワードをまとめる）
+        max_queries = min(MAX_QUERIES_PER_EXECUTION, scraper.remaining_queries())
+        planned = planner.plan(PRIORITIZED_SEARCH_QUERIES, max_queries)
+        search_queries = [query for query, _ in planned]
 
-        # Notion クライアントの初期化
-        notion_client = NotionClient()
+        # 出力先の初期化（書き込みは次のキーワードの検索と並行して行う）
+        writer = create_sinks(seen_urls=seen_urls)
 
-        logger.info(f"本日の検索予定クエリ数: {len(search_queries) * QUERIES_PER_KEYWORD}")
+        query_count = len(group_queries(planned, QUERY_GROUP_SIZE)) * QUERIES_PER_KEYWORD
+        logger.info(f"本日の検索予定クエリ数: {query_count} (キーワード数: {len(search_queries)})")
 
-        # 各キーワードで検索を実行
-        for query in search_queries:
-            news_items = scraper.search_news(query, max_results=MAX_RESULTS_PER_QUERY)
-            notion_client.save_news_to_notion(news_items)
+        def on_results(query: str, news_items: List[Article]) -> None:
+            writer.submit_all(news_items)
             logger.info(f"キーワード '{query}' の検索が完了しました。(使用クエリ数: {scraper.query_count})")
 
+        # 各キーワードで並行して検索を実行（選んだ順序を優先度とする）
+        try:
+            scheduler = KeywordScheduler(scraper, max_results=MAX_RESULTS_PER_QUERY)
+            scheduler.run(
+                [(query, priority) for priority, query in enumerate(search_queries)],
+                on_results=on_results,
+            )
+        finally:
+            dead_letters = writer.close()
+            scraper.close()
+
+        logger.info(f"記事ページの取得結果: {scraper.http_cache.format_stats()}")
+        logger.info(f"記事ページの通信: {scraper.transport.format_stats()}")
+        logger.info(f"配信元ごとの取得結果: {scraper.host_health.format_stats()}")
+        logger.info(f"キーワードごとの実績: {planner.format_stats(search_queries)}")
+        logger.info(f"出力先ごとの保存結果: {writer.format_stats()}")
+        metrics.log_summary()
+        for dead in dead_letters:
+            logger.warning(f"記事を保存できませんでした: {dead.sink} {dead.item.link} - {dead.error}")
+
         logger.info(f"すべてのニュース記事の取得と保存が完了しました。総クエリ数: {scraper.query_count}")
 
     except Exception as e:
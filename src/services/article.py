@@ -0,0 +1,233 @@
+"""検索から保存まで受け渡す記事のレコードを定義するモジュール."""
+
+import hashlib
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from utils.cache import canonicalize_url
+
+# 感情スコアがこの値を超える記事をポジティブとみなす
+POSITIVE_THRESHOLD = 0.6
+
+SENTENCE_DELIMITER = re.compile(r"[。！？]")
+
+# 語数の概算に使用する、同じ文字種（漢字・ひらがな・カタカナ・英数字）の連続
+TOKEN_PATTERN = re.compile(r"[一-龥々〆ヶ]+|[ぁ-ゖ]+|[ァ-ヺー]+|[0-9A-Za-z０-９Ａ-Ｚａ-ｚ]+")
+
+
+class Article:
+    """1件の記事を表すレコードです.
+
+    辞書の代わりに__slots__を持つクラスとして保持し、記事あたりのメモリを抑えます.
+    正規化URLや文の分割などの派生値は、初めて参照した時点で計算して保持します.
+    URLや本文を設定し直した場合は、それらから求めた派生値を破棄します.
+    """
+
+    __slots__ = (
+        "title",
+        "_link",
+        "snippet",
+        "published_at",
+        "publisher",
+        "sentiment_score",
+        "_content",
+        "_canonical_url",
+        "_text",
+        "_sentences",
+        "_content_hash",
+        "_token_count",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        snippet: str,
+        published_at: datetime,
+        publisher: str = "不明",
+        content: Optional[str] = None,
+        sentiment_score: Optional[float] = None,
+    ) -> None:
+        """記事を初期化します.
+
+        Args:
+            title: 記事のタイトル
+            link: 記事のURL
+            snippet: 検索結果の説明文
+            published_at: 公開日時
+            publisher: 配信元の名前
+            content: 記事の本文。取得前はNone
+            sentiment_score: 感情スコア（0〜1）。分析していない場合はNone
+        """
+        self.title = title
+        self._link = link
+        self.snippet = snippet
+        self.published_at = published_at
+        self.publisher = publisher
+        self.sentiment_score = sentiment_score
+        self._content = content
+        self._canonical_url: Optional[str] = None
+        self._text: Optional[str] = None
+        self._sentences: Optional[List[str]] = None
+        self._content_hash: Optional[str] = None
+        self._token_count: Optional[int] = None
+
+    def __repr__(self) -> str:
+        """ログ出力用に、タイトルとURLを含む文字列を返します.
+
+        Returns:
+            str: 記事を表す文字列
+        """
+        return f"Article(title={self.title!r}, link={self.link!r})"
+
+    @property
+    def link(self) -> str:
+        """記事のURLを返します.
+
+        Returns:
+            str: 記事のURL（リダイレクトを解決した後は記事の正規URL）
+        """
+        return self._link
+
+    @link.setter
+    def link(self, link: str) -> None:
+        """記事のURLを設定し、正規化したURLのキャッシュを破棄します.
+
+        Args:
+            link: 記事のURL
+        """
+        self._link = link
+        self._canonical_url = None
+
+    @property
+    def content(self) -> str:
+        """記事の本文を返します.
+
+        Returns:
+            str: 本文。取得前は空文字列
+        """
+        return self._content or ""
+
+    @content.setter
+    def content(self, content: Optional[str]) -> None:
+        """記事の本文を設定し、本文から求めた文字列・文・ハッシュ・語数のキャッシュを破棄します.
+
+        Args:
+            content: 本文。取得できなかった場合はNone
+        """
+        self._content = content
+        self._text = None
+        self._sentences = None
+        self._content_hash = None
+        self._token_count = None
+
+    @property
+    def canonical_url(self) -> str:
+        """正規化したURL（キャッシュや重複判定のキー）を返します.
+
+        Returns:
+            str: 正規化したURL
+        """
+        if self._canonical_url is None:
+            self._canonical_url = canonicalize_url(self.link)
+        return self._canonical_url
+
+    @property
+    def text(self) -> str:
+        """タイトル、説明文、本文を連結した文字列（感情分析の対象）を返します.
+
+        Returns:
+            str: 連結した文字列
+        """
+        if self._text is None:
+            self._text = f"{self.title} {self.snippet} {self.content}"
+        return self._text
+
+    @property
+    def sentences(self) -> List[str]:
+        """本文を句点などで区切った文（前後の空白を除き、空の文を除く）を返します.
+
+        Returns:
+            List[str]: 文のリスト
+        """
+        if self._sentences is None:
+            stripped = (s.strip() for s in SENTENCE_DELIMITER.split(self.content))
+            self._sentences = [s for s in stripped if s]
+        return self._sentences
+
+    @property
+    def content_hash(self) -> str:
+        """本文のハッシュ（同じ本文の記事を見分けるキー）を返します.
+
+        Returns:
+            str: 本文のBLAKE2b（16バイト）の16進文字列
+        """
+        if self._content_hash is None:
+            digest = hashlib.blake2b(self.content.encode("utf-8"), digest_size=16)
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    @property
+    def token_count(self) -> int:
+        """本文の語数を返します.
+
+        形態素解析は行わず、同じ文字種の連続を1語として数える概算です.
+
+        Returns:
+            int: 語数。本文の取得前は0
+        """
+        if self._token_count is None:
+            self._token_count = sum(1 for _ in TOKEN_PATTERN.finditer(self.content))
+        return self._token_count
+
+    @property
+    def sentiment(self) -> str:
+        """感情スコアをNotionのSentimentに保存するラベルに変換します.
+
+        Returns:
+            str: "positive"、"neutral"、または分析していない場合は"unscored"
+        """
+        if self.sentiment_score is None:
+            return "unscored"
+        return "positive" if self.sentiment_score > POSITIVE_THRESHOLD else "neutral"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONに変換できる辞書を返します.
+
+        本文から求めるハッシュや語数は含めず、from_dictで復元した後に計算します.
+
+        Returns:
+            Dict[str, Any]: 記事の辞書。本文の取得前はcontentがNone
+        """
+        return {
+            "title": self.title,
+            "link": self.link,
+            "snippet": self.snippet,
+            "published_at": self.published_at.isoformat(),
+            "publisher": self.publisher,
+            "sentiment_score": self.sentiment_score,
+            "content": self._content,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Article":
+        """to_dictで変換した辞書から記事を復元します.
+
+        本文を含まない辞書（以前のチェックポイント）は、本文の取得前の記事として復元します.
+
+        Args:
+            data: 記事の辞書
+
+        Returns:
+            Article: 復元した記事
+        """
+        return cls(
+            title=data.get("title", ""),
+            link=data["link"],
+            snippet=data.get("snippet", ""),
+            published_at=datetime.fromisoformat(data["published_at"]),
+            publisher=data.get("publisher", "不明"),
+            content=data.get("content"),
+            sentiment_score=data.get("sentiment_score"),
+        )
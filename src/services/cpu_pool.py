@@ -0,0 +1,157 @@
+"""記事の解析（HTMLの構文解析、本文の判定、MinHash、感情分析）をプロセスプールで行うモジュール.
+
+これらの処理はCPUを使い続けるため、スレッドではGILに阻まれて並列に実行できません.
+コア数の多いマシンで長時間実行するmain.pyのために、ワーカープロセスへ分散できるようにします.
+通信（記事ページの取得）は従来どおり親プロセスのスレッドで行い、ワーカーには
+受信したHTMLをバイト列のまま渡して、変換（pickle）の負担を抑えます.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from config.settings import CPU_WORKERS
+from services.article import Article
+from services.extractor import ExtractionProfile, extract_with_profile
+from services.near_duplicate import band_keys, minhash
+
+
+class Analysis(NamedTuple):
+    """ワーカーで解析した記事の判定結果です."""
+
+    rejection: Optional[str]  # 本文の判定で除外する理由。通過した場合はNone
+    band_keys: Tuple[int, ...]  # 近似重複の判定に使うLSHのキー（除外した記事は空）
+    sentiment_score: Optional[float]  # 感情スコア（分析しなかった場合はNone）
+    timings: Dict[str, float]  # 処理ごとの所要時間（秒）。親プロセスで計測結果に加える
+
+
+def _init_worker() -> None:
+    """ワーカーの初期化処理です.
+
+    照合パターンのコンパイルと感情分析器（janomeの辞書を含む）の生成を、
+    記事ごとではなくワーカーごとに一度だけ行います.
+    """
+    import services.google_news  # noqa: F401  照合パターンはモジュールの読み込み時にコンパイルされる
+    from services.sentiment import get_sentiment_analyzer
+
+    get_sentiment_analyzer()
+
+
+def analyze_article(article: Article, score_sentiment: bool) -> Analysis:
+    """本文を設定済みの記事を判定します.
+
+    Args:
+        article: 本文を設定済みの記事
+        score_sentiment: 感情分析を行うかどうか
+
+    Returns:
+        Analysis: 判定結果
+    """
+    from services.google_news import content_rejection
+    from services.sentiment import get_sentiment_analyzer
+
+    timings: Dict[str, float] = {}
+    started_at = time.perf_counter()
+    rejection = content_rejection(article.content, article.sentences)
+    timings["filter_relevance"] = time.perf_counter() - started_at
+    if rejection is not None:
+        return Analysis(rejection, (), None, timings)
+
+    started_at = time.perf_counter()
+    keys = band_keys(minhash(f"{article.title} {article.content}"))
+    timings["near_duplicate_signature"] = time.perf_counter() - started_at
+
+    score = None
+    if score_sentiment:
+        started_at = time.perf_counter()
+        score = get_sentiment_analyzer().analyze(article.text)
+        timings["sentiment"] = time.perf_counter() - started_at
+    return Analysis(None, keys, score, timings)
+
+
+class CPUPool:
+    """記事の解析を行うプロセスプールです.
+
+    ワーカー数が1以下の場合はプロセスプールを使用せず、呼び出したスレッドで処理します.
+    プロセスプールは初めて使用する時点で起動します. 親プロセスでは記事の取得に
+    スレッドを使用しているため、ワーカーはforkではなくspawnで起動します.
+    """
+
+    def __init__(self, workers: int = CPU_WORKERS) -> None:
+        """プロセスプールを初期化します.
+
+        Args:
+            workers: ワーカープロセスの数
+        """
+        self.workers = workers
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """プロセスプールを使用するかどうかを返します.
+
+        Returns:
+            bool: ワーカー数が2以上の場合True
+        """
+        return self.workers > 1
+
+    def _get_executor(self) -> Executor:
+        """プロセスプールを返します。初回呼び出し時に起動します.
+
+        Returns:
+            Executor: プロセスプール
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def extract(
+        self, html_bytes: bytes, encoding: str, profile: Optional[ExtractionProfile] = None
+    ) -> Tuple[Optional[str], Optional[ExtractionProfile]]:
+        """HTMLから記事の本文を抽出します.
+
+        記事を取得したスレッドから呼び出し、結果が返るまで待機します.
+
+        Args:
+            html_bytes: 記事ページのHTML
+            encoding: 文字コード名
+            profile: 配信元の抽出方法
+
+        Returns:
+            Tuple[Optional[str], Optional[ExtractionProfile]]: 抽出された本文と、
+                本文を抽出できた方法。見つからない場合は(None, None)
+        """
+        if not self.enabled:
+            return extract_with_profile(html_bytes, encoding, profile)
+        future = self._get_executor().submit(extract_with_profile, html_bytes, encoding, profile)
+        return future.result()
+
+    def analyze(self, articles: Sequence[Article], score_sentiment: bool) -> List[Analysis]:
+        """本文を設定済みの記事をまとめて判定します.
+
+        Args:
+            articles: 本文を設定済みの記事
+            score_sentiment: 感情分析を行うかどうか
+
+        Returns:
+            List[Analysis]: 入力と同じ順序の判定結果
+        """
+        if not self.enabled or len(articles) <= 1:
+            return [analyze_article(article, score_sentiment) for article in articles]
+        return list(self._get_executor().map(analyze_article, articles, repeat(score_sentiment)))
+
+    def close(self) -> None:
+        """プロセスプールを終了します."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,100 @@
+"""配信元（ホスト）ごとの本文の抽出方法を保持するモジュール."""
+
+from typing import Dict, Optional, Sequence
+from urllib.parse import urlsplit
+
+from config.settings import EXTRACTION_PROFILE_TTL_SECONDS, EXTRACTION_PROFILES
+from services.extractor import META_STRATEGY, SELECTOR_STRATEGY, ExtractionProfile
+from utils.cache import EXTRACTION_PROFILE_NAMESPACE, Cache, open_cache
+from utils.metrics import metrics
+
+
+def to_profile(value: Optional[Sequence[str]]) -> Optional[ExtractionProfile]:
+    """保存された値や設定の値を抽出方法に変換します.
+
+    Args:
+        value: ("meta",) または ("selector", 要素名, クラス)
+
+    Returns:
+        Optional[ExtractionProfile]: 抽出方法。変換できない場合はNone
+    """
+    if not value:
+        return None
+    if value[0] == META_STRATEGY:
+        return ExtractionProfile(META_STRATEGY)
+    if value[0] == SELECTOR_STRATEGY and len(value) == 3 and value[1] and value[2]:
+        return ExtractionProfile(SELECTOR_STRATEGY, value[1], value[2])
+    return None
+
+
+class ExtractionProfiles:
+    """配信元ごとの本文の抽出方法を保持するクラスです.
+
+    設定（EXTRACTION_PROFILES）で指定した抽出方法を優先し、ない場合は以前に本文を
+    抽出できた方法を使います. 抽出できた方法が保存済みのものと異なる場合
+    （配信元のページの構成が変わった場合など）は、保存し直します.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[Cache] = None,
+        static: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> None:
+        """保存先を初期化します.
+
+        Args:
+            cache: 学習した抽出方法の保存先。Noneの場合は設定に従って生成
+            static: ホストごとの固定の抽出方法。Noneの場合は設定の値
+        """
+        self.cache = cache or open_cache(
+            EXTRACTION_PROFILE_NAMESPACE, ttl=EXTRACTION_PROFILE_TTL_SECONDS
+        )
+        static = EXTRACTION_PROFILES if static is None else static
+        self.static = {host.lower(): to_profile(value) for host, value in static.items()}
+
+    @staticmethod
+    def host(url: str) -> str:
+        """URLのホストを返します.
+
+        Args:
+            url: 記事のURL
+
+        Returns:
+            str: 小文字にしたホスト
+        """
+        return urlsplit(url).netloc.lower()
+
+    def get(self, url: str) -> Optional[ExtractionProfile]:
+        """記事のURLに対応する抽出方法を返します.
+
+        Args:
+            url: 記事のURL
+
+        Returns:
+            Optional[ExtractionProfile]: 抽出方法。分からない場合はNone
+        """
+        host = self.host(url)
+        if host in self.static:
+            return self.static[host]
+        return to_profile(self.cache.get(host))
+
+    def update(
+        self,
+        url: str,
+        used: Optional[ExtractionProfile],
+        succeeded: Optional[ExtractionProfile],
+    ) -> None:
+        """本文を抽出できた方法を記録します.
+
+        Args:
+            url: 記事のURL
+            used: 抽出に使用した方法
+            succeeded: 本文を抽出できた方法。抽出できなかった場合はNone
+        """
+        if used is not None:
+            metrics.count("extraction_profile", "hit" if succeeded == used else "miss")
+        host = self.host(url)
+        if succeeded is None or succeeded == used or host in self.static:
+            return
+        self.cache.set(host, list(succeeded))
+        metrics.count("extraction_profile", "learned")
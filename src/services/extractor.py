@@ -0,0 +1,324 @@
+"""記事ページのHTMLから本文を抽出するモジュール.
+
+レスポンスをストリーミングで読み込み、必要な部分を読み終えた時点で受信を打ち切ります.
+メタディスクリプションは<head>から正規表現で直接取り出し、HTMLの構文解析は
+本文の抽出が必要な場合だけ行います.
+配信元ごとの抽出方法（本文の要素）が分かっている場合は、その要素だけを構文解析します.
+"""
+
+import codecs
+import html
+import re
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from requests.compat import chardet
+
+from config.settings import MAX_CONTENT_LENGTH, MAX_DOWNLOAD_BYTES
+
+CHUNK_SIZE = 16 * 1024
+ENCODING_SNIFF_BYTES = 16 * 1024  # 文字コードを推定する場合に使用する先頭のバイト数
+
+# 文字コードの指定がない場合に、この順に誤りなく変換できるかを試す
+# （EUC-JPの2バイト文字はShift_JISとしても変換できることが多いため、EUC-JPを先に試す）
+FALLBACK_ENCODINGS = ("utf-8", "euc_jp", "cp932")
+
+HEAD_END_PATTERN = re.compile(rb"</head\s*>", re.IGNORECASE)
+ARTICLE_END_PATTERN = re.compile(rb"</article\s*>", re.IGNORECASE)
+META_TAG_PATTERN = re.compile(rb"<meta\s[^>]*>", re.IGNORECASE)
+META_NAME_DESCRIPTION = re.compile(rb"""\bname\s*=\s*["']?description["'\s/>]""", re.IGNORECASE)
+META_CONTENT_PATTERN = re.compile(rb"""\bcontent\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.IGNORECASE)
+LINK_TAG_PATTERN = re.compile(rb"<link\s[^>]*>", re.IGNORECASE)
+LINK_REL_CANONICAL = re.compile(rb"""\brel\s*=\s*["']?canonical["'\s/>]""", re.IGNORECASE)
+LINK_HREF_PATTERN = re.compile(
+    rb"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE
+)
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w-]+)""", re.IGNORECASE)
+MAIN_CLASS_PATTERN = re.compile(r"(article|content|main|body)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+META_STRATEGY = "meta"  # <head>のメタディスクリプションを使う
+SELECTOR_STRATEGY = "selector"  # 指定した要素だけを構文解析する
+
+_parser_backend: Optional[str] = None
+
+
+class ExtractionProfile(NamedTuple):
+    """配信元ごとの本文の抽出方法です."""
+
+    strategy: str  # META_STRATEGY または SELECTOR_STRATEGY
+    tag: str = ""  # 本文の要素名（SELECTOR_STRATEGYの場合）
+    class_name: str = ""  # 本文の要素のクラス（SELECTOR_STRATEGYの場合）
+
+
+META_PROFILE = ExtractionProfile(META_STRATEGY)
+
+
+def parser_backend() -> str:
+    """BeautifulSoupで使用するパーサーを返します.
+
+    lxmlがインストールされていればlxmlを、なければ標準のhtml.parserを使用します.
+
+    Returns:
+        str: パーサー名
+    """
+    global _parser_backend
+    if _parser_backend is None:
+        try:
+            import lxml  # noqa: F401
+
+            _parser_backend = "lxml"
+        except ImportError:
+            _parser_backend = "html.parser"
+    return _parser_backend
+
+
+def find_meta_description(head: bytes) -> Optional[bytes]:
+    """<head>部分のバイト列からメタディスクリプションの値を取り出します.
+
+    Args:
+        head: HTMLの先頭部分
+
+    Returns:
+        Optional[bytes]: content属性の値（未デコード）。見つからない場合はNone
+    """
+    for tag in META_TAG_PATTERN.finditer(head):
+        if META_NAME_DESCRIPTION.search(tag.group(0)):
+            content = META_CONTENT_PATTERN.search(tag.group(0))
+            if content:
+                return content.group(1) if content.group(1) is not None else content.group(2)
+    return None
+
+
+def find_canonical_link(html_bytes: bytes) -> Optional[str]:
+    """HTMLの<head>から<link rel="canonical">のURLを取り出します.
+
+    Args:
+        html_bytes: 読み込んだHTML
+
+    Returns:
+        Optional[str]: href属性の値（HTMLエスケープを戻したもの）。見つからない場合はNone
+    """
+    match = HEAD_END_PATTERN.search(html_bytes)
+    head = html_bytes[: match.end()] if match else html_bytes[:CHUNK_SIZE]
+    for tag in LINK_TAG_PATTERN.finditer(head):
+        if LINK_REL_CANONICAL.search(tag.group(0)):
+            href = LINK_HREF_PATTERN.search(tag.group(0))
+            if href:
+                value = next(group for group in href.groups() if group is not None)
+                return html.unescape(value.decode("utf-8", "replace")).strip() or None
+    return None
+
+
+def read_html(response: Any, max_bytes: int = MAX_DOWNLOAD_BYTES) -> bytes:
+    """レスポンス本文を上限付きでストリーミング読み込みします.
+
+    次のいずれかの時点で読み込みを打ち切ります.
+    - <head>を読み終え、メタディスクリプションが見つかった
+    - <article>要素の終わりまで読んだ
+    - 読み込んだバイト数が上限に達した
+
+    Args:
+        response: stream=Trueで取得したrequests.Response
+        max_bytes: 読み込む最大バイト数
+
+    Returns:
+        bytes: 読み込んだHTML
+    """
+    buffer = bytearray()
+    head_end: Optional[int] = None
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        scan_from = max(0, len(buffer) - 16)  # チャンク境界をまたぐタグも検出する
+        buffer.extend(chunk)
+        if head_end is None:
+            match = HEAD_END_PATTERN.search(buffer, scan_from)
+            if match:
+                head_end = match.end()
+                if find_meta_description(bytes(buffer[:head_end])):
+                    break
+        elif ARTICLE_END_PATTERN.search(buffer, max(scan_from, head_end)):
+            break
+        if len(buffer) >= max_bytes:
+            break
+    return bytes(buffer[:max_bytes])
+
+
+def detect_encoding(response: Any, html_bytes: bytes) -> str:
+    """HTMLの文字コードを判定します.
+
+    Content-Typeヘッダーのcharsetを優先し、なければ<meta charset>を参照します.
+    どちらもない場合は、読み込んだHTMLを誤りなく変換できる文字コードをUTF-8、EUC-JP、
+    Shift_JISの順に探し、いずれでもなければ先頭部分から推定します
+    （requestsのapparent_encodingは本文全体を読み込むため使用しません）.
+
+    Args:
+        response: requests.Response
+        html_bytes: 読み込んだHTML
+
+    Returns:
+        str: 文字コード名
+    """
+    content_type = response.headers.get("Content-Type", "")
+    if "charset=" in content_type.lower() and response.encoding:
+        return str(response.encoding)
+    match = META_CHARSET_PATTERN.search(html_bytes[:4096])
+    if match:
+        return match.group(1).decode("ascii", "ignore")
+    return sniff_encoding(html_bytes)
+
+
+def sniff_encoding(html_bytes: bytes) -> str:
+    """文字コードの指定がないHTMLの文字コードを推定します.
+
+    読み込みを上限で打ち切ったHTMLは末尾で文字が途切れていることがあるため、
+    末尾の不完全な文字は誤りとみなしません.
+
+    Args:
+        html_bytes: 読み込んだHTML
+
+    Returns:
+        str: 文字コード名。推定できない場合はUTF-8
+    """
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(html_bytes, final=False)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    guessed = chardet.detect(html_bytes[:ENCODING_SNIFF_BYTES]).get("encoding")
+    return str(guessed) if guessed else "utf-8"
+
+
+def decode(data: bytes, encoding: str) -> str:
+    """バイト列を文字列に変換します.
+
+    Args:
+        data: 変換するバイト列
+        encoding: 文字コード名
+
+    Returns:
+        str: 変換後の文字列（変換できない文字は置換）
+    """
+    try:
+        return data.decode(encoding, errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+def _has_class(class_name: str) -> Callable[[Any], bool]:
+    """class属性に指定したクラスを含むかどうかを判定する関数を返します.
+
+    SoupStrainerには分割前のclass属性の文字列が渡されるため、空白で区切って比較します.
+
+    Args:
+        class_name: クラス名
+
+    Returns:
+        Callable[[Any], bool]: 判定する関数
+    """
+
+    def matches(value: Any) -> bool:
+        if not value:
+            return False
+        classes = value if isinstance(value, list) else str(value).split()
+        return class_name in classes
+
+    return matches
+
+
+def _node_text(node: Any) -> str:
+    """本文の要素から不要な要素を除いたテキストを取り出します.
+
+    Args:
+        node: 本文の要素
+
+    Returns:
+        str: 整形したテキスト（MAX_CONTENT_LENGTH文字まで）
+    """
+    # 不要な要素を削除
+    for tag in node.find_all(["script", "style", "nav", "header", "footer"]):
+        tag.decompose()
+
+    # テキストを抽出し、余分な空白を削除
+    text = WHITESPACE_PATTERN.sub(" ", " ".join(node.stripped_strings)).strip()
+    return text[:MAX_CONTENT_LENGTH]  # 設定された最大文字数まで
+
+
+def _extract_selector(html_bytes: bytes, encoding: str, profile: ExtractionProfile) -> str:
+    """抽出方法に指定された要素だけを構文解析して本文を取り出します.
+
+    Args:
+        html_bytes: 記事ページのHTML
+        encoding: 文字コード名
+        profile: strategyが"selector"の抽出方法
+
+    Returns:
+        str: 抽出された本文。要素が見つからない場合は空文字列
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    strainer = SoupStrainer(profile.tag, attrs={"class": _has_class(profile.class_name)})
+    soup = BeautifulSoup(decode(html_bytes, encoding), parser_backend(), parse_only=strainer)
+    node = soup.find(profile.tag)
+    return _node_text(node) if node else ""
+
+
+def extract_with_profile(
+    html_bytes: bytes, encoding: str, profile: Optional[ExtractionProfile] = None
+) -> Tuple[Optional[str], Optional[ExtractionProfile]]:
+    """配信元の抽出方法を使ってHTMLから記事の本文を抽出します.
+
+    抽出方法がない場合や、抽出方法で本文が見つからない場合（配信元のページの構成が
+    変わった場合など）は、メタディスクリプション、主要なコンテンツ領域の順に探します.
+
+    Args:
+        html_bytes: 記事ページのHTML
+        encoding: 文字コード名
+        profile: 配信元の抽出方法
+
+    Returns:
+        Tuple[Optional[str], Optional[ExtractionProfile]]: 抽出された本文と、
+            本文を抽出できた方法。見つからない場合は(None, None)
+    """
+    if profile is not None and profile.strategy == SELECTOR_STRATEGY:
+        content = _extract_selector(html_bytes, encoding, profile)
+        if content:
+            return content, profile
+
+    head_match = HEAD_END_PATTERN.search(html_bytes)
+    head = html_bytes[: head_match.end()] if head_match else html_bytes
+    description = find_meta_description(head)
+    if description:
+        return html.unescape(decode(description, encoding)), META_PROFILE
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(decode(html_bytes, encoding), parser_backend())
+
+    # 本文の抽出（主要なコンテンツ領域を探す）
+    main_content = soup.find(["article", "main", "div"], class_=MAIN_CLASS_PATTERN)
+    if main_content is None:
+        return None, None
+    # 次回から同じ要素だけを構文解析できるよう、一致したクラスを抽出方法として返す
+    class_name = next(
+        (c for c in main_content.get("class") or [] if MAIN_CLASS_PATTERN.search(c)), None
+    )
+    learned = (
+        ExtractionProfile(SELECTOR_STRATEGY, main_content.name, class_name) if class_name else None
+    )
+    return _node_text(main_content), learned
+
+
+def extract_content(html_bytes: bytes, encoding: str) -> Optional[str]:
+    """HTMLから記事の本文を抽出します.
+
+    メタディスクリプションがあればそれを返し、なければ主要なコンテンツ領域のテキストを
+    MAX_CONTENT_LENGTH文字まで返します.
+
+    Args:
+        html_bytes: 記事ページのHTML
+        encoding: 文字コード名
+
+    Returns:
+        Optional[str]: 抽出された本文。見つからない場合はNone
+    """
+    return extract_with_profile(html_bytes, encoding)[0]
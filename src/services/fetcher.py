@@ -0,0 +1,134 @@
+"""記事本文を並列に取得するモジュール."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from config.settings import MAX_CONNECTIONS_PER_HOST, MAX_FETCH_WORKERS, REQUEST_TIMEOUT
+from utils.deadline import Deadline
+
+# URLとタイムアウト（秒）を受け取り、本文（取得失敗時はNone）を返す関数
+FetchFunc = Callable[[str, float], Optional[str]]
+
+
+class ArticleFetcher:
+    """記事本文の並列取得クラスです.
+
+    スレッドプールで複数のURLを同時に取得し、ホストごとの同時接続数と
+    全体の実行期限を守りながら、入力と同じ順序で結果を返します.
+    スレッドプールは最初の取得時に生成し、closeを呼ぶまで複数の呼び出しで共有します.
+    news.google.comのように多数の配信元へリダイレクトするホストは、リクエストごとに
+    リダイレクト先の配信元が異なるため、ホストごとの同時接続数を制限しません.
+    """
+
+    def __init__(
+        self,
+        fetch: FetchFunc,
+        max_workers: int = MAX_FETCH_WORKERS,
+        max_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        exempt_hosts: Iterable[str] = (),
+    ) -> None:
+        """取得クラスを初期化します.
+
+        Args:
+            fetch: 1件のURLを取得する関数
+            max_workers: 同時に取得する記事数の上限
+            max_per_host: 同一ホストへの同時接続数の上限
+            exempt_hosts: 同時接続数を制限しないホスト（max_workersの上限のみ）
+        """
+        self.fetch = fetch
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        self.exempt_hosts = frozenset(host.lower() for host in exempt_hosts)
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """共有のスレッドプールを返します。初回の呼び出し時に生成します.
+
+        Returns:
+            ThreadPoolExecutor: 記事の取得に使用するスレッドプール
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _host_semaphore(self, url: str) -> ContextManager[object]:
+        """URLのホストに対応するセマフォを返します.
+
+        Args:
+            url: 記事のURL
+
+        Returns:
+            ContextManager[object]: ホストごとの同時接続数を制限するセマフォ。
+                制限しないホストの場合は何もしないコンテキストマネージャー
+        """
+        host = urlsplit(url).netloc.lower()
+        if host in self.exempt_hosts:
+            return nullcontext()
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.max_per_host)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _fetch_one(self, url: str, deadline: Deadline) -> Optional[str]:
+        """期限とホストごとの制限を守って1件のURLを取得します.
+
+        Args:
+            url: 記事のURL
+            deadline: 全体の実行期限
+
+        Returns:
+            Optional[str]: 取得した本文。期限切れや取得失敗時はNone
+        """
+        with self._host_semaphore(url):
+            if deadline.expired():
+                return None
+            return self.fetch(url, deadline.clamp_timeout(REQUEST_TIMEOUT))
+
+    def fetch_all(
+        self, urls: Sequence[str], deadline: Optional[Deadline] = None
+    ) -> List[Optional[str]]:
+        """複数のURLを並列に取得します.
+
+        Args:
+            urls: 取得するURLのリスト（ランキング順）
+            deadline: 全体の実行期限。Noneの場合は無期限
+
+        Returns:
+            List[Optional[str]]: urlsと同じ順序の本文リスト。
+                期限までに取得を始められなかったURLや取得に失敗したURLはNone
+        """
+        if not urls:
+            return []
+        deadline = deadline or Deadline()
+
+        executor = self._get_executor()
+        futures = [executor.submit(self._fetch_one, url, deadline) for url in urls]
+        _, not_done = wait(futures, timeout=deadline.remaining())
+        # 期限切れで開始していないタスクは取り消し、実行中のタスクは終わるまで待つ
+        # （タイムアウトは期限に合わせて短縮済み）。戻った後に共有のキャッシュなどへ書き込ませない
+        for future in not_done:
+            future.cancel()
+        wait(not_done)
+
+        results: List[Optional[str]] = []
+        for future in futures:
+            if not future.cancelled() and future.exception() is None:
+                results.append(future.result())
+            else:
+                results.append(None)
+        return results
+
+    def close(self) -> None:
+        """スレッドプールを終了します."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -1,38 +1,102 @@
 """Google Newsからニュース記事を取得するモジュール."""
 
-import re
+import copy
+import threading
 import time
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-
-from bs4 import BeautifulSoup
-from gnews import GNews
-import requests
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urljoin
 
 from config.settings import (
-    MAX_RESULTS_PER_QUERY,
+    CACHE_ENABLED,
     DELAY_BETWEEN_QUERIES,
-    MIN_CONTENT_LENGTH,
-    MAX_CONTENT_LENGTH,
-    REQUEST_TIMEOUT,
     IRRELEVANT_PATTERNS,
+    MAX_FETCH_WORKERS,
     MAX_QUERIES_PER_EXECUTION,
-    PRIORITIZED_SEARCH_QUERIES,
+    MAX_RESULTS_PER_QUERY,
+    MIN_CONTENT_LENGTH,
+    NEAR_DUPLICATE_INDEX_PATH,
+    NEAR_DUPLICATE_TTL_SECONDS,
     NEWS_MODE,
+    POOR_QUALITY_PATTERNS,
+    PRIORITIZED_SEARCH_QUERIES,
+    QUERY_GROUP_OVERSAMPLING,
+    REQUEST_TIMEOUT,
+    SEARCH_PERIOD_HOURS,
 )
-from services.sentiment import SentimentAnalyzer
+from services.article import POSITIVE_THRESHOLD, Article
+from services.cpu_pool import Analysis, CPUPool
+from services.extraction_profiles import ExtractionProfiles
+from services.extractor import detect_encoding, find_canonical_link, read_html
+from services.fetcher import ArticleFetcher
+from services.near_duplicate import NearDuplicateIndex, band_keys, minhash
+from services.patterns import PatternMatcher
+from services.pipeline import BatchStage, FilterStage, MapStage, Pipeline, Stage
+from services.query_planner import QueryPlanner, attribute_results, combine_queries
+from services.scheduler import KeywordScheduler
+from services.sentiment import SentimentAnalyzer, get_sentiment_analyzer
+from services.transport import Transport, create_transport
+from services.url_resolver import URLResolver
+from utils.cache import CONTENT_NAMESPACE, SEEN_URLS_NAMESPACE, Cache, open_cache
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.host_health import HostHealth
+from utils.http_cache import HTTPCache
+from utils.metrics import metrics
+from utils.rate_limit import TokenBucket
+from utils.watermark import Watermark, WatermarkStore
+
+if TYPE_CHECKING:
+    from gnews import GNews
 
 # 追加の除外パターン
 ADDITIONAL_IRRELEVANT_PATTERNS = [
-    r'\d{4}年',  # 古い年号への言及
-    r'更新日',   # 更新情報
-    r'アーカイブ',
-    r'過去の記事',
-    r'まとめ記事',
-    r'ランキング',
-    r'(?:月|日)曜日',  # 曜日表記（一般的な記事タイトルでは避けたい）
+    r"\d{4}年",  # 古い年号への言及
+    r"更新日",  # 更新情報
+    r"アーカイブ",
+    r"過去の記事",
+    r"まとめ記事",
+    r"ランキング",
+    r"(?:月|日)曜日",  # 曜日表記（一般的な記事タイトルでは避けたい）
 ]
 
+# 除外パターンと低品質パターンはモジュール読み込み時に一度だけコンパイルする
+IRRELEVANT_MATCHER = PatternMatcher(IRRELEVANT_PATTERNS + ADDITIONAL_IRRELEVANT_PATTERNS)
+POOR_QUALITY_MATCHER = PatternMatcher(POOR_QUALITY_PATTERNS)
+
+
+def content_rejection(content: str, sentences: Sequence[str]) -> Optional[str]:
+    """記事の本文を除外する理由を返します.
+
+    Args:
+        content: 記事の本文
+        sentences: 本文を区切った文（前後の空白を除いた空でない文）
+
+    Returns:
+        Optional[str]: 除外する理由。関連性があり質に問題がなければNone
+    """
+    # 設定された除外パターンを使用
+    pattern = IRRELEVANT_MATCHER.search(content)
+    if pattern is not None:
+        return f"除外パターン:{pattern}"
+
+    # 最小文字数チェック
+    if len(content) < MIN_CONTENT_LENGTH:
+        return "文字数不足"
+
+    # 質の低い記事の特徴
+    pattern = POOR_QUALITY_MATCHER.search(content)
+    if pattern is not None:
+        return f"低品質:{pattern}"
+
+    # 文章の質をチェック
+    if any(len(s) < 10 for s in sentences):  # 極端に短い文がある
+        return "低品質:短文"
+
+    return None
+
+
 class GoogleNewsScraper:
     """Google News スクレイピングクラスです.
 
@@ -40,124 +104,222 @@ class GoogleNewsScraper:
     ポジティブな内容の記事のみを抽出します.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        deadline: Optional[Deadline] = None,
+        content_cache: Optional[Cache] = None,
+        seen_urls: Optional[Cache] = None,
+        http_cache: Optional[HTTPCache] = None,
+        near_duplicates: Optional[NearDuplicateIndex] = None,
+        watermarks: Optional[WatermarkStore] = None,
+        query_planner: Optional[QueryPlanner] = None,
+        cpu_pool: Optional[CPUPool] = None,
+        transport: Optional[Transport] = None,
+        url_resolver: Optional[URLResolver] = None,
+        host_health: Optional[HostHealth] = None,
+        extraction_profiles: Optional[ExtractionProfiles] = None,
+    ) -> None:
         """スクレイパーを初期化します.
 
-        GNewsクライアントと感情分析器を設定します.
+        GNewsクライアントと感情分析器は、コールドスタートを軽くするため
+        初めて使用する時点で生成します.
+
+        Args:
+            deadline: 記事取得全体の実行期限。Noneの場合は無期限
+            content_cache: 抽出済みの記事本文のキャッシュ。Noneの場合は設定に従って生成
+            seen_urls: Notionに保存済みのURLのキャッシュ。Noneの場合は設定に従って生成
+            http_cache: 記事ページの条件付きGET用のキャッシュ。Noneの場合は設定に従って生成
+            near_duplicates: 近似重複の索引。Noneの場合は設定に従って生成
+            watermarks: キーワードごとの処理済みの範囲。Noneの場合は設定に従って生成
+            query_planner: キーワードごとの実績の記録先。Noneの場合は設定に従って生成
+            cpu_pool: 記事の解析を行うプロセスプール。Noneの場合は設定に従って生成
+            transport: 記事ページの取得に使用する通信。Noneの場合は設定に従って生成
+            url_resolver: リダイレクトURLを正規URLに解決するクラス。Noneの場合は設定に従って生成
+            host_health: 配信元ごとの応答時間と障害の記録。Noneの場合は設定に従って生成
+            extraction_profiles: 配信元ごとの本文の抽出方法。Noneの場合は設定に従って生成
         """
-        self.gnews = GNews(
-            language='ja',
-            country='JP',
-            period='1d',  # 過去24時間のニュースを取得
-            max_results=MAX_RESULTS_PER_QUERY
-        )
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.session = requests.Session()
-        # User-Agentを設定してブロックを回避
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self._gnews: Optional["GNews"] = None
+        self.deadline = deadline or Deadline()
+        self.transport = transport or create_transport(deadline=self.deadline)
         self.query_count = 0  # API呼び出し回数のカウンター
+        # クエリ間は固定の待機ではなくレート制限で間隔を空ける（並列実行時も全体で共有）
+        self.query_limiter = TokenBucket(1 / DELAY_BETWEEN_QUERIES, capacity=1)
+        self._lock = threading.Lock()
+        self.content_cache = content_cache or open_cache(CONTENT_NAMESPACE)
+        self.seen_urls = seen_urls or open_cache(SEEN_URLS_NAMESPACE)
+        self.http_cache = http_cache or HTTPCache()
+        self.near_duplicates = near_duplicates or NearDuplicateIndex(
+            NEAR_DUPLICATE_INDEX_PATH if CACHE_ENABLED else None, ttl=NEAR_DUPLICATE_TTL_SECONDS
+        )
+        self.watermarks = watermarks or WatermarkStore()
+        self.query_planner = query_planner or QueryPlanner()
+        self.cpu_pool = cpu_pool or CPUPool()
+        self.url_resolver = url_resolver or URLResolver(self.transport)
+        # 解決できなかったリダイレクトURLは配信元がまちまちのため、同時接続数を制限しない
+        self.fetcher = ArticleFetcher(
+            self._extract_article_content, exempt_hosts=self.url_resolver.redirect_hosts
+        )
+        self.host_health = host_health or HostHealth(exempt_hosts=self.url_resolver.redirect_hosts)
+        self.extraction_profiles = extraction_profiles or ExtractionProfiles()
+        self.rejection_reasons: Counter[str] = Counter()  # 除外理由ごとの件数
+
+    @property
+    def gnews(self) -> "GNews":
+        """GNewsクライアントを返します。初回アクセス時に生成します.
+
+        Returns:
+            GNews: GNewsクライアント
+        """
+        with self._lock:
+            if self._gnews is None:
+                from gnews import GNews
+
+                self._gnews = GNews(
+                    language="ja",
+                    country="JP",
+                    period="1d",  # 過去24時間のニュースを取得
+                    max_results=MAX_RESULTS_PER_QUERY,
+                )
+            return self._gnews
+
+    @property
+    def sentiment_analyzer(self) -> SentimentAnalyzer:
+        """感情分析器を返します.
+
+        トレンドモードでは使用されないため、ポジティブモードで初めて使用する時点で
+        プロセス共有のインスタンスを取得します.
+
+        Returns:
+            SentimentAnalyzer: 感情分析器
+        """
+        return get_sentiment_analyzer()
+
+    def remaining_queries(self) -> int:
+        """この実行で使用できる残りのクエリ数を返します.
+
+        Returns:
+            int: 残りのクエリ数
+        """
+        with self._lock:
+            return max(0, MAX_QUERIES_PER_EXECUTION - self.query_count)
+
+    def _reserve_query(self) -> bool:
+        """クエリ数の上限を超えない場合に限り、1回分を確保します.
+
+        複数のスレッドから同時に呼び出しても上限を超えません.
+
+        Returns:
+            bool: 確保できた場合True
+        """
+        with self._lock:
+            if self.query_count >= MAX_QUERIES_PER_EXECUTION:
+                return False
+            self.query_count += 1
+            return True
+
+    def _release_query(self) -> None:
+        """確保したクエリを使用しなかった場合に返却します."""
+        with self._lock:
+            self.query_count -= 1
+
+    def _reject(self, reason: str) -> None:
+        """記事を除外した理由を集計します.
+
+        Args:
+            reason: 除外理由
+        """
+        with self._lock:  # キーワードごとのスレッドから並行して呼ばれる
+            self.rejection_reasons[reason] += 1
+        metrics.count("rejection_reasons", reason)
 
-    def _extract_article_content(self, url: str) -> Optional[str]:
+    @metrics.timed("fetch_article")
+    def _extract_article_content(self, url: str, timeout: float = REQUEST_TIMEOUT) -> Optional[str]:
         """記事の本文を抽出します.
 
+        以前に取得したページは条件付きGETで再取得し、304が返された場合は
+        保存済みの本文を使用します. 取得を停止している配信元にはリクエストを送らず、
+        タイムアウトは配信元の応答時間に応じて短くします.
+
         Args:
             url: 記事のURL
+            timeout: リクエストのタイムアウト（秒）
 
         Returns:
-            Optional[str]: 抽出された本文。抽出失敗時はNone
+            Optional[str]: 抽出された本文。抽出失敗時や取得を取りやめた場合はNone
         """
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # メタディスクリプションの取得
-            meta_desc = soup.find('meta', {'name': 'description'})
-            if meta_desc and meta_desc.get('content'):
-                return meta_desc.get('content')
-            
-            # 本文の抽出（主要なコンテンツ領域を探す）
-            main_content = soup.find(['article', 'main', 'div'], class_=re.compile(r'(article|content|main|body)'))
-            if main_content:
-                # 不要な要素を削除
-                for tag in main_content.find_all(['script', 'style', 'nav', 'header', 'footer']):
-                    tag.decompose()
-                
-                # テキストを抽出し、整形
-                text = ' '.join(main_content.stripped_strings)
-                # 余分な空白を削除
-                text = re.sub(r'\s+', ' ', text).strip()
-                return text[:MAX_CONTENT_LENGTH]  # 設定された最大文字数まで
-            
+        if not self.host_health.allow(url):
             return None
-            
+        status: Optional[int] = None
+        latency: Optional[float] = None
+        content: Optional[str] = None
+        try:
+            entry = self.http_cache.lookup(url)
+            headers = self.http_cache.conditional_headers(entry)
+            started_at = time.perf_counter()
+            # 本文はストリーミングで読み込み、必要な部分を読み終えた時点で打ち切る
+            with self.transport.get(
+                url, headers=headers, timeout=self.host_health.timeout(url, timeout)
+            ) as response:
+                status, latency = response.status_code, time.perf_counter() - started_at
+                if response.status_code == 304 and entry:
+                    self.http_cache.record("not_modified", entry.get("size", 0))
+                    self.http_cache.refresh(url, entry)
+                    content = entry["content"]
+                    return content
+                response.raise_for_status()
+                html_bytes = read_html(response)
+                metrics.count("bytes", "fetched", len(html_bytes))
+                encoding = detect_encoding(response, html_bytes)
+            canonical = find_canonical_link(html_bytes)
+            if canonical:
+                self.url_resolver.learn(url, urljoin(url, canonical))
+            self.http_cache.record("miss", len(html_bytes))
+            profile = self.extraction_profiles.get(url)
+            with metrics.timer("extract_content"):
+                content, succeeded = self.cpu_pool.extract(html_bytes, encoding, profile)
+            self.extraction_profiles.update(url, profile, succeeded)
+            if content:
+                self.http_cache.store(url, response, content, len(html_bytes))
+            return content
+
         except Exception as e:
             print(f"記事本文の抽出に失敗しました: {url} - {str(e)}")
             return None
+        finally:
+            self.host_health.record(url, status, latency)
 
-    def _is_relevant_content(self, text: str) -> bool:
-        """記事の内容が関連性があるかチェックします.
+    def _has_irrelevant_pattern(self, text: str) -> bool:
+        """除外パターンに一致するかチェックします.
 
         Args:
             text: チェックする文字列
 
         Returns:
-            bool: 関連性があればTrue
+            bool: いずれかの除外パターンに一致すればTrue
         """
-        # 設定された除外パターンを使用
-        for pattern in IRRELEVANT_PATTERNS + ADDITIONAL_IRRELEVANT_PATTERNS:
-            if re.search(pattern, text):
-                return False
-        
-        # 最小文字数チェック
-        if len(text) < MIN_CONTENT_LENGTH:
-            return False
-
-        # 記事の質をチェック
-        if self._has_poor_quality_indicators(text):
-            return False
-            
-        return True
+        pattern = IRRELEVANT_MATCHER.search(text)
+        if pattern is not None:
+            self._reject(f"除外パターン:{pattern}")
+            return True
+        return False
 
-    def _has_poor_quality_indicators(self, text: str) -> bool:
-        """記事の質が低いかどうかをチェックします.
+    @metrics.timed("filter_relevance")
+    def _is_relevant_content(self, article: Article) -> bool:
+        """記事の内容が関連性があるかチェックします.
 
         Args:
-            text: チェックする文字列
+            article: 本文を設定済みの記事
 
         Returns:
-            bool: 質が低いと判断された場合True
+            bool: 関連性があればTrue
         """
-        # 質の低い記事の特徴
-        poor_quality_indicators = [
-            r'クリック(?:して|により)',  # クリックベイト
-            r'(?:詳しくは|続きは)こちら',  # 誘導文
-            r'お得な?(?:情報|ニュース)',
-            r'速報',  # 速報系は避ける（質が低いことが多い）
-            r'まとめ',
-            r'\[\s*PR\s*\]',  # PRマーク
-            r'提供：',
-            r'コラボ(?:レーション)?',
-            r'タイアップ',
-        ]
-        
-        for pattern in poor_quality_indicators:
-            if re.search(pattern, text):
-                return True
-
-        # 文章の質をチェック
-        sentences = re.split(r'[。！？]', text)
-        if any(len(s.strip()) < 10 for s in sentences if s.strip()):  # 極端に短い文がある
-            return True
-
-        return False
+        rejection = content_rejection(article.content, article.sentences)
+        if rejection is not None:
+            self._reject(rejection)
+            return False
+        return True
 
-    def search_news(
-        self, query: str, max_results: int = MAX_RESULTS_PER_QUERY
-    ) -> List[Dict[str, str]]:
+    def search_news(self, query: str, max_results: int = MAX_RESULTS_PER_QUERY) -> List[Article]:
         """ニュースを検索して結果を返します.
 
         Args:
@@ -165,110 +327,384 @@ class GoogleNewsScraper:
             max_results: 取得する最大記事数
 
         Returns:
-            List[Dict[str, str]]: 検索結果の記事リスト
+            List[Article]: 検索結果の記事リスト
 
         Raises:
-            ValueError: API呼び出し回数が制限を超えた場合
+            DeadlineExceeded: 実行期限までに検索を開始できなかった場合
         """
-        # API制限のチェック
-        if self.query_count >= MAX_QUERIES_PER_EXECUTION:
-            print(f"API呼び出し回数が制限({MAX_QUERIES_PER_EXECUTION})を超えました。スキップします。")
+        if not self._acquire_query(query):
             return []
 
-        news_items: List[Dict[str, str]] = []
-        processed_urls = set()  # 重複チェック用
-        
+        news_items: List[Article] = []
+
         try:
             # 現在時刻から12時間前までの期間を設定（24時間から12時間に短縮）
             end_date = datetime.now()
-            start_date = end_date - timedelta(hours=12)
-            
-            # ニュースの検索を実行
-            self.gnews.period = '12h'  # 検索期間を12時間に設定
-            search_results = self.gnews.get_news(query)
-            self.query_count += 1  # API呼び出し回数をインクリメント
-            
-            # APIレート制限を考慮した待機
-            time.sleep(DELAY_BETWEEN_QUERIES)
-            
-            for item in search_results:
-                if len(news_items) >= max_results:
-                    break
-                
-                url = item.get('link', '')
-                # URLが既に処理済みの場合はスキップ
-                if not url or url in processed_urls:
-                    continue
-                    
-                title = item.get('title', '')
-                description = item.get('description', '')
-                published_date = item.get('published date')
-                
-                # 記事本文を取得
-                content = self._extract_article_content(url)
-                if not content:
-                    continue
-                
-                # 内容の関連性チェック
-                if not self._is_relevant_content(content):
-                    continue
-                
-                # 日付のバリデーション
-                try:
-                    if published_date:
-                        pub_date = datetime.strptime(published_date, '%a, %d %b %Y %H:%M:%S GMT')
-                        if not (start_date <= pub_date <= end_date):
-                            continue
-                    else:
-                        continue
-                except ValueError:
-                    continue
-                
-                # トレンドモードの場合は感情分析をスキップ
-                sentiment_score = 1.0  # デフォルト値
-                if NEWS_MODE == "positive":
-                    combined_text = f"{title} {description} {content}"
-                    sentiment_score = self.sentiment_analyzer.analyze(combined_text)
-                    if sentiment_score <= 0.6:  # より厳密なポジティブ判定（スコアが0.6以上）
-                        continue
-
-                news_items.append({
-                    'title': title,
-                    'link': url,
-                    'snippet': description,
-                    'content': content,
-                    'published_at': pub_date.isoformat(),
-                    'sentiment_score': sentiment_score,
-                    'publisher': item.get('publisher', {}).get('title', '不明')
-                })
-                processed_urls.add(url)
-            
+            start_date = end_date - timedelta(hours=SEARCH_PERIOD_HOURS)
+            watermark = self.watermarks.get(query)
+
+            # ニュースの検索を実行（前回の検索以降の期間に絞る。GNewsクライアントは
+            # スレッド間で共有しているため、期間は複製したクライアントに設定する）
+            gnews = copy.copy(self.gnews)
+            gnews.period = self.watermarks.period(watermark, end_date)
+            with metrics.timer("gnews_search"):
+                search_results = gnews.get_news(query)
+
+            news_items = self._filter_results(
+                query, search_results, max_results, start_date, end_date, watermark
+            )
+
         except Exception as e:
             print(f"ニュース検索中にエラーが発生しました: {str(e)}")
-            
+
         return news_items
 
-    def search_all_news(self) -> List[Dict[str, str]]:
+    def search_group(
+        self, queries: Sequence[str], max_results: int = MAX_RESULTS_PER_QUERY
+    ) -> Dict[str, List[Article]]:
+        """複数のキーワードを1回のOR検索で検索し、キーワードごとの結果を返します.
+
+        検索結果はタイトルと説明文に含まれる語でキーワードに振り分け、キーワードごとに
+        処理済みの範囲と実績を記録しながら絞り込みます. 検索期間は、まとめたキーワードの
+        うち最も長い期間とします.
+
+        Args:
+            queries: 検索キーワード（優先度の順）
+            max_results: キーワードごとの最大記事数
+
+        Returns:
+            Dict[str, List[Article]]: キーワードごとの検索結果の記事リスト
+
+        Raises:
+            DeadlineExceeded: 実行期限までに検索を開始できなかった場合
+        """
+        combined = combine_queries(queries)
+        results: Dict[str, List[Article]] = {query: [] for query in queries}
+        if not self._acquire_query(combined):
+            return results
+
+        try:
+            end_date = datetime.now()
+            start_date = end_date - timedelta(hours=SEARCH_PERIOD_HOURS)
+            watermarks = {query: self.watermarks.get(query) for query in queries}
+
+            gnews = copy.copy(self.gnews)
+            gnews.period = max(
+                (self.watermarks.period(watermark, end_date) for watermark in watermarks.values()),
+                key=lambda period: int(period[:-1]),
+            )
+            # キーワードごとの件数を確保できるよう、まとめたキーワードの数に応じて多めに取得する
+            gnews.max_results = MAX_RESULTS_PER_QUERY * len(queries) * QUERY_GROUP_OVERSAMPLING
+            with metrics.timer("gnews_search"):
+                search_results = gnews.get_news(combined)
+
+            attributed, unmatched = attribute_results(search_results, queries)
+            metrics.count("query_group", "matched", len(search_results) - unmatched)
+            metrics.count("query_group", "unmatched", unmatched)
+            for query in queries:
+                results[query] = self._filter_results(
+                    query, attributed[query], max_results, start_date, end_date, watermarks[query]
+                )
+
+        except Exception as e:
+            print(f"ニュース検索中にエラーが発生しました: {str(e)}")
+
+        return results
+
+    def _acquire_query(self, query: str) -> bool:
+        """クエリ数の上限とレート制限を確認し、1回分の検索を開始できるまで待機します.
+
+        Args:
+            query: 検索するクエリ（ログと例外のメッセージ用）
+
+        Returns:
+            bool: 検索を開始できる場合True。クエリ数の上限を超えた場合False
+
+        Raises:
+            DeadlineExceeded: 実行期限までに検索を開始できなかった場合
+        """
+        if self.deadline.expired():
+            raise DeadlineExceeded(query)
+
+        # API制限のチェック（並列実行時も上限を超えないよう先に1回分を確保する）
+        if not self._reserve_query():
+            print(f"API呼び出し回数が制限({MAX_QUERIES_PER_EXECUTION})を超えました。スキップします。")
+            return False
+
+        # APIレート制限を考慮した待機
+        if not self.query_limiter.acquire(timeout=self.deadline.remaining()):
+            self._release_query()
+            raise DeadlineExceeded(query)
+        return True
+
+    def _filter_results(
+        self,
+        query: str,
+        search_results: Sequence[Dict[str, Any]],
+        max_results: int,
+        start_date: datetime,
+        end_date: datetime,
+        watermark: Optional[Watermark],
+    ) -> List[Article]:
+        """1つのキーワードの検索結果を絞り込み、処理済みの範囲と実績を記録します.
+
+        Args:
+            query: 検索キーワード
+            search_results: キーワードのGNewsの検索結果
+            max_results: 取得する最大記事数
+            start_date: 対象期間の開始日時
+            end_date: 対象期間の終了日時
+            watermark: キーワードのハイウォーターマーク
+
+        Returns:
+            List[Article]: 絞り込みを通過した記事リスト
+        """
+        processed: Dict[str, datetime] = {}
+        # 安価な判定から順に絞り込み、通信と感情分析は残った記事だけに行う
+        pipeline = self._build_pipeline(start_date, end_date, watermark, processed)
+        news_items = list(islice(pipeline.run(search_results), max_results))
+        self.watermarks.advance(query, watermark, processed, end_date)
+        # 段階別の件数はキーワードごとの実績として記録する（並行して検索するため保持しない）
+        self.query_planner.record(query, pipeline.stats(), len(news_items))
+        print(f"キーワード '{query}' の絞り込み結果: {pipeline.format_stats()}")
+        return news_items
+
+    def _build_pipeline(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        watermark: Optional[Watermark] = None,
+        processed: Optional[Dict[str, datetime]] = None,
+    ) -> Pipeline:
+        """検索結果を絞り込むパイプラインを構築します.
+
+        日付 → タイトル・説明文 → URL解決 → 処理済み → URL重複 → 本文取得 → 本文の関連性
+        → 近似重複 → 感情分析の順に処理し、コストの高い処理ほど後段に配置します.
+        処理済みとURL重複の判定は、リダイレクトURLを解決した記事の正規URLで行います.
+        処理済みとして記録するのは、本文を取得して後段の判定まで行った記事だけです
+        （必要な件数に達して評価しなかったバッチの残りは、次回の実行で改めて処理します）.
+
+        Args:
+            start_date: 対象期間の開始日時
+            end_date: 対象期間の終了日時
+            watermark: キーワードのハイウォーターマーク。前回までに処理した記事を除外
+            processed: 今回処理した記事の正規化URLと公開日時を記録する辞書
+
+        Returns:
+            Pipeline: 構築したパイプライン
+        """
+        processed_urls: Set[str] = set()  # 重複チェック用
+        pending: Dict[Article, str] = {}  # 処理済みの判定を通過し、まだ評価していない記事の正規URL
+        analyses: Dict[Article, Analysis] = {}  # プロセスプールで解析した記事の判定結果
+        score_sentiment = NEWS_MODE == "positive"
+        if processed is None:
+            processed = {}
+
+        def resolve_links(articles: Sequence[Article]) -> List[Optional[Article]]:
+            links = self.url_resolver.resolve_all(
+                [article.link for article in articles], deadline=self.deadline
+            )
+            for article, link in zip(articles, links):
+                article.link = link
+            return list(articles)
+
+        def is_unprocessed(article: Article) -> bool:
+            # 前回までに処理した記事は本文を取得せずに除外する
+            if self.watermarks.is_processed(watermark, article.canonical_url, article.published_at):
+                self._reject("処理済み")
+                return False
+            pending[article] = article.canonical_url
+            return True
+
+        def attach_contents(articles: Sequence[Article]) -> List[Optional[Article]]:
+            results = self._attach_contents(articles)
+            for article, result in zip(articles, results):
+                if result is None:  # 取得できなかった記事は記録せず、次回の実行で再取得する
+                    pending.pop(article, None)
+            if self.cpu_pool.enabled:
+                # 本文の判定・MinHash・感情分析をバッチ単位でワーカープロセスに分散する
+                fetched = [article for article in results if article is not None]
+                for article, analysis in zip(
+                    fetched, self.cpu_pool.analyze(fetched, score_sentiment)
+                ):
+                    analyses[article] = analysis
+                    for name, seconds in analysis.timings.items():
+                        metrics.observe(name, seconds)
+            return results
+
+        def is_relevant(article: Article) -> bool:
+            # 遅延評価のため、ここに到達した記事は後段で除外されるか出力されるまで評価される
+            url = pending.pop(article, None)
+            if url is not None:
+                processed[url] = article.published_at
+            analysis = analyses.get(article)
+            if analysis is None:
+                return self._is_relevant_content(article)
+            if analysis.rejection is not None:
+                self._reject(analysis.rejection)
+                return False
+            return True
+
+        def is_first_copy(article: Article) -> bool:
+            analysis = analyses.get(article)
+            return self._is_first_copy(article, analysis.band_keys if analysis else None)
+
+        def score(article: Article) -> Optional[Article]:
+            analysis = analyses.pop(article, None)
+            if analysis is None or analysis.sentiment_score is None:
+                return self._score_sentiment(article)
+            if analysis.sentiment_score <= POSITIVE_THRESHOLD:
+                return None
+            article.sentiment_score = analysis.sentiment_score
+            return article
+
+        def is_new_url(article: Article) -> bool:
+            # 今回の検索内の重複に加え、以前の実行で保存済みの記事も除外する
+            url = article.canonical_url
+            if url in processed_urls or url in self.seen_urls:
+                return False
+            processed_urls.add(url)
+            return True
+
+        stages: List[Stage] = [
+            MapStage("日付", lambda item: self._to_news_item(item, start_date, end_date)),
+            FilterStage(
+                "タイトル・説明文",
+                lambda article: not self._has_irrelevant_pattern(
+                    f"{article.title} {article.snippet}"
+                ),
+            ),
+            BatchStage("URL解決", resolve_links, batch_size=MAX_FETCH_WORKERS),
+            FilterStage("処理済み", is_unprocessed),
+            FilterStage("URL重複", is_new_url),
+            BatchStage("本文取得", attach_contents, batch_size=MAX_FETCH_WORKERS),
+            FilterStage("本文の関連性", is_relevant),
+            FilterStage("近似重複", is_first_copy),
+        ]
+        # トレンドモードの場合は感情分析をスキップ
+        if score_sentiment:
+            stages.append(MapStage("感情分析", score))
+        return Pipeline(stages)
+
+    def _to_news_item(
+        self, item: Dict[str, Any], start_date: datetime, end_date: datetime
+    ) -> Optional[Article]:
+        """公開日が対象期間内の検索結果を記事に変換します.
+
+        Args:
+            item: GNewsの検索結果
+            start_date: 対象期間の開始日時
+            end_date: 対象期間の終了日時
+
+        Returns:
+            Optional[Article]: 記事。URLがない場合や期間外の場合はNone
+        """
+        url = item.get("link", "")
+        published_date = item.get("published date")
+        if not url or not published_date:
+            return None
+
+        # 日付のバリデーション
+        try:
+            pub_date = datetime.strptime(published_date, "%a, %d %b %Y %H:%M:%S GMT")
+        except ValueError:
+            return None
+        if not (start_date <= pub_date <= end_date):
+            return None
+
+        return Article(
+            title=item.get("title", ""),
+            link=url,
+            snippet=item.get("description", ""),
+            published_at=pub_date,
+            publisher=item.get("publisher", {}).get("title", "不明"),
+        )
+
+    def _attach_contents(self, articles: Sequence[Article]) -> List[Optional[Article]]:
+        """記事本文を並列に取得して各記事に設定します.
+
+        キャッシュ済みの記事は取得せずにキャッシュの本文を使用します.
+
+        Args:
+            articles: 記事のリスト
+
+        Returns:
+            List[Optional[Article]]: 本文を設定した記事。取得失敗時はNone
+        """
+        keys = [article.canonical_url for article in articles]
+        contents: List[Optional[str]] = [self.content_cache.get(key) for key in keys]
+        missing = [i for i, content in enumerate(contents) if content is None]
+        for _ in range(len(keys) - len(missing)):
+            self.http_cache.record("hit")
+        fetched = self.fetcher.fetch_all(
+            [articles[i].link for i in missing], deadline=self.deadline
+        )
+        for i, content in zip(missing, fetched):
+            contents[i] = content
+            if content:
+                self.content_cache.set(keys[i], content)
+
+        results: List[Optional[Article]] = []
+        for article, content in zip(articles, contents):
+            if content:
+                article.content = content
+                # 記事ページのrel="canonical"で正規URLが分かった場合は、保存にもそのURLを使う
+                article.link = self.url_resolver.lookup(article.link) or article.link
+                results.append(article)
+            else:
+                results.append(None)
+        return results
+
+    def _is_first_copy(self, article: Article, keys: Optional[Sequence[int]] = None) -> bool:
+        """同じ記事の複製（近似重複）をまだ処理していないかチェックします.
+
+        配信元が異なる同一記事は、この実行または以前の実行で最初に処理した1件だけを残します.
+
+        Args:
+            article: 本文を設定済みの記事
+            keys: 求め済みのLSHのキー。Noneの場合は本文から求める
+
+        Returns:
+            bool: 最初の1件であればTrue
+        """
+        if keys is None:
+            keys = band_keys(minhash(f"{article.title} {article.content}"))
+        if self.near_duplicates.add_if_new(keys):
+            return True
+        self._reject("近似重複")
+        return False
+
+    @metrics.timed("sentiment")
+    def _score_sentiment(self, article: Article) -> Optional[Article]:
+        """記事の感情スコアを算出し、ポジティブな記事だけを返します.
+
+        Args:
+            article: 本文を設定済みの記事
+
+        Returns:
+            Optional[Article]: スコアを設定した記事。ポジティブでない場合はNone
+        """
+        sentiment_score = self.sentiment_analyzer.analyze(article.text)
+        if sentiment_score <= POSITIVE_THRESHOLD:  # より厳密なポジティブ判定
+            return None
+        article.sentiment_score = sentiment_score
+        return article
+
+    def search_all_news(self) -> List[Article]:
         """すべての検索キーワードに対してニュース検索を実行します.
 
-        優先度の高いキーワードから順に実行し、API制限に達した場合は
-        低優先度のキーワードをスキップします。
+        キーワードごとの実績（新しい記事の件数）に基づいて残りのクエリ数を配分し、
+        実績の多いキーワードから順に並行して実行します。
 
         Returns:
-            List[Dict[str, str]]: 検索結果の記事リスト
+            List[Article]: 検索結果の記事リスト
         """
-        all_news: List[Dict[str, str]] = []
-        
-        # 優先度でソート（優先度の低い数字が高優先）
-        sorted_queries = sorted(PRIORITIZED_SEARCH_QUERIES, key=lambda x: x[1])
-        
-        for query, priority in sorted_queries:
-            if self.query_count >= MAX_QUERIES_PER_EXECUTION:
-                print(f"優先度{priority}のクエリ「{query}」はAPI制限により実行をスキップします。")
-                continue
-                
-            print(f"優先度{priority}のクエリ「{query}」を実行します。")
-            news_items = self.search_news(query)
-            all_news.extend(news_items)
-        
-        return all_news
+        queries = self.query_planner.plan(PRIORITIZED_SEARCH_QUERIES, self.remaining_queries())
+        return KeywordScheduler(self).run(queries)
+
+    def close(self) -> None:
+        """記事の取得と解析に使用するスレッドプール、プロセスプール、接続を閉じます."""
+        self.fetcher.close()
+        self.url_resolver.close()
+        self.cpu_pool.close()
+        self.transport.close()
@@ -0,0 +1,243 @@
+"""配信元が異なる同一記事（近似重複）を検出するモジュール.
+
+通信社の配信記事は、URLや見出しを少し変えて多数の媒体に掲載されます.
+タイトルと本文の文字n-gramからMinHash署名を求め、LSH（署名を複数のバンドに分割し、
+いずれかのバンドが一致する記事を近似重複とみなす）で既に処理した記事と照合します.
+"""
+
+import bisect
+import hashlib
+import os
+import random
+import re
+import struct
+import threading
+import time
+from array import array
+from typing import List, Optional, Sequence, Set, Tuple
+
+# 10バンド×4行: Jaccard係数がおよそ0.56以上の記事を近似重複として検出する
+NUM_BANDS = 10
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+MERSENNE_PRIME = (1 << 61) - 1
+
+# 実行をまたいで署名を比較できるよう、ハッシュ関数の係数は固定のシードで生成する
+_rng = random.Random(0)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+# ファイル形式: 先頭にマジックナンバー、以降は「登録時刻4バイト + バンドのキー4バイト×10」の固定長レコード
+# （読み込み時にarray("I")としてそのまま扱えるよう、ネイティブのバイト順で書き込む）
+MAGIC = b"NDI1"
+RECORD_FIELDS = 1 + NUM_BANDS
+RECORD_FORMAT = struct.Struct(f"={RECORD_FIELDS}I")
+RECORD_SIZE = RECORD_FORMAT.size
+BAND_FORMAT = struct.Struct(f"<B{ROWS_PER_BAND}Q")
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """文字n-gram（シングル）の集合を返します.
+
+    日本語は単語の区切りがないため、空白を除いた文字列の連続するsize文字を単位にします.
+
+    Args:
+        text: 対象の文字列
+        size: 1つのシングルの文字数
+
+    Returns:
+        Set[str]: シングルの集合
+    """
+    text = WHITESPACE_PATTERN.sub("", text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(text: str) -> List[int]:
+    """文字列のMinHash署名を求めます.
+
+    Args:
+        text: 対象の文字列（タイトルと本文を連結したもの）
+
+    Returns:
+        List[int]: NUM_PERMUTATIONS個の最小ハッシュ値
+    """
+    values = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        % MERSENNE_PRIME
+        for s in shingles(text)
+    ]
+    if not values:
+        return [0] * NUM_PERMUTATIONS
+    return [min((a * x + b) % MERSENNE_PRIME for x in values) for a, b in PERMUTATIONS]
+
+
+def band_keys(signature: Sequence[int]) -> Tuple[int, ...]:
+    """MinHash署名をバンドごとの32ビットのキーに変換します.
+
+    キーにはバンドの番号を含めるため、すべてのバンドを1つの索引で扱えます.
+
+    Args:
+        signature: minhashで求めた署名
+
+    Returns:
+        Tuple[int, ...]: NUM_BANDS個のキー
+    """
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(BAND_FORMAT.pack(band, *rows), digest_size=4).digest()
+        keys.append(int.from_bytes(digest, "little"))
+    return tuple(keys)
+
+
+class NearDuplicateIndex:
+    """MinHashのLSH索引です.
+
+    読み込んだキーは整列済みの配列（1件4バイト）に保持して二分探索し、
+    実行中に登録したキーは集合に保持します. pathを指定した場合は登録のたびに
+    ファイルへ追記し、実行をまたいで使用します.
+    """
+
+    def __init__(self, path: Optional[str], ttl: float) -> None:
+        """索引を初期化します.
+
+        Args:
+            path: 索引ファイルのパス。Noneの場合はメモリ上にのみ保持
+            ttl: 記事の有効期間（秒）。読み込み時に期限切れの記事を除外
+        """
+        self.path = path
+        self.ttl = ttl
+        self._sorted_keys = array("I")
+        self._recent_keys: Set[int] = set()
+        self._count = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """索引の件数を返します.
+
+        Returns:
+            int: 登録されている記事の数
+        """
+        return self._count
+
+    def _contains(self, key: int) -> bool:
+        """キーが登録されているかどうかを返します.
+
+        Args:
+            key: バンドのキー
+
+        Returns:
+            bool: 登録されている場合True
+        """
+        if key in self._recent_keys:
+            return True
+        i = bisect.bisect_left(self._sorted_keys, key)
+        return i < len(self._sorted_keys) and self._sorted_keys[i] == key
+
+    def load(self) -> None:
+        """索引ファイルを読み込みます.
+
+        期限切れの記事が半数を超えている場合は、有効な記事だけでファイルを書き直します.
+        """
+        fields = array("I")
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if data[: len(MAGIC)] == MAGIC:
+                body = memoryview(data)[len(MAGIC) :]
+                usable = len(body) - len(body) % RECORD_SIZE  # 書きかけのレコードは無視
+                fields.frombytes(body[:usable])
+        total = len(fields) // RECORD_FIELDS
+
+        # 期限切れの記事がある場合だけ、レコード単位で選別する
+        expires_before = time.time() - self.ttl
+        if total and min(fields[::RECORD_FIELDS]) < expires_before:
+            valid = array("I")
+            for offset in range(0, len(fields), RECORD_FIELDS):
+                if fields[offset] >= expires_before:
+                    valid.extend(fields[offset : offset + RECORD_FIELDS])
+            fields = valid
+        count = len(fields) // RECORD_FIELDS
+        if total > 2 * count:
+            self._rewrite(fields.tobytes())
+
+        keys = array("I", fields)
+        del keys[::RECORD_FIELDS]  # 登録時刻を除いたバンドのキー
+        with self._lock:
+            self._sorted_keys = array("I", sorted(keys))
+            self._recent_keys = set()
+            self._count = count
+            self._loaded = True
+
+    def _rewrite(self, records: bytes) -> None:
+        """有効なレコードだけでファイルを書き直します（一時ファイル経由で置き換えます）.
+
+        Args:
+            records: 書き出すレコード
+        """
+        if not self.path:
+            return
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(MAGIC)
+                f.write(records)
+            os.replace(tmp_path, self.path)
+
+    def _ensure_loaded(self) -> None:
+        """索引ファイルをまだ読み込んでいない場合に1回だけ読み込みます."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self.load()
+
+    def is_duplicate(self, keys: Sequence[int]) -> bool:
+        """いずれかのバンドが一致する記事が登録されているかどうかを返します.
+
+        Args:
+            keys: band_keysで求めたキー
+
+        Returns:
+            bool: 近似重複の記事が登録されている場合True
+        """
+        self._ensure_loaded()
+        with self._lock:
+            return any(self._contains(key) for key in keys)
+
+    def add_if_new(self, keys: Sequence[int]) -> bool:
+        """近似重複の記事が登録されていなければ登録します.
+
+        確認と登録を1つのロックの中で行うため、複数のスレッドから同じ記事の複製を
+        同時に渡しても登録されるのは1件だけです.
+
+        Args:
+            keys: band_keysで求めたキー
+
+        Returns:
+            bool: 登録した場合True。近似重複の記事が既にある場合False
+        """
+        self._ensure_loaded()
+        with self._lock:
+            if any(self._contains(key) for key in keys):
+                return False
+            self._recent_keys.update(keys)
+            self._count += 1
+            if self.path:
+                new_file = not os.path.exists(self.path)
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "ab") as f:
+                    if new_file:
+                        f.write(MAGIC)
+                    f.write(RECORD_FORMAT.pack(int(time.time()), *keys))
+            return True
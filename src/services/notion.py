@@ -1,44 +1,213 @@
 """Notion APIを使用してデータベースにニュース記事を保存するモジュール."""
 
-from typing import Dict, List
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from notion_client import Client
+from config.settings import (
+    NOTION_API_KEY,
+    NOTION_DATABASE_ID,
+    NOTION_INDEX_PATH,
+    NOTION_UPSERT_MODE,
+)
+from services.article import Article
+from services.notion_index import NotionPageIndex
+from utils.cache import SEEN_URLS_NAMESPACE, Cache, open_cache
+from utils.metrics import metrics
 
-from config.settings import NOTION_API_KEY, NOTION_DATABASE_ID
+if TYPE_CHECKING:
+    from notion_client import Client
 
 
 class NotionClient:
     """Notion クライアントクラスです.
 
     Notion APIを使用してデータベースに記事を保存します.
+    URLとページIDの索引を参照し、同じURLの記事を重複して作成しません.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        seen_urls: Optional[Cache] = None,
+        client: Optional["Client"] = None,
+        page_index: Optional[NotionPageIndex] = None,
+        upsert_mode: str = NOTION_UPSERT_MODE,
+    ) -> None:
         """クライアントを初期化します.
 
         Notion APIクライアントを設定し、データベースIDを保持します.
+
+        Args:
+            seen_urls: 保存済みのURLのキャッシュ。Noneの場合は設定に従って生成
+            client: 使用するNotion APIクライアント。Noneの場合は設定のAPIキーで生成
+            page_index: URLとページIDの索引。Noneの場合は設定のパスの索引を使用
+            upsert_mode: 既存URLの扱い。"skip"は作成しない、"update"は既存ページを更新
         """
-        self.client = Client(auth=NOTION_API_KEY)
+        self._client = client
         self.database_id = NOTION_DATABASE_ID
+        self.seen_urls = seen_urls or open_cache(SEEN_URLS_NAMESPACE)
+        # 空の索引も偽になるため、Noneかどうかで判定する
+        self.page_index = (
+            page_index if page_index is not None else NotionPageIndex(NOTION_INDEX_PATH)
+        )
+        self.upsert_mode = upsert_mode
+        self._index_ready = False
+        # 索引がデータベース全体を反映しているかどうか（作成に失敗した場合は記事ごとに検索する）
+        self._index_complete = False
+        self._index_lock = threading.Lock()
+
+    @property
+    def client(self) -> "Client":
+        """Notion APIクライアントを返します。初回アクセス時に生成します.
+
+        Returns:
+            Client: Notion APIクライアント
+        """
+        if self._client is None:
+            from notion_client import Client
+
+            self._client = Client(auth=NOTION_API_KEY)
+        return self._client
+
+    def _ensure_index(self) -> None:
+        """索引を読み込みます。索引ファイルがない場合はデータベースから作成します.
+
+        作成に失敗した場合は索引ファイルを作らず、この実行では記事ごとに
+        データベースを検索します（一部だけの索引を次回の実行で完全な索引とみなさないため）.
+        """
+        if self._index_ready:
+            return
+        with self._index_lock:
+            if self._index_ready:
+                return
+            if self.page_index.loaded:
+                self._index_complete = True
+            elif self.page_index.exists():
+                self.page_index.load()
+                self._index_complete = True
+            else:
+                try:
+                    count = self.page_index.bootstrap(self.client, self.database_id)
+                    print(f"Notionページの索引を作成しました。({count}件)")
+                    self._index_complete = True
+                except Exception as e:
+                    print(f"Notionページの索引の作成に失敗しました。記事ごとに検索します: {str(e)}")
+            self._index_ready = True
+
+    def _find_page(self, url: str) -> Optional[str]:
+        """URLに対応する既存ページのIDを返します.
+
+        索引を作成できなかった場合は、索引にないURLをデータベースで検索します.
 
-    def save_news_to_notion(self, news_items: List[Dict[str, str]]) -> None:
+        Args:
+            url: 記事のURL
+
+        Returns:
+            Optional[str]: ページID。既存ページがない場合はNone
+
+        Raises:
+            notion_client.APIResponseError: 検索でAPIがエラーを返した場合
+        """
+        self._ensure_index()
+        page_id = self.page_index.lookup(url)
+        if page_id is not None or self._index_complete:
+            return page_id
+        with metrics.timer("notion_query"):
+            response = self.client.databases.query(
+                database_id=self.database_id,
+                filter={"property": "URL", "url": {"equals": url}},
+                page_size=1,
+            )
+        results = response.get("results", [])
+        if not results:
+            return None
+        page_id = results[0]["id"]
+        self.page_index.add(url, page_id)
+        return page_id
+
+    def is_saved(self, item: Article) -> bool:
+        """記事が保存済みで、これ以上の処理が不要かどうかを返します.
+
+        保存済みURLのキャッシュと索引だけを参照し、記事ごとのデータベースの検索は行いません.
+        索引を作成できなかった場合の検索は、レート制限の内側で呼び出すupsert_pageで行います.
+
+        Args:
+            item: 記事
+
+        Returns:
+            bool: 保存済みの場合True。更新モードでは索引にあっても更新のためFalse
+        """
+        if item.canonical_url in self.seen_urls:
+            return True
+        if self.upsert_mode == "update":
+            return False
+        self._ensure_index()
+        return self.page_index.lookup(item.link) is not None
+
+    def _build_properties(self, item: Article) -> Dict[str, Any]:
+        """記事からNotionページのプロパティを組み立てます.
+
+        Args:
+            item: 記事
+
+        Returns:
+            Dict[str, Any]: ページのプロパティ
+        """
+        return {
+            "Title": {"rich_text": [{"text": {"content": item.title}}]},
+            "URL": {"url": item.link},
+            "Description": {"rich_text": [{"text": {"content": item.snippet}}]},
+            "PublishedAt": {"date": {"start": item.published_at.isoformat()}},
+            "Sentiment": {"select": {"name": item.sentiment}},
+        }
+
+    def upsert_page(self, item: Article) -> str:
+        """記事を1件保存します.
+
+        索引に同じURLのページがない場合は作成し、ある場合は設定に応じて
+        スキップまたは既存ページを更新します.
+
+        Args:
+            item: 保存する記事
+
+        Returns:
+            str: 実行した操作（"created"、"updated"、"skipped"）
+
+        Raises:
+            notion_client.APIResponseError: APIがエラーを返した場合
+        """
+        url_key = item.canonical_url
+        page_id = self._find_page(item.link)
+
+        if page_id is None:
+            with metrics.timer("notion_create"):
+                page = self.client.pages.create(
+                    parent={"database_id": self.database_id},
+                    properties=self._build_properties(item),
+                )
+            self.page_index.add(item.link, page["id"])
+            action = "created"
+        elif self.upsert_mode == "update":
+            with metrics.timer("notion_update"):
+                self.client.pages.update(page_id=page_id, properties=self._build_properties(item))
+            action = "updated"
+        else:
+            action = "skipped"
+
+        self.seen_urls.set(url_key, True)
+        return action
+
+    def save_news_to_notion(self, news_items: List[Article]) -> None:
         """ニュース記事をNotionデータベースに保存します.
 
         Args:
-            news_items: 保存する記事のリスト。各記事は辞書形式で、
-                      title, link, snippet, published_at, sentimentを含みます.
+            news_items: 保存する記事のリスト
         """
         for item in news_items:
+            # 保存済みの記事はAPIを呼び出さずにスキップ
+            if self.is_saved(item):
+                continue
+
             try:
-                self.client.pages.create(
-                    parent={"database_id": self.database_id},
-                    properties={
-                        "Title": {"rich_text": [{"text": {"content": item["title"]}}]},
-                        "URL": {"url": item["link"]},
-                        "Description": {"rich_text": [{"text": {"content": item["snippet"]}}]},
-                        "PublishedAt": {"date": {"start": item["published_at"]}},
-                        "Sentiment": {"select": {"name": item["sentiment"]}},
-                    },
-                )
+                self.upsert_page(item)
             except Exception as e:
                 print(f"記事の保存中にエラーが発生しました: {str(e)}")
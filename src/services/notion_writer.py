@@ -0,0 +1,202 @@
+"""Notionへの書き込みをバックグラウンドで行うモジュール."""
+
+import queue
+import random
+import threading
+import time
+from typing import Any, List, Optional
+
+from config.settings import (
+    NOTION_BACKOFF_BASE,
+    NOTION_BACKOFF_MAX,
+    NOTION_MAX_RETRIES,
+    NOTION_REQUESTS_PER_SECOND,
+    NOTION_WRITE_QUEUE_SIZE,
+    NOTION_WRITE_WORKERS,
+)
+from services.article import Article
+from services.notion import NotionClient
+from services.sinks import DeadLetter, OutputSink
+from utils.deadline import Deadline
+from utils.rate_limit import TokenBucket
+
+# ワーカーに終了を伝えるための番兵
+_STOP = object()
+
+
+class NotionWriter(OutputSink):
+    """Notionへの書き込みクラスです.
+
+    投入された記事をキュー経由で複数のワーカーが書き込みます.
+    トークンバケットでNotion APIのレート上限を守り、429や5xxの応答には
+    Retry-Afterまたは指数バックオフで待機してリトライします.
+    リトライしても保存できなかった記事はデッドレターとして呼び出し側に返します.
+    実行期限までに書き込めない記事は、次回の実行で再開できるよう未保存の記事として保持します.
+    """
+
+    name = "notion"
+    carries_over = True
+
+    def __init__(
+        self,
+        notion_client: NotionClient,
+        workers: int = NOTION_WRITE_WORKERS,
+        requests_per_second: float = NOTION_REQUESTS_PER_SECOND,
+        max_retries: int = NOTION_MAX_RETRIES,
+        queue_size: int = NOTION_WRITE_QUEUE_SIZE,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """書き込みクラスを初期化し、ワーカーを起動します.
+
+        Args:
+            notion_client: ページを作成するNotionクライアント
+            workers: 同時に書き込むワーカー数
+            requests_per_second: 書き込みのレート上限
+            max_retries: 429/5xx応答時の最大リトライ回数
+            queue_size: 書き込み待ちの最大件数。超えるとsubmitが待機する
+            deadline: 書き込みの実行期限。Noneの場合は無期限
+        """
+        super().__init__()
+        self.notion_client = notion_client
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(requests_per_second)
+        self.deadline = deadline or Deadline()
+        # written: 作成または更新したページ数
+        self.skipped = 0  # 保存済みのためスキップした記事数
+        self.retries = 0  # リトライした回数
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"notion-writer-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, item: Article) -> None:
+        """記事を書き込みキューに追加します.
+
+        キューが満杯の場合は空きができるまで待機します.
+
+        Args:
+            item: 保存する記事
+        """
+        self._queue.put(item)
+
+    def submit_all(self, items: List[Article]) -> None:
+        """複数の記事を書き込みキューに追加します.
+
+        Args:
+            items: 保存する記事のリスト
+        """
+        for item in items:
+            self.submit(item)
+
+    def close(self) -> List[DeadLetter]:
+        """キューに残った記事をすべて書き込み、ワーカーを終了します.
+
+        Returns:
+            List[DeadLetter]: 保存に失敗した記事のリスト
+        """
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        self._finished_at = time.monotonic()
+        return list(self.dead_letters)
+
+    def _run(self) -> None:
+        """ワーカーのメインループです."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write(item)
+            finally:
+                self._queue.task_done()
+
+    def _defer(self, item: Article) -> None:
+        """実行期限までに書き込めない記事を未保存の記事として保持します.
+
+        Args:
+            item: 保存する記事
+        """
+        with self._lock:
+            self.pending.append(item)
+
+    def _write(self, item: Article) -> None:
+        """1件の記事をリトライしながら書き込みます.
+
+        Args:
+            item: 保存する記事
+        """
+        if self.deadline.expired():
+            self._defer(item)
+            return
+        if self.notion_client.is_saved(item):
+            with self._lock:
+                self.skipped += 1
+            return
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.bucket.acquire(timeout=self.deadline.remaining()):
+                self._defer(item)
+                return
+            try:
+                action = self.notion_client.upsert_page(item)
+                with self._lock:
+                    if action == "skipped":
+                        self.skipped += 1
+                    else:
+                        self.written += 1
+                return
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt > self.max_retries:
+                    print(f"記事の保存中にエラーが発生しました: {item.link} - {str(e)}")
+                    with self._lock:
+                        self.dead_letters.append(DeadLetter(item, str(e), attempt))
+                    return
+                remaining = self.deadline.remaining()
+                if remaining is not None and delay >= remaining:
+                    self._defer(item)
+                    return
+                with self._lock:
+                    self.retries += 1
+                time.sleep(delay)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """エラーに応じたリトライまでの待機時間を返します.
+
+        Args:
+            error: 発生した例外
+            attempt: 何回目の試行で発生したか（1始まり）
+
+        Returns:
+            Optional[float]: 待機時間（秒）。リトライすべきでない場合はNone
+        """
+        import httpx
+        from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+        backoff = min(NOTION_BACKOFF_MAX, NOTION_BACKOFF_BASE * 2 ** (attempt - 1))
+        backoff *= 0.5 + random.random() / 2  # ワーカー間で再送が揃わないように揺らす
+
+        if isinstance(error, HTTPResponseError):
+            if error.status == 429:
+                retry_after = error.headers.get("Retry-After")
+                try:
+                    delay = float(retry_after) if retry_after else backoff
+                except ValueError:
+                    delay = backoff
+                # レート超過は全ワーカー共通の問題なので、バケットごと停止する
+                self.bucket.pause(delay)
+                return delay
+            if error.status >= 500:
+                return backoff
+            return None
+        if isinstance(error, (RequestTimeoutError, httpx.TransportError)):
+            return backoff
+        return None
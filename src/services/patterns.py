@@ -0,0 +1,149 @@
+"""複数の正規表現パターンを1回の走査で照合するモジュール."""
+
+import re
+from typing import List, Optional, Sequence, Set
+
+# 先頭文字として扱える要素（1文字のリテラル、エスケープした記号、\d）
+_ATOM = re.compile(r"\\d|\\[^A-Za-z0-9]|[^.^$*+?{}\[\]()|\\]")
+# {m}、{m,}、{m,n}、{,n}の量指定子（mを省略した場合は0回）
+_REPEAT = re.compile(r"\{(?:(\d+)|(\d*),\d*)\}")
+
+
+def _is_optional(pattern: str, pos: int) -> bool:
+    """pos以降の量指定子によって、直前の要素が0回になりうるかどうかを返します.
+
+    Args:
+        pattern: 正規表現パターン
+        pos: 要素の直後の位置
+
+    Returns:
+        bool: 0回になりうる場合True
+    """
+    if pattern[pos : pos + 1] in ("?", "*"):
+        return True
+    match = _REPEAT.match(pattern, pos)
+    return match is not None and int(match.group(1) or match.group(2) or 0) == 0
+
+
+def _split_group(pattern: str) -> Optional[List[str]]:
+    """先頭の(?:...)グループを選択肢に分割します.
+
+    Args:
+        pattern: (?:で始まる正規表現パターン
+
+    Returns:
+        Optional[List[str]]: グループ内の選択肢。文字クラスを含む場合や、グループが
+            0回になりうる場合はNone
+    """
+    branches: List[str] = []
+    start, depth, i = 3, 1, 3
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            return None
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                branches.append(pattern[start:i])
+                return None if _is_optional(pattern, i + 1) else branches
+        elif char == "|" and depth == 1:
+            branches.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    return None
+
+
+def _first_chars(pattern: str) -> Optional[Set[str]]:
+    """パターンの先頭に現れうる文字を文字クラスの要素として返します.
+
+    正規表現の内部の構文解析器は使わず、1文字のリテラル、エスケープした記号、\\d、
+    およびそれらで始まる選択肢の(?:...)グループで始まるパターンだけを扱います.
+
+    Args:
+        pattern: 正規表現パターン
+
+    Returns:
+        Optional[Set[str]]: 文字クラスに含める要素。先頭文字を特定できない場合はNone
+    """
+    branches = _split_group(f"(?:{pattern})")
+    if branches is None:
+        return None
+    chars: Set[str] = set()
+    for branch in branches:
+        if branch.startswith("(?:"):
+            groups = _split_group(branch)
+            if groups is None:
+                return None
+            for group in groups:
+                group_chars = _first_chars(group)
+                if group_chars is None:
+                    return None
+                chars |= group_chars
+            continue
+        match = _ATOM.match(branch)
+        if match is None or _is_optional(branch, match.end()):
+            return None
+        atom = match.group()
+        chars.add(atom if atom.startswith("\\") else re.escape(atom))
+    return chars
+
+
+class PatternMatcher:
+    """コンパイル済みのパターン照合クラスです.
+
+    複数のパターンを名前付きグループの選択（alternation）にまとめて一度だけコンパイルし、
+    テキストを1回走査するだけで、一致したグループの名前からどのパターンに一致したかを返します.
+    同じ位置で複数のパターンが一致する場合は、リストの先頭に近いパターンを返します.
+    各パターンの先頭文字が特定できる場合は先読みの文字クラスを付けて、
+    一致しえない位置での分岐の試行を省きます.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        """照合器を初期化します.
+
+        Args:
+            patterns: 照合する正規表現パターンのリスト（重複は除去されます）
+        """
+        self.patterns: List[str] = list(dict.fromkeys(patterns))
+        self._regex: Optional["re.Pattern[str]"] = None
+        if self.patterns:
+            alternation = "|".join(
+                f"(?P<p{i}>{pattern})" for i, pattern in enumerate(self.patterns)
+            )
+            prefix = self._first_char_lookahead()
+            self._regex = re.compile(f"{prefix}(?:{alternation})" if prefix else alternation)
+
+    def _first_char_lookahead(self) -> str:
+        """全パターンの先頭文字をまとめた先読みを返します.
+
+        Returns:
+            str: 先読みの正規表現。先頭文字を特定できないパターンがある場合は空文字列
+        """
+        chars: Set[str] = set()
+        for pattern in self.patterns:
+            pattern_chars = _first_chars(pattern)
+            if pattern_chars is None:
+                return ""
+            chars |= pattern_chars
+        return f"(?=[{''.join(sorted(chars))}])"
+
+    def search(self, text: str) -> Optional[str]:
+        """テキスト中で最初に一致したパターンを返します.
+
+        Args:
+            text: 照合する文字列
+
+        Returns:
+            Optional[str]: 一致したパターン。一致しない場合はNone
+        """
+        if self._regex is None:
+            return None
+        match = self._regex.search(text)
+        if match is None or match.lastgroup is None:
+            return None
+        return self.patterns[int(match.lastgroup[1:])]
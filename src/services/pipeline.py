@@ -0,0 +1,200 @@
+"""記事の絞り込みを段階的に行うジェネレーターパイプラインのモジュール."""
+
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+class Stage(ABC):
+    """パイプラインの1段階を表す基底クラスです.
+
+    入力件数と出力件数を数え、どの段階で記事が除外されたかを把握できるようにします.
+    """
+
+    def __init__(self, name: str) -> None:
+        """段階を初期化します.
+
+        Args:
+            name: 段階の名前（ログ出力用）
+        """
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+
+    def _count_in(self, items: Iterable[Any]) -> Iterator[Any]:
+        """入力件数を数えながら要素を返します.
+
+        Args:
+            items: 入力要素
+
+        Yields:
+            Any: 入力要素
+        """
+        for item in items:
+            self.items_in += 1
+            yield item
+
+    @abstractmethod
+    def process(self, items: Iterable[Any]) -> Iterator[Any]:
+        """入力要素を処理します（サブクラスで実装）.
+
+        Args:
+            items: 入力要素
+
+        Yields:
+            Any: 次の段階に渡す要素
+        """
+
+    def __call__(self, items: Iterable[Any]) -> Iterator[Any]:
+        """入力と出力の件数を数えながら処理を実行します.
+
+        Args:
+            items: 入力要素
+
+        Yields:
+            Any: 次の段階に渡す要素
+        """
+        for item in self.process(self._count_in(items)):
+            self.items_out += 1
+            yield item
+
+
+class FilterStage(Stage):
+    """条件を満たす要素だけを通過させる段階です."""
+
+    def __init__(self, name: str, predicate: Callable[[Any], bool]) -> None:
+        """段階を初期化します.
+
+        Args:
+            name: 段階の名前
+            predicate: 通過させる場合にTrueを返す関数
+        """
+        super().__init__(name)
+        self.predicate = predicate
+
+    def process(self, items: Iterable[Any]) -> Iterator[Any]:
+        """条件を満たす要素だけを返します.
+
+        Args:
+            items: 入力要素
+
+        Yields:
+            Any: 条件を満たした要素
+        """
+        return (item for item in items if self.predicate(item))
+
+
+class MapStage(Stage):
+    """要素を変換し、Noneになった要素を除外する段階です."""
+
+    def __init__(self, name: str, func: Callable[[Any], Optional[Any]]) -> None:
+        """段階を初期化します.
+
+        Args:
+            name: 段階の名前
+            func: 要素を変換する関数。除外する場合はNoneを返す
+        """
+        super().__init__(name)
+        self.func = func
+
+    def process(self, items: Iterable[Any]) -> Iterator[Any]:
+        """要素を変換して返します.
+
+        Args:
+            items: 入力要素
+
+        Yields:
+            Any: 変換後の要素
+        """
+        for item in items:
+            result = self.func(item)
+            if result is not None:
+                yield result
+
+
+class BatchStage(Stage):
+    """一定件数ずつまとめて変換する段階です.
+
+    記事本文の並列取得のように、まとめて処理した方が効率の良い処理に使用します.
+    後段が必要な件数を満たした時点で、残りのバッチは処理されません.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Sequence[Any]], Sequence[Optional[Any]]],
+        batch_size: int,
+    ) -> None:
+        """段階を初期化します.
+
+        Args:
+            name: 段階の名前
+            func: 要素のリストを受け取り、同じ順序の変換結果を返す関数。
+                除外する要素はNoneを返す
+            batch_size: 1回にまとめる件数
+        """
+        super().__init__(name)
+        self.func = func
+        self.batch_size = max(1, batch_size)
+
+    def process(self, items: Iterable[Any]) -> Iterator[Any]:
+        """要素をバッチごとに変換して返します.
+
+        Args:
+            items: 入力要素
+
+        Yields:
+            Any: 変換後の要素（入力と同じ順序）
+        """
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            for result in self.func(batch):
+                if result is not None:
+                    yield result
+
+
+class Pipeline:
+    """複数の段階を順に連結したパイプラインです."""
+
+    def __init__(self, stages: List[Stage]) -> None:
+        """パイプラインを初期化します.
+
+        Args:
+            stages: 実行順に並べた段階のリスト
+        """
+        self.stages = stages
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """パイプラインを遅延評価で実行します.
+
+        Args:
+            items: 最初の段階に渡す要素
+
+        Returns:
+            Iterator[Any]: 最後の段階を通過した要素
+        """
+        stream: Iterable[Any] = items
+        for stage in self.stages:
+            stream = stage(stream)
+        return iter(stream)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """各段階の入出力件数を返します.
+
+        Returns:
+            Dict[str, Dict[str, int]]: 段階名ごとの入力件数と出力件数
+        """
+        return {stage.name: {"in": stage.items_in, "out": stage.items_out} for stage in self.stages}
+
+    def format_stats(self) -> str:
+        """各段階の入出力件数をログ出力用の文字列にします.
+
+        Returns:
+            str: 「段階名 入力→出力」をカンマで連結した文字列
+        """
+        return ", ".join(
+            f"{stage.name} {stage.items_in}→{stage.items_out}" for stage in self.stages
+        )
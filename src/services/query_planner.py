@@ -0,0 +1,314 @@
+"""キーワードごとの実績に基づいて、実行ごとのクエリ数をキーワードに配分するモジュール.
+
+QUERY_GROUP_SIZEが2以上の場合は、互いに区別できるキーワードを1回のOR検索にまとめ、
+検索結果をタイトルと説明文に含まれる語でキーワードに振り分けます.
+"""
+
+import math
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+from config.settings import (
+    QUERY_EXPLORATION,
+    QUERY_GROUP_SIZE,
+    QUERY_YIELD_DECAY,
+    QUERY_YIELD_TTL_SECONDS,
+)
+from utils.cache import QUERY_YIELD_NAMESPACE, Cache, open_cache
+
+# 重複として数える絞り込みの段階（以前に処理した記事や、他の記事と同じ記事）
+DUPLICATE_STAGES = ("処理済み", "URL重複", "近似重複")
+
+
+def _normalize(text: str) -> str:
+    """照合用に全角・半角と大文字・小文字をそろえます.
+
+    Args:
+        text: 文字列
+
+    Returns:
+        str: 正規化した文字列
+    """
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def query_terms(query: str) -> FrozenSet[str]:
+    """キーワードを照合に使う語に分けます.
+
+    Args:
+        query: 検索キーワード（空白区切りの語）
+
+    Returns:
+        FrozenSet[str]: 正規化した語
+    """
+    return frozenset(_normalize(query).split())
+
+
+def is_compatible(group: Sequence[str], query: str) -> bool:
+    """キーワードを検索のまとまりに加えられるかどうかを返します.
+
+    まとめた後も、どのキーワードにも他のキーワードにない語が残る場合に限り加えられます
+    （検索結果をキーワードに振り分ける手がかりがなくなるため）.
+
+    Args:
+        group: まとめたキーワード
+        query: 加えるキーワード
+
+    Returns:
+        bool: 加えられる場合True
+    """
+    terms = [query_terms(q) for q in [*group, query]]
+    for i, own in enumerate(terms):
+        others = frozenset().union(*(t for j, t in enumerate(terms) if j != i))
+        if not own - others:
+            return False
+    return True
+
+
+def _join(groups: List[List[Tuple[str, int]]], query: Tuple[str, int], group_size: int) -> bool:
+    """キーワードを加えられる最初のまとまりに加えます.
+
+    Args:
+        groups: 検索のまとまり
+        query: キーワードと優先度
+        group_size: 1つのまとまりのキーワード数の上限
+
+    Returns:
+        bool: 加えた場合True
+    """
+    for group in groups:
+        if len(group) < group_size and is_compatible([q for q, _ in group], query[0]):
+            group.append(query)
+            return True
+    return False
+
+
+def group_queries(
+    queries: Sequence[Tuple[str, int]], group_size: int = QUERY_GROUP_SIZE
+) -> List[List[Tuple[str, int]]]:
+    """キーワードを1回の検索で実行するまとまりに分けます.
+
+    優先度の高い順に、加えられる最初のまとまりに入れるため、まとまりの順序は
+    先頭のキーワードの優先度の順になります.
+
+    Args:
+        queries: 優先度の順に並べたキーワードと優先度のリスト
+        group_size: 1つのまとまりのキーワード数の上限。1以下の場合はまとめない
+
+    Returns:
+        List[List[Tuple[str, int]]]: 検索のまとまりのリスト
+    """
+    groups: List[List[Tuple[str, int]]] = []
+    for query in queries:
+        if not _join(groups, query, group_size):
+            groups.append([query])
+    return groups
+
+
+def combine_queries(queries: Sequence[str]) -> str:
+    """複数のキーワードをGoogle NewsのOR検索の1つのクエリにします.
+
+    Args:
+        queries: 検索キーワード
+
+    Returns:
+        str: 「(A B) OR (C D)」の形式のクエリ。キーワードが1つの場合はそのまま
+    """
+    if len(queries) == 1:
+        return queries[0]
+    return " OR ".join(f"({query})" for query in queries)
+
+
+def attribute_results(
+    results: Sequence[Dict[str, Any]], queries: Sequence[str]
+) -> Tuple[Dict[str, List[Dict[str, Any]]], int]:
+    """まとめた検索の結果を、タイトルと説明文に含まれる語でキーワードに振り分けます.
+
+    含まれる語の割合が最も高いキーワードに振り分け、同じ割合の場合は優先度の高い
+    （先に並んだ）キーワードとします. どのキーワードの語も含まない結果は、
+    いずれのキーワードにも振り分けずに除外します（関係のない記事で特定のキーワードの
+    処理済みの範囲や実績が進まないようにするため）.
+
+    Args:
+        results: GNewsの検索結果
+        queries: まとめたキーワード（優先度の順）
+
+    Returns:
+        Tuple[Dict[str, List[Dict[str, Any]]], int]:
+            キーワードごとの検索結果と、どの語も含まずに除外した結果の件数
+    """
+    terms = [(query, query_terms(query)) for query in queries]
+    attributed: Dict[str, List[Dict[str, Any]]] = {query: [] for query in queries}
+    unmatched = 0
+    for item in results:
+        text = _normalize(f"{item.get('title', '')} {item.get('description', '')}")
+        best: Optional[str] = None
+        best_score = 0.0
+        for query, words in terms:
+            score = sum(word in text for word in words) / len(words) if words else 0.0
+            if score > best_score:
+                best, best_score = query, score
+        if best is None:
+            unmatched += 1
+            continue
+        attributed[best].append(item)
+    return attributed, unmatched
+
+
+class QueryYield(NamedTuple):
+    """1つのキーワードの実績です（いずれも検索のたびに減衰させた累計）."""
+
+    runs: float  # 検索回数
+    results: float  # 検索結果の件数
+    accepted: float  # 絞り込みを通過した新しい記事の件数
+    duplicates: float  # 処理済みや重複として除外した件数
+
+    @property
+    def accepted_per_query(self) -> float:
+        """1回の検索あたりの新しい記事の件数を返します.
+
+        Returns:
+            float: 新しい記事の件数の平均
+        """
+        return self.accepted / self.runs if self.runs else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        """重複以外の理由で除外した記事の割合を返します.
+
+        Returns:
+            float: 検索結果に対する除外の割合
+        """
+        if not self.results:
+            return 0.0
+        return max(0.0, self.results - self.accepted - self.duplicates) / self.results
+
+
+class QueryPlanner:
+    """キーワードごとの実績を記録し、検索するキーワードを選ぶクラスです.
+
+    1回の検索あたりの新しい記事の件数が多いキーワードから順に実行枠を割り当てます.
+    実績の少ないキーワードにも機会を与えるよう、検索回数が少ないほど大きくなる探索項を
+    加えたスコア（UCB）で並べ、まだ検索したことがないキーワードは最優先で試します.
+    同じスコアの場合は設定の優先度の順とします.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[Cache] = None,
+        decay: float = QUERY_YIELD_DECAY,
+        exploration: float = QUERY_EXPLORATION,
+    ) -> None:
+        """配分クラスを初期化します.
+
+        Args:
+            cache: 実績の保存先。Noneの場合は設定に従って生成
+            decay: 検索のたびに過去の実績に掛ける減衰率
+            exploration: 探索項の係数。0の場合は実績だけで選ぶ
+        """
+        self.cache = cache or open_cache(QUERY_YIELD_NAMESPACE, ttl=QUERY_YIELD_TTL_SECONDS)
+        self.decay = decay
+        self.exploration = exploration
+
+    def get(self, query: str) -> Optional[QueryYield]:
+        """キーワードの実績を返します.
+
+        Args:
+            query: 検索キーワード
+
+        Returns:
+            Optional[QueryYield]: 実績。記録がない場合はNone
+        """
+        entry = self.cache.get(query)
+        if not entry:
+            return None
+        try:
+            return QueryYield(*entry)
+        except TypeError:
+            return None
+
+    def record(self, query: str, stats: Dict[str, Dict[str, int]], accepted: int) -> None:
+        """1回の検索の結果を実績に加えます.
+
+        Args:
+            query: 検索キーワード
+            stats: 絞り込みの段階ごとの入出力件数（Pipeline.stats()）
+            accepted: 絞り込みを通過した記事の件数
+        """
+        results = next(iter(stats.values()), {}).get("in", 0)
+        duplicates = sum(
+            stats[name]["in"] - stats[name]["out"] for name in DUPLICATE_STAGES if name in stats
+        )
+        previous = self.get(query) or QueryYield(0.0, 0.0, 0.0, 0.0)
+        updated = QueryYield(
+            *(
+                value * self.decay + new
+                for value, new in zip(previous, (1, results, accepted, duplicates))
+            )
+        )
+        self.cache.set(query, list(updated))
+
+    def score(self, stats: Optional[QueryYield], total_runs: float) -> float:
+        """キーワードを選ぶ際のスコアを返します.
+
+        Args:
+            stats: キーワードの実績
+            total_runs: 対象の全キーワードの検索回数の合計
+
+        Returns:
+            float: 新しい記事の件数の平均と探索項の和。実績がない場合は無限大
+        """
+        if stats is None or stats.runs <= 0:
+            return math.inf
+        bonus = self.exploration * math.sqrt(math.log(max(total_runs, 1.0) + 1) / stats.runs)
+        return stats.accepted_per_query + bonus
+
+    def plan(
+        self,
+        queries: Sequence[Tuple[str, int]],
+        budget: int,
+        group_size: int = QUERY_GROUP_SIZE,
+    ) -> List[Tuple[str, int]]:
+        """実行枠に収まるだけキーワードを選びます.
+
+        スコアの順にキーワードを検索のまとまり（group_queries）に加え、まとまりの数が
+        実行枠を超える場合は、既存のまとまりに加えられるキーワードだけを選びます.
+
+        Args:
+            queries: キーワードと設定の優先度（数字が小さいほど高優先）のリスト
+            budget: 今回の実行で使用できるクエリ数
+            group_size: 1回の検索にまとめるキーワード数の上限
+
+        Returns:
+            List[Tuple[str, int]]: 選んだキーワードと、スコアの順に振り直した優先度
+        """
+        stats = {query: self.get(query) for query, _ in queries}
+        total_runs = sum(s.runs for s in stats.values() if s is not None)
+        ranked = sorted(queries, key=lambda x: (-self.score(stats[x[0]], total_runs), x[1]))
+        groups: List[List[Tuple[str, int]]] = []
+        selected: List[str] = []
+        for query, _ in ranked:
+            if _join(groups, (query, 0), group_size):
+                selected.append(query)
+            elif len(groups) < budget:
+                groups.append([(query, 0)])
+                selected.append(query)
+        return [(query, rank) for rank, query in enumerate(selected)]
+
+    def format_stats(self, queries: Sequence[str]) -> str:
+        """キーワードごとの実績を表示用の文字列にします.
+
+        Args:
+            queries: 検索キーワード
+
+        Returns:
+            str: 「キーワード 新規/回 除外率」を並べた文字列
+        """
+        parts = []
+        for query in queries:
+            stats = self.get(query)
+            if stats is not None:
+                parts.append(
+                    f"{query} {stats.accepted_per_query:.1f}件/回 除外{stats.rejection_rate:.0%}"
+                )
+        return ", ".join(parts)
@@ -0,0 +1,122 @@
+"""複数のキーワードの検索を並行して実行するモジュール."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import KEYWORD_WORKERS, MAX_RESULTS_PER_QUERY, QUERY_GROUP_SIZE
+from services.article import Article
+from services.query_planner import combine_queries, group_queries
+from utils.deadline import DeadlineExceeded
+
+if TYPE_CHECKING:
+    from services.google_news import GoogleNewsScraper
+
+# キーワードと検索結果を受け取る関数（Notionへの書き込みの投入などに使用）
+ResultHandler = Callable[[str, List[Article]], None]
+
+
+class KeywordScheduler:
+    """キーワード検索のスケジューラーです.
+
+    複数のキーワードをスレッドプールで並行して検索し、あるキーワードの本文取得や
+    Notionへの書き込みと次のキーワードの検索を重ねて実行します.
+    クエリの間隔はスクレイパーのレート制限で空けるため、固定の待機は行いません.
+    スクレイパーの実行期限までに開始できなかったキーワードと、残りのクエリ数に収まらずに
+    スキップしたキーワードは、次回の実行で再開できるよう未処理のキーワード（pending）として保持します.
+    group_sizeが2以上の場合は、互いに区別できるキーワードを1回のOR検索にまとめます.
+    """
+
+    def __init__(
+        self,
+        scraper: "GoogleNewsScraper",
+        workers: int = KEYWORD_WORKERS,
+        max_results: int = MAX_RESULTS_PER_QUERY,
+        group_size: int = QUERY_GROUP_SIZE,
+    ) -> None:
+        """スケジューラーを初期化します.
+
+        Args:
+            scraper: 検索に使用するスクレイパー
+            workers: 並行して処理するキーワード数
+            max_results: 1キーワードあたりの最大記事数
+            group_size: 1回の検索にまとめるキーワード数の上限
+        """
+        self.scraper = scraper
+        self.workers = max(1, workers)
+        self.max_results = max_results
+        self.group_size = group_size
+        self.pending: List[Tuple[str, int]] = []  # 今回の実行で検索できなかったキーワード
+        self._lock = threading.Lock()
+
+    def _search(self, group: Sequence[Tuple[str, int]]) -> Optional[Dict[str, List[Article]]]:
+        """1回の検索にまとめたキーワードを検索します.
+
+        Args:
+            group: キーワードと優先度のリスト
+
+        Returns:
+            Optional[Dict[str, List[Article]]]: キーワードごとの検索結果の記事リスト。
+                実行期限を過ぎた場合はNone
+        """
+        queries = [query for query, _ in group]
+        try:
+            if len(queries) == 1:
+                return {queries[0]: self.scraper.search_news(queries[0], self.max_results)}
+            return self.scraper.search_group(queries, self.max_results)
+        except DeadlineExceeded:
+            for query in queries:
+                print(f"実行期限までに検索できないため、キーワード '{query}' を次回に持ち越します。")
+            with self._lock:
+                self.pending.extend(group)
+            return None
+
+    def run(
+        self,
+        queries: Sequence[Tuple[str, int]],
+        on_results: Optional[ResultHandler] = None,
+    ) -> List[Article]:
+        """キーワードを優先度順に並行して検索します.
+
+        キーワードを検索のまとまりに分け、残りのクエリ数に収まる分だけを
+        優先度の高い順に実行し、収まらない低優先度のキーワードはスキップして次回に持ち越します.
+
+        Args:
+            queries: キーワードと優先度（数字が小さいほど高優先）のリスト
+            on_results: キーワードの検索が完了するたびに呼び出す関数
+
+        Returns:
+            List[Article]: 優先度順に並べた全キーワードの記事リスト
+        """
+        sorted_queries = sorted(queries, key=lambda x: x[1])
+        groups = group_queries(sorted_queries, self.group_size)
+        budget = self.scraper.remaining_queries()
+        scheduled, skipped = groups[:budget], groups[budget:]
+        for query, priority in (query for group in skipped for query in group):
+            print(f"優先度{priority}のクエリ「{query}」はAPI制限により次回に持ち越します。")
+            self.pending.append((query, priority))
+        if not scheduled:
+            self.pending.sort(key=lambda x: x[1])
+            return []
+
+        results: Dict[str, List[Article]] = {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(scheduled))) as executor:
+            # 優先度の高い順に投入し、先に開始したキーワードから検索枠を確保させる
+            futures: Dict[Future, int] = {}
+            for i, group in enumerate(scheduled):
+                query = combine_queries([query for query, _ in group])
+                print(f"優先度{group[0][1]}のクエリ「{query}」を実行します。")
+                futures[executor.submit(self._search, group)] = i
+
+            for future in as_completed(futures):
+                group_results = future.result()
+                if group_results is None:
+                    continue
+                for query, _ in scheduled[futures[future]]:
+                    news_items = group_results.get(query, [])
+                    results[query] = news_items
+                    if on_results is not None:
+                        on_results(query, news_items)
+
+        self.pending.sort(key=lambda x: x[1])
+        return [news_item for query, _ in sorted_queries for news_item in results.get(query, [])]
@@ -1,27 +1,155 @@
 """テキストの感情分析を行うモジュール."""
 
-from janome.tokenizer import Tokenizer
-from config.settings import POSITIVE_WORDS
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from config.settings import (
+    POSITIVE_WORDS,
+    SENTIMENT_CACHE_SIZE,
+    SENTIMENT_SATURATION,
+    SENTIMENT_STRATEGY,
+)
+
+if TYPE_CHECKING:
+    from janome.tokenizer import Tokenizer
+
+# janomeの辞書読み込みは数秒かかるため、プロセス内で1つだけ生成して
+# Lambdaのウォームスタート時にも再利用する
+_tokenizer: Optional["Tokenizer"] = None
+_tokenizer_lock = threading.Lock()
+_analyzer: Optional["SentimentAnalyzer"] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_tokenizer() -> "Tokenizer":
+    """共有の形態素解析器を返します。初回呼び出し時に生成します.
+
+    Returns:
+        Tokenizer: 分かち書きモードのjanome形態素解析器
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                from janome.tokenizer import Tokenizer
+
+                # 分かち書きモードは表層形だけを扱うため、読み込む辞書データが少ない
+                _tokenizer = Tokenizer(wakati=True)
+    return _tokenizer
+
+
+def get_sentiment_analyzer() -> "SentimentAnalyzer":
+    """設定に従った共有の感情分析器を返します。初回呼び出し時に生成します.
+
+    Returns:
+        SentimentAnalyzer: 感情分析器
+    """
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = SentimentAnalyzer()
+    return _analyzer
 
 
 class SentimentAnalyzer:
     """感情分析クラスです.
 
     日本語のテキストを分析し、ポジティブな内容かどうかを判定します.
+    ポジティブワードの出現数から0〜1のスコアを算出し、本文のハッシュごとに結果を保持します.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, strategy: str = SENTIMENT_STRATEGY, cache_size: int = SENTIMENT_CACHE_SIZE
+    ) -> None:
         """感情分析器を初期化します.
 
-        日本語の形態素解析器とポジティブワードリストを設定します.
+        ポジティブワードリストを設定します. 形態素解析器は初めて使用する時点で読み込みます.
+
+        Args:
+            strategy: 単語の数え方。"dictionary"は最長一致、"janome"は形態素解析
+            cache_size: スコアを保持する最大件数
         """
-        self.tokenizer = Tokenizer()
+        if strategy not in ("dictionary", "janome"):
+            raise ValueError(f"未対応の感情分析方式です: {strategy}")
+        self.strategy = strategy
         self.positive_words = POSITIVE_WORDS
+        # 長い単語を先に並べ、選択の左から順に試すことで最長一致にする
+        self._pattern = re.compile(
+            "|".join(re.escape(word) for word in sorted(POSITIVE_WORDS, key=len, reverse=True))
+        )
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def tokenizer(self) -> Optional["Tokenizer"]:
+        """形態素解析器を返します。janome方式で初めて使用する時点で読み込みます.
+
+        Returns:
+            Optional[Tokenizer]: 共有の形態素解析器。dictionary方式の場合はNone
+        """
+        return get_tokenizer() if self.strategy == "janome" else None
+
+    def count_positive_words(self, text: str) -> int:
+        """テキストに含まれるポジティブワードの数を返します.
+
+        Args:
+            text: 分析対象のテキスト
+
+        Returns:
+            int: ポジティブワードの出現数
+        """
+        tokenizer = self.tokenizer
+        if tokenizer is not None:
+            # 日本語の形態素解析（トークンはジェネレーターで逐次受け取る）
+            return sum(1 for surface in tokenizer.tokenize(text) if surface in self.positive_words)
+        return sum(1 for _ in self._pattern.finditer(text))
+
+    def analyze(self, text: str) -> float:
+        """テキストのポジティブ度を0〜1のスコアで返します.
+
+        同じ本文の結果はハッシュをキーに保持し、再計算しません.
+
+        Args:
+            text: 分析対象のテキスト
+
+        Returns:
+            float: ポジティブワードの出現数をSENTIMENT_SATURATIONで割ったスコア（上限1.0）
+        """
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+                return score
+
+        score = min(1.0, self.count_positive_words(text) / SENTIMENT_SATURATION)
+
+        with self._lock:
+            self._cache[key] = score
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return score
+
+    def analyze_batch(self, texts: Iterable[str]) -> List[float]:
+        """複数のテキストのスコアをまとめて返します.
+
+        Args:
+            texts: 分析対象のテキスト
+
+        Returns:
+            List[float]: 入力と同じ順序のスコア
+        """
+        return [self.analyze(text) for text in texts]
 
     def is_positive(self, text: str) -> bool:
         """テキストがポジティブかどうかを判定します.
 
-        日本語の形態素解析とポジティブワードマッチングを行います.
+        設定された方式でポジティブワードマッチングを行います.
 
         Args:
             text: 分析対象のテキスト
@@ -29,9 +157,5 @@ class SentimentAnalyzer:
         Returns:
             bool: ポジティブな内容の場合はTrue
         """
-        # 日本語の形態素解析
-        tokens = [token.surface for token in self.tokenizer.tokenize(text)]
-        positive_count = sum(1 for token in tokens if token in self.positive_words)
-
         # ポジティブワードを含む場合
-        return positive_count > 0
+        return self.count_positive_words(text) > 0
@@ -0,0 +1,564 @@
+"""収集した記事の出力先（Notion、JSON Lines、SQLite、Parquet）を提供するモジュール.
+
+Notionへの書き込みは1ページごとのAPI呼び出しでレート上限があるため、
+過去の記事の再投入や分析には、記事をまとめて書き込むファイルの出力先を使います.
+main.pyとlambda_handlerは、設定（OUTPUT_SINKS）に従って生成したSinkGroupに記事を投入します.
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from config.settings import (
+    JSONL_OUTPUT_PATH,
+    OUTPUT_SINKS,
+    PARQUET_OUTPUT_DIR,
+    SINK_BATCH_SIZE,
+    SINK_FLUSH_INTERVAL_SECONDS,
+    SQLITE_OUTPUT_PATH,
+)
+from services.article import Article
+from utils.cache import Cache
+from utils.deadline import Deadline
+from utils.logger import logger
+from utils.metrics import metrics
+
+# 出力するレコードの列（JSON Lines、SQLite、Parquetで共通）
+RECORD_FIELDS = (
+    "canonical_url",
+    "url",
+    "title",
+    "snippet",
+    "published_at",
+    "publisher",
+    "sentiment_score",
+    "sentiment",
+    "content",
+    "saved_at",
+)
+
+
+class DeadLetter(NamedTuple):
+    """保存に失敗した記事と失敗理由です."""
+
+    item: Article
+    error: str
+    attempts: int
+    sink: str = "notion"
+
+
+def to_record(item: Article, saved_at: str) -> Dict[str, Any]:
+    """記事を出力するレコードに変換します.
+
+    Args:
+        item: 記事
+        saved_at: 書き込んだ日時（ISO 8601）
+
+    Returns:
+        Dict[str, Any]: RECORD_FIELDSの列を持つ辞書
+    """
+    return {
+        "canonical_url": item.canonical_url,
+        "url": item.link,
+        "title": item.title,
+        "snippet": item.snippet,
+        "published_at": item.published_at.isoformat(),
+        "publisher": item.publisher,
+        "sentiment_score": item.sentiment_score,
+        "sentiment": item.sentiment,
+        "content": item.content,
+        "saved_at": saved_at,
+    }
+
+
+class OutputSink(ABC):
+    """記事の出力先の基底クラスです.
+
+    出力先を追加する場合は、このクラスを継承してsubmit/closeを実装します.
+    """
+
+    name = ""
+    # 実行期限までに書き込めなかった記事を次回の実行に持ち越すかどうか
+    carries_over = False
+
+    def __init__(self) -> None:
+        """件数を初期化します."""
+        self.dead_letters: List[DeadLetter] = []
+        self.pending: List[Article] = []  # 実行期限までに書き込めなかった記事
+        self.written = 0  # 書き込んだ記事数
+        self._started_at = time.monotonic()
+        self._finished_at: Optional[float] = None
+
+    @abstractmethod
+    def submit(self, item: Article) -> None:
+        """記事を書き込み待ちに追加します.
+
+        Args:
+            item: 保存する記事
+        """
+
+    def submit_all(self, items: List[Article]) -> None:
+        """複数の記事を書き込み待ちに追加します.
+
+        Args:
+            items: 保存する記事のリスト
+        """
+        for item in items:
+            self.submit(item)
+
+    @abstractmethod
+    def close(self) -> List[DeadLetter]:
+        """書き込み待ちの記事をすべて書き込み、出力先を閉じます.
+
+        Returns:
+            List[DeadLetter]: 保存に失敗した記事のリスト
+        """
+
+    def pages_per_second(self) -> float:
+        """書き込みのスループットを返します.
+
+        Returns:
+            float: 1秒あたりに書き込んだ記事数
+        """
+        finished_at = self._finished_at or time.monotonic()
+        elapsed = finished_at - self._started_at
+        return self.written / elapsed if elapsed > 0 else 0.0
+
+
+class BufferedSink(OutputSink):
+    """記事をためてまとめて書き込む出力先の基底クラスです.
+
+    batch_size件たまった時点と、flush_interval秒ごとに書き込みます. 書き込みは1つずつ行うため、派生クラスの_write_batchは
+    スレッドセーフでなくてかまいません. 書き込みに失敗したバッチの記事は
+    デッドレターとして返します（リトライはしません）.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = SINK_BATCH_SIZE,
+        flush_interval: float = SINK_FLUSH_INTERVAL_SECONDS,
+        seen_urls: Optional[Cache] = None,
+    ) -> None:
+        """出力先を初期化し、一定間隔で書き込むスレッドを起動します.
+
+        Args:
+            batch_size: まとめて書き込む件数
+            flush_interval: 件数に達しなくても書き込む間隔（秒）。0以下の場合は件数とcloseのみ
+            seen_urls: 書き込んだ記事のURLを記録するキャッシュ。Noneの場合は記録しない
+        """
+        super().__init__()
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.seen_urls = seen_urls
+        self.batches = 0  # 書き込んだ回数
+        self._buffer: List[Article] = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._run, name=f"{self.name}-sink-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def submit(self, item: Article) -> None:
+        """記事を書き込み待ちに追加し、batch_size件たまった場合は書き込みます.
+
+        Args:
+            item: 保存する記事
+        """
+        with self._condition:
+            self._buffer.append(item)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """書き込み待ちの記事をすべて書き込みます."""
+        with self._write_lock:
+            with self._condition:
+                batch, self._buffer = self._buffer, []
+            if batch:
+                self._write_safely(batch)
+
+    def close(self) -> List[DeadLetter]:
+        """書き込み待ちの記事をすべて書き込み、出力先を閉じます.
+
+        Returns:
+            List[DeadLetter]: 保存に失敗した記事のリスト
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._write_lock:
+            try:
+                self._close()
+            except Exception as e:
+                logger.error(f"出力先を閉じる際にエラーが発生しました: {self.name} - {str(e)}")
+        self._finished_at = time.monotonic()
+        return list(self.dead_letters)
+
+    def _run(self) -> None:
+        """一定間隔で書き込むスレッドのメインループです."""
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                self._condition.wait(self.flush_interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def _write_safely(self, batch: List[Article]) -> None:
+        """1回分の記事を書き込み、失敗した場合はデッドレターに記録します（ロックを取得して呼び出す）.
+
+        Args:
+            batch: 書き込む記事
+        """
+        saved_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            with metrics.timer(f"sink_{self.name}"):
+                self._write_batch([to_record(item, saved_at) for item in batch])
+        except Exception as e:
+            logger.error(f"記事の書き込み中にエラーが発生しました: {self.name} - {str(e)}")
+            self.dead_letters.extend(DeadLetter(item, str(e), 1, self.name) for item in batch)
+            return
+        self.written += len(batch)
+        self.batches += 1
+        metrics.count("sink_written", self.name, len(batch))
+        if self.seen_urls is not None:
+            for item in batch:
+                self.seen_urls.set(item.canonical_url, True)
+
+    @abstractmethod
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """レコードをまとめて書き込みます.
+
+        Args:
+            records: to_recordで変換したレコード
+        """
+
+    def _close(self) -> None:
+        """ファイルや接続を閉じます."""
+
+
+def _ensure_parent(path: str) -> None:
+    """ファイルを置くディレクトリを作成します.
+
+    Args:
+        path: ファイルのパス
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+class JSONLSink(BufferedSink):
+    """1行に1件のJSONを追記する出力先です.
+
+    既存のファイルには追記のみを行い、同じ記事を重複して書き込む場合があります
+    （読み込む側でcanonical_urlにより重複を除きます）.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path: str = JSONL_OUTPUT_PATH, **kwargs: Any) -> None:
+        """出力先を初期化します.
+
+        Args:
+            path: JSON Linesファイルのパス
+            **kwargs: BufferedSinkの引数
+        """
+        self.path = path
+        self._file: Optional[Any] = None
+        super().__init__(**kwargs)
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """レコードを1回の書き込みで追記します.
+
+        Args:
+            records: to_recordで変換したレコード
+        """
+        if self._file is None:
+            _ensure_parent(self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(
+            "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        )
+        self._file.flush()
+
+    def _close(self) -> None:
+        """ファイルを閉じます."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SQLiteSink(BufferedSink):
+    """SQLiteの表に記事を書き込む出力先です.
+
+    1回分の記事を1つのトランザクションでexecutemanyにより書き込みます.
+    正規URLを主キーとし、同じ記事は新しい内容で置き換えます.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SQLITE_OUTPUT_PATH, **kwargs: Any) -> None:
+        """データベースを開き、表を作成します.
+
+        Args:
+            path: SQLiteファイルのパス
+            **kwargs: BufferedSinkの引数
+        """
+        import sqlite3
+
+        _ensure_parent(path)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " canonical_url TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " snippet TEXT NOT NULL,"
+                " published_at TEXT NOT NULL,"
+                " publisher TEXT NOT NULL,"
+                " sentiment_score REAL,"
+                " sentiment TEXT NOT NULL,"
+                " content TEXT NOT NULL,"
+                " saved_at TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at)"
+            )
+        self._insert = (
+            f"INSERT OR REPLACE INTO articles ({', '.join(RECORD_FIELDS)})"
+            f" VALUES ({', '.join('?' for _ in RECORD_FIELDS)})"
+        )
+        super().__init__(**kwargs)
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """レコードを1つのトランザクションで書き込みます.
+
+        Args:
+            records: to_recordで変換したレコード
+        """
+        with self._conn:
+            self._conn.executemany(
+                self._insert,
+                [tuple(record[field] for field in RECORD_FIELDS) for record in records],
+            )
+
+    def _close(self) -> None:
+        """データベース接続を閉じます."""
+        self._conn.close()
+
+
+class ParquetSink(BufferedSink):
+    """実行ごとに1つのParquetファイルへ記事を書き込む出力先です.
+
+    1回分の記事を1つの行グループとして書き込みます. pyarrowが必要です.
+    """
+
+    name = "parquet"
+
+    def __init__(self, directory: str = PARQUET_OUTPUT_DIR, **kwargs: Any) -> None:
+        """出力先を初期化します.
+
+        Args:
+            directory: Parquetファイルを置くディレクトリ
+            **kwargs: BufferedSinkの引数
+
+        Raises:
+            ImportError: pyarrowがインストールされていない場合
+        """
+        import pyarrow as pa
+
+        self.schema = pa.schema(
+            [
+                (field, pa.float64() if field == "sentiment_score" else pa.string())
+                for field in RECORD_FIELDS
+            ]
+        )
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = os.path.join(directory, f"articles-{stamp}-{os.getpid()}.parquet")
+        self._writer: Optional[Any] = None
+        super().__init__(**kwargs)
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """レコードを1つの行グループとして書き込みます.
+
+        Args:
+            records: to_recordで変換したレコード
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            _ensure_parent(self.path)
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        columns = {field: [record[field] for record in records] for field in RECORD_FIELDS}
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _close(self) -> None:
+        """ファイルを閉じます（フッターを書き込みます）."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class SinkGroup:
+    """複数の出力先にまとめて記事を投入するクラスです.
+
+    件数などは先頭の出力先（主な出力先）の値を返します.
+    """
+
+    def __init__(self, sinks: Sequence[OutputSink]) -> None:
+        """出力先を保持します.
+
+        Args:
+            sinks: 出力先のリスト。先頭が主な出力先
+        """
+        if not sinks:
+            raise ValueError("出力先が指定されていません")
+        self.sinks = list(sinks)
+
+    def submit_all(self, items: List[Article]) -> None:
+        """すべての出力先に記事を投入します.
+
+        Args:
+            items: 保存する記事のリスト
+        """
+        for sink in self.sinks:
+            sink.submit_all(items)
+
+    def carry_over(self, items: List[Article]) -> None:
+        """前回の実行から持ち越した記事を、記事を持ち越す出力先にだけ投入します.
+
+        ファイルの出力先は前回の実行で書き込み済みのため、再度は書き込みません.
+
+        Args:
+            items: 前回の実行で保存できなかった記事
+        """
+        for sink in self.sinks:
+            if sink.carries_over:
+                sink.submit_all(items)
+
+    def close(self) -> List[DeadLetter]:
+        """すべての出力先を閉じます.
+
+        Returns:
+            List[DeadLetter]: すべての出力先で保存に失敗した記事のリスト
+        """
+        dead_letters: List[DeadLetter] = []
+        for sink in self.sinks:
+            dead_letters.extend(sink.close())
+        return dead_letters
+
+    @property
+    def written(self) -> int:
+        """主な出力先に書き込んだ記事数を返します.
+
+        Returns:
+            int: 書き込んだ記事数
+        """
+        return self.sinks[0].written
+
+    @property
+    def pending(self) -> List[Article]:
+        """実行期限までに書き込めず、次回の実行に持ち越す記事を返します.
+
+        Returns:
+            List[Article]: 持ち越す記事
+        """
+        return [item for sink in self.sinks if sink.carries_over for item in sink.pending]
+
+    def pages_per_second(self) -> float:
+        """主な出力先の書き込みのスループットを返します.
+
+        Returns:
+            float: 1秒あたりに書き込んだ記事数
+        """
+        return self.sinks[0].pages_per_second()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """出力先ごとの件数を返します.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 出力先ごとの書き込んだ件数、失敗した件数、
+                1秒あたりの件数
+        """
+        return {
+            sink.name: {
+                "written": sink.written,
+                "failed": len(sink.dead_letters),
+                "per_second": round(sink.pages_per_second(), 2),
+            }
+            for sink in self.sinks
+        }
+
+    def format_stats(self) -> str:
+        """出力先ごとの件数を表示用の文字列にします.
+
+        Returns:
+            str: 「出力先 保存/失敗 件/秒」を並べた文字列
+        """
+        return ", ".join(
+            f"{name} {s['written']}件/失敗{s['failed']} {s['per_second']:.2f}件/秒"
+            for name, s in self.stats().items()
+        )
+
+
+def create_sinks(
+    names: Sequence[str] = OUTPUT_SINKS,
+    seen_urls: Optional[Cache] = None,
+    deadline: Optional[Deadline] = None,
+) -> SinkGroup:
+    """設定に応じた出力先を生成します.
+
+    pyarrowがインストールされていない場合、Parquetの出力先は警告を出して使用しません.
+    Notionを使用しない場合は、ファイルの出力先が保存済みのURLを記録します
+    （Notionを使用する場合は、Notionへの書き込みより先に保存済みとしないよう記録しません）.
+
+    Args:
+        names: 出力先の名前（"notion"、"jsonl"、"sqlite"、"parquet"）。先頭が主な出力先
+        seen_urls: 保存済みのURLのキャッシュ
+        deadline: Notionへの書き込みの実行期限。Noneの場合は無期限
+
+    Returns:
+        SinkGroup: 出力先
+
+    Raises:
+        ValueError: 不明な出力先が指定された場合
+    """
+    file_seen_urls = None if "notion" in names else seen_urls
+    sinks: List[OutputSink] = []
+    for name in names:
+        if name == "notion":
+            from services.notion import NotionClient
+            from services.notion_writer import NotionWriter
+
+            sinks.append(NotionWriter(NotionClient(seen_urls=seen_urls), deadline=deadline))
+        elif name == "jsonl":
+            sinks.append(JSONLSink(seen_urls=file_seen_urls))
+        elif name == "sqlite":
+            sinks.append(SQLiteSink(seen_urls=file_seen_urls))
+        elif name == "parquet":
+            try:
+                sinks.append(ParquetSink(seen_urls=file_seen_urls))
+            except ImportError:
+                logger.warning("pyarrowがインストールされていないため、Parquetには出力しません")
+        else:
+            raise ValueError(f"不明な出力先です: {name}")
+    return SinkGroup(sinks)
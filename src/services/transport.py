@@ -0,0 +1,801 @@
+"""記事ページの取得に使用する通信（接続の再利用、リトライ、HTTP/2）を提供するモジュール.
+
+記事は一部の大手配信元に集中するため、同じホストへの接続を使い回して
+TCP/TLSの接続確立を減らします. 通信の方式は次の2つから選べます.
+
+- requests: ホストごとの接続プールとurllib3のリトライを設定したrequests.Session
+- httpx: 1つの接続で複数の記事を同時に取得できるHTTP/2（h2が必要。ない場合はHTTP/1.1）
+"""
+
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.retry import Retry
+
+from config.settings import (
+    DNS_CACHE_TTL_SECONDS,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_DRAIN_MAX_BYTES,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_HOSTS,
+    HTTP_RETRY_STATUSES,
+    HTTP_TRANSPORT,
+    MAX_CONNECTIONS_PER_HOST,
+    REQUEST_TIMEOUT,
+)
+from services.extractor import CHUNK_SIZE
+from utils.deadline import Deadline
+from utils.dns_cache import DNSCache
+from utils.logger import logger
+
+# User-Agentを設定してブロックを回避
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# リトライしてよい冪等なメソッド
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+class Transport(ABC):
+    """記事ページを取得する通信の基底クラスです.
+
+    実行ごとに次の件数を集計します.
+
+    - requests: 送信したリクエスト数（リトライを含む）
+    - connections: 新しく開いた接続の数
+    - reused: 既存の接続を使い回したリクエスト数
+    - retries: 接続エラーや429/5xx応答によるリトライの回数
+
+    リトライするのは接続の確立に失敗した場合と429/5xx応答だけで、応答の読み込み中の
+    タイムアウトはリトライしません. 実行期限までに待機ともう1回分のタイムアウトが
+    収まらない場合は、待機せずにリトライを打ち切ります.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        dns_cache: Optional[DNSCache] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """通信を初期化します.
+
+        Args:
+            max_retries: 最大リトライ回数
+            backoff_factor: リトライの待機時間の係数
+            dns_cache: 接続時の名前解決に使用するキャッシュ。Noneの場合は使用しない
+            deadline: 実行期限。Noneの場合は無期限
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.dns_cache = dns_cache
+        self.deadline = deadline or Deadline()
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = REQUEST_TIMEOUT
+    ) -> Any:
+        """URLをストリーミングで取得します.
+
+        with文で使用し、ブロックを抜けた時点で接続をプールに返却します.
+
+        Args:
+            url: 取得するURL
+            headers: 追加のリクエストヘッダー
+            timeout: タイムアウト（秒）
+
+        Returns:
+            Any: status_code、headers、encoding、iter_content、raise_for_statusを持つレスポンス
+        """
+
+    @abstractmethod
+    def redirect_location(self, url: str, timeout: float = REQUEST_TIMEOUT) -> str:
+        """リダイレクトを辿らずにURLを取得し、リダイレクト先を返します.
+
+        Args:
+            url: 取得するURL
+            timeout: タイムアウト（秒）
+
+        Returns:
+            str: リダイレクト先の絶対URL。リダイレクトでない場合は空文字列
+        """
+
+    def _can_retry(self, delay: float, timeout: float) -> bool:
+        """実行期限までに、待機してからもう1回リクエストできるかどうかを返します.
+
+        Args:
+            delay: リトライまでの待機時間（秒）
+            timeout: 1回のリクエストのタイムアウト（秒）
+
+        Returns:
+            bool: 待機とタイムアウトが実行期限内に収まる場合True
+        """
+        remaining = self.deadline.remaining()
+        return remaining is None or remaining >= delay + timeout
+
+    def _record(self, event: str, count: int = 1) -> None:
+        """通信の結果を集計します.
+
+        Args:
+            event: 集計する項目
+            count: 加算する件数
+        """
+        with self._lock:
+            self.counts[event] += count
+
+    def stats(self) -> Dict[str, int]:
+        """集計した件数を返します.
+
+        Returns:
+            Dict[str, int]: リクエスト数、新規接続数、再利用数、リトライ回数
+        """
+        with self._lock:
+            requests_sent = self.counts["requests"]
+            connections = self.counts["connections"]
+            return {
+                "requests": requests_sent,
+                "connections": connections,
+                "reused": max(0, requests_sent - connections),
+                "retries": self.counts["retries"],
+            }
+
+    def format_stats(self) -> str:
+        """集計結果を表示用の文字列にします.
+
+        Returns:
+            str: 集計結果
+        """
+        stats = self.stats()
+        reuse_rate = stats["reused"] / stats["requests"] if stats["requests"] else 0.0
+        text = (
+            f"リクエスト {stats['requests']}件, 新規接続 {stats['connections']}件 "
+            f"(再利用率 {reuse_rate:.0%}), リトライ {stats['retries']}件"
+        )
+        if self.dns_cache is not None:
+            dns = self.dns_cache.stats()
+            text += f", 名前解決 {dns['miss']}件 (キャッシュ {dns['hit']}件)"
+        return text
+
+    def close(self) -> None:
+        """保持している接続を閉じます."""
+
+
+class _DeadlineRetry(Retry):
+    """通信の実行期限を超える場合にリトライを打ち切るurllib3のRetryです."""
+
+    transport: Optional["RequestsTransport"] = None
+
+    def new(self, **kwargs: Any) -> "_DeadlineRetry":
+        """リトライの状態を引き継いだインスタンスを返します.
+
+        Args:
+            **kwargs: 変更するRetryの引数
+
+        Returns:
+            _DeadlineRetry: 生成されたインスタンス
+        """
+        retry = super().new(**kwargs)
+        retry.transport = self.transport
+        return retry
+
+    def is_exhausted(self) -> bool:
+        """リトライ回数を使い切ったか、実行期限までにリトライできない場合にTrueを返します.
+
+        Returns:
+            bool: リトライしない場合True
+        """
+        if super().is_exhausted():
+            return True
+        if self.transport is None or not self.history:
+            return False
+        return not self.transport._can_retry(self.get_backoff_time(), self.transport._timeout())
+
+
+class _ResolvingConnection:
+    """DNSCacheで名前解決してから接続するurllib3の接続のミックスインです.
+
+    socket.getaddrinfoを置き換えずに、この通信の接続だけでキャッシュを使用します.
+    接続先には解決したIPアドレスを順に試し、TLSのSNIや証明書の検証にはホスト名を使用します.
+    """
+
+    dns_cache: DNSCache
+    _dns_host: str
+    port: int
+
+    def _new_conn(self) -> Any:
+        """キャッシュで解決したIPアドレスに接続します.
+
+        Returns:
+            Any: 接続したソケット
+
+        Raises:
+            NewConnectionError: どのIPアドレスにも接続できなかった場合
+        """
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.addresses(host, self.port, allowed_gai_family())
+        except OSError:
+            return super()._new_conn()  # type: ignore[misc]  # 名前解決の失敗はurllib3の例外にする
+        error: Optional[NewConnectionError] = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                return super()._new_conn()  # type: ignore[misc]
+            except NewConnectionError as exc:
+                error = exc
+            finally:
+                self._dns_host = host
+        if error is not None:
+            raise error
+        return super()._new_conn()  # type: ignore[misc]
+
+
+def _resolving_pool_classes(dns_cache: DNSCache) -> Dict[str, type]:
+    """DNSCacheで名前解決する接続を使用するurllib3の接続プールのクラスを返します.
+
+    Args:
+        dns_cache: 名前解決のキャッシュ
+
+    Returns:
+        Dict[str, type]: スキームごとの接続プールのクラス
+    """
+    pool_classes: Dict[str, type] = {}
+    for scheme, pool_class, connection_class in (
+        ("http", HTTPConnectionPool, HTTPConnection),
+        ("https", HTTPSConnectionPool, HTTPSConnection),
+    ):
+        connection_cls = type(
+            connection_class.__name__,
+            (_ResolvingConnection, connection_class),
+            {"dns_cache": dns_cache},
+        )
+        pool_classes[scheme] = type(
+            pool_class.__name__, (pool_class,), {"ConnectionCls": connection_cls}
+        )
+    return pool_classes
+
+
+class _CountingAdapter(HTTPAdapter):
+    """使用した接続プールを記録し、接続の再利用状況を集計できるようにするアダプターです."""
+
+    def __init__(self, dns_cache: Optional[DNSCache] = None, **kwargs: Any) -> None:
+        """アダプターを初期化します.
+
+        Args:
+            dns_cache: 接続時の名前解決に使用するキャッシュ。Noneの場合は使用しない
+            **kwargs: HTTPAdapterの引数
+        """
+        self.dns_cache = dns_cache
+        self.connection_pools: Dict[int, Any] = {}
+        self._pools_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """接続プールの管理を初期化し、DNSCacheを使用する接続プールを設定します.
+
+        Args:
+            *args: HTTPAdapter.init_poolmanagerの引数
+            **kwargs: HTTPAdapter.init_poolmanagerのキーワード引数
+        """
+        super().init_poolmanager(*args, **kwargs)
+        if self.dns_cache is not None:
+            self.poolmanager.pool_classes_by_scheme = _resolving_pool_classes(self.dns_cache)
+
+    def get_connection(self, url: str, proxies: Optional[Dict[str, str]] = None) -> Any:
+        """URLに対応する接続プールを返し、使用した接続プールとして記録します.
+
+        Args:
+            url: リクエストのURL
+            proxies: プロキシの設定
+
+        Returns:
+            Any: urllib3の接続プール
+        """
+        pool = super().get_connection(url, proxies)
+        with self._pools_lock:
+            self.connection_pools.setdefault(id(pool), pool)
+        return pool
+
+    def pool_counts(self) -> Dict[str, int]:
+        """接続プールごとのリクエスト数と接続数を合計します.
+
+        Returns:
+            Dict[str, int]: requestsとconnectionsの合計
+        """
+        with self._pools_lock:
+            pools = list(self.connection_pools.values())
+        return {
+            "requests": sum(pool.num_requests for pool in pools),
+            "connections": sum(pool.num_connections for pool in pools),
+        }
+
+
+class RequestsTransport(Transport):
+    """ホストごとの接続プールとリトライを設定したrequests.Sessionによる通信です."""
+
+    def __init__(
+        self,
+        pool_hosts: int = HTTP_POOL_HOSTS,
+        pool_size: int = MAX_CONNECTIONS_PER_HOST,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        drain_max_bytes: int = HTTP_DRAIN_MAX_BYTES,
+        dns_cache: Optional[DNSCache] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """通信を初期化します.
+
+        Args:
+            pool_hosts: 接続を保持するホストの数
+            pool_size: ホストごとに保持する接続の数
+            max_retries: 最大リトライ回数
+            backoff_factor: リトライの待機時間の係数
+            drain_max_bytes: 読み込みを打ち切った後、接続を再利用するために読み切る最大バイト数
+            dns_cache: 接続時の名前解決に使用するキャッシュ。Noneの場合は使用しない
+            deadline: 実行期限。Noneの場合は無期限
+        """
+        super().__init__(max_retries, backoff_factor, dns_cache, deadline)
+        self.drain_max_bytes = drain_max_bytes
+        self._local = threading.local()  # リクエスト中のタイムアウト（スレッドごと）
+        retry = _DeadlineRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,  # 応答の読み込み中のタイムアウトやエラーはリトライしない
+            status=max_retries,
+            other=0,
+            backoff_factor=backoff_factor,
+            status_forcelist=HTTP_RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            # Retry-Afterに従うと実行期限を超えて待機しかねないため、待機時間は係数で決める
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        retry.transport = self
+        self.adapter = _CountingAdapter(
+            dns_cache=dns_cache,
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+    @contextmanager
+    def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = REQUEST_TIMEOUT
+    ) -> Iterator[requests.Response]:
+        """URLをストリーミングで取得します.
+
+        Args:
+            url: 取得するURL
+            headers: 追加のリクエストヘッダー
+            timeout: タイムアウト（秒）
+
+        Yields:
+            requests.Response: レスポンス。ブロックを抜けた時点で接続をプールに返却する
+        """
+        self._local.timeout = timeout
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            retries = getattr(response.raw, "retries", None)
+            if retries is not None and retries.history:
+                self._record("retries", len(retries.history))
+            yield response
+            self._drain(response)
+
+    def redirect_location(self, url: str, timeout: float = REQUEST_TIMEOUT) -> str:
+        """リダイレクトを辿らずにURLを取得し、リダイレクト先を返します.
+
+        Args:
+            url: 取得するURL
+            timeout: タイムアウト（秒）
+
+        Returns:
+            str: リダイレクト先の絶対URL。リダイレクトでない場合は空文字列
+        """
+        self._local.timeout = timeout
+        with self.session.get(url, timeout=timeout, stream=True, allow_redirects=False) as response:
+            location = response.headers.get("Location") if response.is_redirect else None
+            self._drain(response)
+        return urljoin(url, location) if location else ""
+
+    def _timeout(self) -> float:
+        """このスレッドで実行中のリクエストのタイムアウトを返します.
+
+        Returns:
+            float: タイムアウト（秒）
+        """
+        return getattr(self._local, "timeout", REQUEST_TIMEOUT)
+
+    def _drain(self, response: requests.Response) -> None:
+        """読み込みを打ち切ったレスポンスの残りが小さい場合は読み切ります.
+
+        読み残しのある接続は閉じられてしまうため、残りを読み切って接続プールに返却します.
+
+        Args:
+            response: 読み込み済みのレスポンス
+        """
+        remaining = getattr(response.raw, "length_remaining", None)
+        if not remaining or remaining > self.drain_max_bytes:
+            return
+        try:
+            while response.raw.read(CHUNK_SIZE, decode_content=False):
+                pass
+        except Exception:
+            pass  # 読み切れない場合は従来どおり接続を閉じる
+
+    def stats(self) -> Dict[str, int]:
+        """集計した件数を返します.
+
+        リクエスト数と接続数は、urllib3の接続プールが数えた値を使用します.
+
+        Returns:
+            Dict[str, int]: リクエスト数、新規接続数、再利用数、リトライ回数
+        """
+        pool_counts = self.adapter.pool_counts()
+        with self._lock:
+            self.counts["requests"] = pool_counts["requests"]
+            self.counts["connections"] = pool_counts["connections"]
+        return super().stats()
+
+    def close(self) -> None:
+        """セッションの接続を閉じます."""
+        self.session.close()
+
+
+class _HTTPXResponse:
+    """httpxのレスポンスをrequests.Responseと同じ名前で参照できるようにするラッパーです."""
+
+    def __init__(self, response: Any) -> None:
+        """ラッパーを初期化します.
+
+        Args:
+            response: httpx.Response
+        """
+        self._response = response
+
+    @property
+    def status_code(self) -> int:
+        """ステータスコードを返します.
+
+        Returns:
+            int: ステータスコード
+        """
+        return int(self._response.status_code)
+
+    @property
+    def headers(self) -> Any:
+        """レスポンスヘッダーを返します.
+
+        Returns:
+            Any: 大文字と小文字を区別しないhttpx.Headers
+        """
+        return self._response.headers
+
+    @property
+    def encoding(self) -> Optional[str]:
+        """Content-Typeヘッダーなどから求めた文字コードを返します.
+
+        Returns:
+            Optional[str]: 文字コード
+        """
+        return self._response.encoding
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        """本文を指定したサイズずつ返します.
+
+        Args:
+            chunk_size: 1回に返すバイト数
+
+        Returns:
+            Iterator[bytes]: 本文のチャンク
+        """
+        return self._response.iter_bytes(chunk_size)
+
+    def raise_for_status(self) -> None:
+        """ステータスコードが4xx/5xxの場合に例外を送出します.
+
+        Raises:
+            httpx.HTTPStatusError: ステータスコードが4xx/5xxの場合
+        """
+        self._response.raise_for_status()
+
+
+class _ResolvingNetworkBackend:
+    """DNSCacheで名前解決してから接続するhttpcoreのネットワークバックエンドです.
+
+    TLSのSNIや証明書の検証には、httpcoreが接続先のホスト名を使用します.
+    """
+
+    def __init__(self, backend: Any, dns_cache: DNSCache) -> None:
+        """バックエンドを初期化します.
+
+        Args:
+            backend: 接続に使用するhttpcoreのネットワークバックエンド
+            dns_cache: 名前解決のキャッシュ
+        """
+        self.backend = backend
+        self.dns_cache = dns_cache
+
+    def connect_tcp(self, host: str, port: int, **kwargs: Any) -> Any:
+        """キャッシュで解決したIPアドレスに順に接続します.
+
+        Args:
+            host: ホスト名
+            port: ポート番号
+            **kwargs: timeout、local_address、socket_options
+
+        Returns:
+            Any: httpcoreのネットワークストリーム
+
+        Raises:
+            httpcore.ConnectError: 名前解決に失敗した場合か、どのIPアドレスにも接続できなかった場合
+        """
+        import httpcore
+
+        try:
+            addresses = self.dns_cache.addresses(host, port)
+        except OSError as exc:
+            raise httpcore.ConnectError(str(exc)) from exc
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return self.backend.connect_tcp(address, port, **kwargs)
+            except httpcore.ConnectError as exc:
+                error = exc
+        raise error or httpcore.ConnectError(f"{host}のアドレスが見つかりません")
+
+    def connect_unix_socket(self, path: str, **kwargs: Any) -> Any:
+        """Unixドメインソケットに接続します.
+
+        Args:
+            path: ソケットのパス
+            **kwargs: timeout、socket_options
+
+        Returns:
+            Any: httpcoreのネットワークストリーム
+        """
+        return self.backend.connect_unix_socket(path, **kwargs)
+
+    def sleep(self, seconds: float) -> None:
+        """指定した秒数待機します.
+
+        Args:
+            seconds: 待機時間（秒）
+        """
+        self.backend.sleep(seconds)
+
+
+class HTTPXTransport(Transport):
+    """httpxによる通信です。h2がインストールされている場合はHTTP/2で接続します.
+
+    HTTP/2では同じホストへの複数のリクエストを1つの接続に多重化するため、
+    本文の読み込みを途中で打ち切っても接続を閉じる必要がありません.
+    リトライの待機時間を実行期限と比べるため、接続エラーと429/5xx応答のリトライはこのクラスで行います.
+    """
+
+    def __init__(
+        self,
+        pool_hosts: int = HTTP_POOL_HOSTS,
+        pool_size: int = MAX_CONNECTIONS_PER_HOST,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        drain_max_bytes: int = HTTP_DRAIN_MAX_BYTES,
+        dns_cache: Optional[DNSCache] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """通信を初期化します.
+
+        Args:
+            pool_hosts: 接続を保持するホストの数
+            pool_size: ホストごとに保持する接続の数
+            max_retries: 最大リトライ回数
+            backoff_factor: リトライの待機時間の係数
+            drain_max_bytes: HTTP/1.1で読み込みを打ち切った後、接続を再利用するために読み切る最大バイト数
+            dns_cache: 接続時の名前解決に使用するキャッシュ。Noneの場合は使用しない
+            deadline: 実行期限。Noneの場合は無期限
+        """
+        import httpx
+
+        super().__init__(max_retries, backoff_factor, dns_cache, deadline)
+        self._connect_errors = (httpx.ConnectError, httpx.ConnectTimeout)
+        self.drain_max_bytes = drain_max_bytes
+        try:
+            import h2  # noqa: F401
+
+            self.http2 = True
+        except ImportError:
+            logger.warning("h2がインストールされていないため、HTTP/1.1で接続します")
+            self.http2 = False
+        limits = httpx.Limits(
+            max_connections=pool_hosts * pool_size,
+            max_keepalive_connections=pool_hosts * pool_size,
+        )
+        transport = httpx.HTTPTransport(http2=self.http2, limits=limits)
+        if dns_cache is not None:
+            # httpx.HTTPTransportは接続処理を指定できないため、httpcoreの接続プールに設定する
+            pool = transport._pool
+            pool._network_backend = _ResolvingNetworkBackend(pool._network_backend, dns_cache)
+        self.client = httpx.Client(
+            headers=DEFAULT_HEADERS,
+            http2=self.http2,
+            follow_redirects=True,
+            transport=transport,
+        )
+        # 接続ごとのストリームを記録し、初めて見たストリームを新規接続として数える
+        self._streams: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    def _record_connection(self, response: Any) -> None:
+        """レスポンスを受信した接続が新しい接続かどうかを集計します.
+
+        Args:
+            response: httpx.Response
+        """
+        stream = response.extensions.get("network_stream")
+        with self._lock:
+            self.counts["requests"] += 1
+            if stream is None:
+                self.counts["connections"] += 1
+            elif stream not in self._streams:
+                self._streams.add(stream)
+                self.counts["connections"] += 1
+
+    @contextmanager
+    def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = REQUEST_TIMEOUT
+    ) -> Iterator[_HTTPXResponse]:
+        """URLをストリーミングで取得します.
+
+        Args:
+            url: 取得するURL
+            headers: 追加のリクエストヘッダー
+            timeout: タイムアウト（秒）
+
+        Yields:
+            _HTTPXResponse: レスポンス。ブロックを抜けた時点で接続をプールに返却する
+        """
+        response = self._send(url, timeout, headers=headers, retry_statuses=True)
+        try:
+            yield _HTTPXResponse(response)
+            self._drain(response)
+        finally:
+            response.close()
+
+    def _send(
+        self,
+        url: str,
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = True,
+        retry_statuses: bool = False,
+    ) -> Any:
+        """リクエストを送り、本文を読み込む前のレスポンスを返します.
+
+        接続の確立に失敗した場合と、retry_statusesがTrueで429/5xx応答の場合にリトライします.
+        呼び出し側の処理中の例外をリトライと取り違えないよう、リトライは応答を受け取るまでに限ります.
+
+        Args:
+            url: 取得するURL
+            timeout: 1回のリクエストのタイムアウト（秒）
+            headers: 追加のリクエストヘッダー
+            follow_redirects: リダイレクトを辿るかどうか
+            retry_statuses: 429/5xx応答をリトライするかどうか
+
+        Returns:
+            Any: ストリーミングのhttpx.Response（呼び出し側で閉じる）
+        """
+        request = self.client.build_request("GET", url, headers=headers, timeout=timeout)
+        attempt = 0
+        while True:
+            try:
+                response = self.client.send(request, stream=True, follow_redirects=follow_redirects)
+            except self._connect_errors:
+                delay = self._retry_delay(attempt, timeout)
+                if delay is None:
+                    raise
+            else:
+                self._record_connection(response)
+                if not retry_statuses or response.status_code not in HTTP_RETRY_STATUSES:
+                    return response
+                delay = self._retry_delay(attempt, timeout)
+                if delay is None:
+                    return response
+                self._drain(response)
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, attempt: int, timeout: float) -> Optional[float]:
+        """リトライまでの待機時間を返し、リトライの回数を数えます.
+
+        Args:
+            attempt: これまでのリトライ回数
+            timeout: 1回のリクエストのタイムアウト（秒）
+
+        Returns:
+            Optional[float]: 待機時間（秒）。回数の上限や実行期限に達した場合はNone
+        """
+        delay = self.backoff_factor * (2**attempt)
+        if attempt >= self.max_retries or not self._can_retry(delay, timeout):
+            return None
+        self._record("retries")
+        return delay
+
+    def _drain(self, response: Any) -> None:
+        """HTTP/1.1で読み込みを打ち切ったレスポンスの残りが小さい場合は読み切ります.
+
+        Args:
+            response: 読み込み済みのhttpx.Response
+        """
+        if response.http_version != "HTTP/1.1" or response.is_closed:
+            return
+        try:
+            remaining = int(response.headers["Content-Length"]) - response.num_bytes_downloaded
+        except (KeyError, ValueError):
+            return
+        if remaining > self.drain_max_bytes:
+            return
+        try:
+            for _ in response.stream:
+                pass
+        except Exception:
+            pass  # 読み切れない場合は従来どおり接続を閉じる
+
+    def redirect_location(self, url: str, timeout: float = REQUEST_TIMEOUT) -> str:
+        """リダイレクトを辿らずにURLを取得し、リダイレクト先を返します.
+
+        Args:
+            url: 取得するURL
+            timeout: タイムアウト（秒）
+
+        Returns:
+            str: リダイレクト先の絶対URL。リダイレクトでない場合は空文字列
+        """
+        response = self._send(url, timeout, follow_redirects=False)
+        try:
+            location = response.headers.get("Location") if response.has_redirect_location else None
+            self._drain(response)
+        finally:
+            response.close()
+        return urljoin(url, location) if location else ""
+
+    def close(self) -> None:
+        """クライアントの接続を閉じます."""
+        self.client.close()
+
+
+def create_transport(kind: str = HTTP_TRANSPORT, deadline: Optional[Deadline] = None) -> Transport:
+    """設定に従って通信を生成します.
+
+    DNS_CACHE_TTL_SECONDSが正の場合は、この通信の接続だけで名前解決の結果を保持します.
+
+    Args:
+        kind: "requests" または "httpx"
+        deadline: 実行期限。リトライを期限内に収めるために使用する。Noneの場合は無期限
+
+    Returns:
+        Transport: 記事ページの取得に使用する通信
+    """
+    dns_cache = DNSCache(DNS_CACHE_TTL_SECONDS) if DNS_CACHE_TTL_SECONDS > 0 else None
+    if kind == "httpx":
+        try:
+            return HTTPXTransport(dns_cache=dns_cache, deadline=deadline)
+        except ImportError:
+            logger.warning("httpxがインストールされていないため、requestsで接続します")
+    return RequestsTransport(dns_cache=dns_cache, deadline=deadline)
@@ -0,0 +1,190 @@
+"""Google Newsのリダイレクトリンクを記事の正規URLに解決するモジュール.
+
+GNewsが返すリンクはnews.google.comのリダイレクトURLで、同じ記事でもトークンが
+異なる場合があります. リダイレクト先と記事ページの<link rel="canonical">を
+実行をまたいで保存し、重複の判定・本文の取得・Notionへの保存を正規URLで行います.
+"""
+
+from typing import List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from config.settings import (
+    REDIRECT_CACHE_MAX_ENTRIES,
+    REDIRECT_CACHE_TTL_SECONDS,
+    REDIRECT_MAX_CONNECTIONS,
+)
+from services.fetcher import ArticleFetcher
+from services.transport import Transport
+from utils.cache import REDIRECT_NAMESPACE, Cache, canonicalize_url, open_cache
+from utils.deadline import Deadline
+from utils.metrics import metrics
+
+# リダイレクトURLを返すホスト
+REDIRECT_HOSTS = frozenset({"news.google.com"})
+
+# リダイレクトではなかったURLに保存する値（次回から解決を試みない）
+UNRESOLVED = ""
+
+# 保存済みの対応を辿る最大回数（リダイレクト先 → rel="canonical"）
+MAX_HOPS = 3
+
+
+def _site(url: str) -> str:
+    """比較用に、URLのホストから先頭のwww.やm.を除いたものを返します.
+
+    Args:
+        url: URL
+
+    Returns:
+        str: ホスト名
+    """
+    host = urlsplit(url).netloc.lower()
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            return host[len(prefix) :]
+    return host
+
+
+class URLResolver:
+    """リダイレクトURLを記事の正規URLに解決するクラスです.
+
+    保存済みでないリダイレクトURLは、リダイレクトを辿らずに取得してLocationヘッダーを
+    読み取ります. 記事ページ自体は取得しないため、通信は記事ごとに1往復で済み、
+    次回以降は保存済みの正規URLから記事ページを直接取得します.
+
+    解決のリクエストはすべて同じホスト（news.google.com）に送るため、記事ページの
+    MAX_CONNECTIONS_PER_HOSTとは別にREDIRECT_MAX_CONNECTIONSで同時接続数を決めます.
+    大きくすると解決は速くなりますが、1つのホストへの負荷が増え、レート制限（429）を
+    受けやすくなります.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        cache: Optional[Cache] = None,
+        redirect_hosts: Sequence[str] = REDIRECT_HOSTS,
+        max_connections: int = REDIRECT_MAX_CONNECTIONS,
+    ) -> None:
+        """解決クラスを初期化します.
+
+        Args:
+            transport: リダイレクト先の取得に使用する通信
+            cache: リダイレクトURLと正規URLの対応の保存先。Noneの場合は設定に従って生成
+            redirect_hosts: リダイレクトURLを返すホスト
+            max_connections: リダイレクトURLのホストへの同時接続数の上限
+        """
+        self.transport = transport
+        self.cache = cache or open_cache(
+            REDIRECT_NAMESPACE,
+            ttl=REDIRECT_CACHE_TTL_SECONDS,
+            max_entries=REDIRECT_CACHE_MAX_ENTRIES,
+        )
+        self.redirect_hosts = frozenset(host.lower() for host in redirect_hosts)
+        self.fetcher = ArticleFetcher(
+            self._resolve_one, max_workers=max_connections, max_per_host=max_connections
+        )
+
+    def is_redirect(self, url: str) -> bool:
+        """リダイレクトURLかどうかを返します.
+
+        Args:
+            url: URL
+
+        Returns:
+            bool: リダイレクトURLを返すホストのURLの場合True
+        """
+        return urlsplit(url).netloc.lower() in self.redirect_hosts
+
+    def _resolve_one(self, url: str, timeout: float) -> Optional[str]:
+        """1件のリダイレクトURLのリダイレクト先を取得します.
+
+        Args:
+            url: リダイレクトURL
+            timeout: タイムアウト（秒）
+
+        Returns:
+            Optional[str]: リダイレクト先。リダイレクトでない場合は空文字列、取得失敗時はNone
+        """
+        try:
+            return self.transport.redirect_location(url, timeout)
+        except Exception as e:
+            print(f"リダイレクト先を取得できませんでした: {url} - {str(e)}")
+            return None
+
+    def lookup(self, url: str) -> Optional[str]:
+        """保存済みの対応を辿って正規URLを返します.
+
+        Args:
+            url: リダイレクトURLまたは記事のURL
+
+        Returns:
+            Optional[str]: 正規URL。対応が保存されていない場合はNone
+        """
+        resolved: Optional[str] = None
+        for _ in range(MAX_HOPS):
+            target = self.cache.get(canonicalize_url(resolved or url))
+            if not target or target == resolved:
+                break
+            resolved = target
+        return resolved
+
+    def learn(self, url: str, canonical: str) -> None:
+        """記事ページの<link rel="canonical">から得た正規URLを保存します.
+
+        トップページや別のサイトを指す誤った指定で記事どうしが重複と判定されないよう、
+        同じサイト内の記事ページを指す場合だけ保存します.
+
+        Args:
+            url: 取得した記事ページのURL
+            canonical: rel="canonical"のURL（絶対URL）
+        """
+        parts = urlsplit(canonical)
+        if (
+            parts.scheme not in ("http", "https")
+            or parts.path in ("", "/")
+            or self.is_redirect(canonical)
+            or _site(canonical) != _site(url)
+            or canonicalize_url(canonical) == canonicalize_url(url)
+        ):
+            return
+        self.cache.set(canonicalize_url(url), canonical)
+
+    def resolve_all(self, urls: Sequence[str], deadline: Optional[Deadline] = None) -> List[str]:
+        """複数のURLを並列に正規URLへ解決します.
+
+        Args:
+            urls: GNewsが返した記事のURL
+            deadline: 全体の実行期限。Noneの場合は無期限
+
+        Returns:
+            List[str]: urlsと同じ順序の正規URL。解決できなかったURLは元のURL
+        """
+        results = list(urls)
+        missing: List[int] = []
+        for i, url in enumerate(urls):
+            key = canonicalize_url(url)
+            target = self.cache.get(key)
+            if target:
+                results[i] = self.lookup(url) or url
+                metrics.count("url_resolution", "cached")
+            elif target is None and self.is_redirect(url):
+                missing.append(i)
+            elif self.is_redirect(url):
+                metrics.count("url_resolution", "unresolved")
+
+        locations = self.fetcher.fetch_all([urls[i] for i in missing], deadline=deadline)
+        for i, location in zip(missing, locations):
+            if location is None:  # 取得に失敗した場合は保存せず、次回に再度解決する
+                metrics.count("url_resolution", "failed")
+                continue
+            self.cache.set(canonicalize_url(urls[i]), location or UNRESOLVED)
+            if location:
+                results[i] = self.lookup(location) or location
+                metrics.count("url_resolution", "resolved")
+            else:
+                metrics.count("url_resolution", "unresolved")
+        return results
+
+    def close(self) -> None:
+        """リダイレクト先の取得に使用するスレッドプールを終了します."""
+        self.fetcher.close()
@@ -0,0 +1,316 @@
+"""実行をまたいで使用するキャッシュ機能を提供するモジュール."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config.settings import (
+    CACHE_ENABLED,
+    CACHE_EVICT_RATIO,
+    CACHE_MAX_ENTRIES,
+    CACHE_PATH,
+    CACHE_TOUCH_INTERVAL_SECONDS,
+    CACHE_TTL_SECONDS,
+)
+
+# 正規化の際に除去するトラッキング用のクエリパラメータ
+TRACKING_PARAMS = {"fbclid", "gclid", "ocid"}
+
+# キャッシュの名前空間
+CONTENT_NAMESPACE = "content"  # 正規化URL → 抽出済みの記事本文
+SEEN_URLS_NAMESPACE = "seen_urls"  # Notionに保存済みの正規化URL
+HTTP_NAMESPACE = "http"  # 正規化URL → 記事ページの検証子と抽出済みの本文
+WATERMARK_NAMESPACE = "watermark"  # 検索キーワード → 処理済みの最新の公開日時とURL
+QUERY_YIELD_NAMESPACE = "query_yield"  # 検索キーワード → 新しい記事の件数などの実績
+REDIRECT_NAMESPACE = "redirect"  # 正規化したリダイレクトURL → 記事の正規URL
+HOST_HEALTH_NAMESPACE = "host_health"  # 配信元のホスト → 応答時間と障害の記録
+EXTRACTION_PROFILE_NAMESPACE = "extraction_profile"  # 配信元のホスト → 本文の抽出方法
+
+
+def canonicalize_url(url: str) -> str:
+    """キャッシュのキーとして使用できるようにURLを正規化します.
+
+    スキームとホストを小文字にし、フラグメントとトラッキング用のパラメータを除去して、
+    残りのクエリパラメータを並べ替えます.
+
+    Args:
+        url: 正規化するURL
+
+    Returns:
+        str: 正規化されたURL
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith("utm_") and key not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class Cache(ABC):
+    """TTLと件数上限を持つキャッシュの基底クラスです.
+
+    値はJSONに変換できるオブジェクトである必要があります.
+    """
+
+    def __init__(
+        self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES
+    ) -> None:
+        """キャッシュを初期化します.
+
+        Args:
+            ttl: エントリの有効期間（秒）
+            max_entries: 保持する最大件数。超えた場合は最も古く参照されたものから削除
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """キーに対応する値を返します.
+
+        Args:
+            key: キャッシュのキー
+
+        Returns:
+            Optional[Any]: 有効期間内の値。存在しない場合はNone
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """値を保存します.
+
+        Args:
+            key: キャッシュのキー
+            value: 保存する値
+        """
+
+    def __contains__(self, key: str) -> bool:
+        """キーに対応する有効な値が存在するかどうかを返します.
+
+        Args:
+            key: キャッシュのキー
+
+        Returns:
+            bool: 存在する場合True
+        """
+        return self.get(key) is not None
+
+
+class MemoryCache(Cache):
+    """プロセス内のメモリに保持するキャッシュです."""
+
+    def __init__(
+        self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES
+    ) -> None:
+        """キャッシュを初期化します.
+
+        Args:
+            ttl: エントリの有効期間（秒）
+            max_entries: 保持する最大件数
+        """
+        super().__init__(ttl, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """キーに対応する値を返します.
+
+        Args:
+            key: キャッシュのキー
+
+        Returns:
+            Optional[Any]: 有効期間内の値。存在しない場合はNone
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """値を保存します.
+
+        Args:
+            key: キャッシュのキー
+            value: 保存する値
+        """
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCache(Cache):
+    """SQLiteファイルに保存するキャッシュです.
+
+    Lambdaでは/tmpに配置することで、ウォームスタート時の実行間で共有できます.
+    1つのファイルを名前空間ごとに分けて複数の用途で共有します.
+    読み込みのたびに書き込まないよう、参照日時はtouch_interval秒以上経過した場合だけ更新します.
+    件数上限を超えた場合は、次の削除までの余裕としてmax_entriesのCACHE_EVICT_RATIOの割合だけ
+    多めに、最も古く参照されたものから削除します.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        namespace: str = "default",
+        ttl: float = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        touch_interval: float = CACHE_TOUCH_INTERVAL_SECONDS,
+    ) -> None:
+        """キャッシュを初期化します.
+
+        Args:
+            path: SQLiteファイルのパス
+            namespace: 名前空間（用途ごとに分ける）
+            ttl: エントリの有効期間（秒）
+            max_entries: 名前空間ごとに保持する最大件数
+            touch_interval: 参照日時を更新する最短の間隔（秒）
+        """
+        super().__init__(ttl, max_entries)
+        self.namespace = namespace
+        self.touch_interval = touch_interval
+        self._evict_batch = int(max_entries * CACHE_EVICT_RATIO)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (namespace, accessed_at)"
+            )
+            # 期限切れのエントリを削除
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND stored_at < ?",
+                (namespace, time.time() - ttl),
+            )
+            self._count = self._count_entries()
+            if self._count > self.max_entries:
+                self._evict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """キーに対応する値を返します.
+
+        Args:
+            key: キャッシュのキー
+
+        Returns:
+            Optional[Any]: 有効期間内の値。存在しない場合はNone
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, accessed_at FROM cache"
+                " WHERE namespace = ? AND key = ? AND stored_at >= ?",
+                (self.namespace, key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            value, accessed_at = row
+            if now - accessed_at >= self.touch_interval:
+                self._conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key),
+                )
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """値を保存し、件数上限を超えた分を削除します.
+
+        Args:
+            key: キャッシュのキー
+            value: 保存する値（JSONに変換できること）
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            exists = self._conn.execute(
+                "SELECT 1 FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            if exists is None:
+                self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+
+    def _count_entries(self) -> int:
+        """名前空間のエントリ数を数えます. ロックを取得した状態で呼び出します.
+
+        Returns:
+            int: エントリ数
+        """
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return int(row[0])
+
+    def _evict(self) -> None:
+        """最も古く参照されたエントリから、上限より余裕の分だけ少なくなるまで削除します.
+
+        ロックを取得した状態で呼び出します. 同じ名前空間を別のインスタンスからも
+        更新している場合に備え、削除後に件数を数え直します.
+        """
+        self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache WHERE namespace = ?"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries - self._evict_batch),
+        )
+        self._count = self._count_entries()
+
+    def close(self) -> None:
+        """データベース接続を閉じます."""
+        with self._lock:
+            self._conn.close()
+
+
+def open_cache(
+    namespace: str, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES
+) -> Cache:
+    """設定に応じたキャッシュを生成します.
+
+    永続キャッシュが有効な場合はSQLiteファイル、無効な場合やファイルを開けない場合は
+    メモリ上のキャッシュを返します.
+
+    Args:
+        namespace: 名前空間（用途ごとに分ける）
+        ttl: エントリの有効期間（秒）
+        max_entries: 保持する最大件数
+
+    Returns:
+        Cache: 生成されたキャッシュ
+    """
+    if CACHE_ENABLED:
+        try:
+            return SQLiteCache(CACHE_PATH, namespace, ttl, max_entries)
+        except (sqlite3.Error, OSError) as e:
+            print(f"キャッシュファイルを開けませんでした: {CACHE_PATH} - {str(e)}")
+    return MemoryCache(ttl, max_entries)
@@ -0,0 +1,110 @@
+"""実行期限で打ち切った処理を次回の実行で再開するためのチェックポイントを提供するモジュール."""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from config.settings import CHECKPOINT_PATH
+
+
+class Checkpoint(NamedTuple):
+    """未処理のキーワードと未保存の記事です."""
+
+    keywords: List[str]
+    items: List[Dict[str, Any]]
+    saved_at: str
+
+
+class CheckpointStore(ABC):
+    """チェックポイントの保存先の基底クラスです.
+
+    ローカルファイル以外（S3など）に保存する場合は、このクラスを継承して
+    load/save/clearを実装します.
+    """
+
+    @abstractmethod
+    def load(self) -> Optional[Checkpoint]:
+        """保存されているチェックポイントを返します.
+
+        Returns:
+            Optional[Checkpoint]: チェックポイント。保存されていない場合はNone
+        """
+
+    @abstractmethod
+    def save(self, checkpoint: Checkpoint) -> None:
+        """チェックポイントを保存します.
+
+        Args:
+            checkpoint: 保存するチェックポイント
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """保存されているチェックポイントを削除します."""
+
+
+class FileCheckpointStore(CheckpointStore):
+    """JSONファイルに保存するチェックポイントです.
+
+    Lambdaでは/tmpに配置するため、同じ実行環境が再利用された場合に再開できます.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH) -> None:
+        """保存先を初期化します.
+
+        Args:
+            path: JSONファイルのパス
+        """
+        self.path = path
+
+    def load(self) -> Optional[Checkpoint]:
+        """保存されているチェックポイントを返します.
+
+        Returns:
+            Optional[Checkpoint]: チェックポイント。保存されていないか読み込めない場合はNone
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return Checkpoint(data["keywords"], data["items"], data["saved_at"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"チェックポイントを読み込めませんでした: {self.path} - {str(e)}")
+            return None
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        """チェックポイントを保存します（一時ファイル経由で置き換えます）.
+
+        Args:
+            checkpoint: 保存するチェックポイント
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint._asdict(), f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """保存されているチェックポイントを削除します."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def create_checkpoint(keywords: List[str], items: List[Dict[str, Any]]) -> Checkpoint:
+    """現在時刻のチェックポイントを生成します.
+
+    Args:
+        keywords: 未処理のキーワード
+        items: 未保存の記事
+
+    Returns:
+        Checkpoint: 生成されたチェックポイント
+    """
+    return Checkpoint(keywords, items, datetime.now().isoformat())
@@ -0,0 +1,100 @@
+"""実行期限（デッドライン）を管理するモジュール."""
+
+import time
+from typing import Any, Optional
+
+
+class DeadlineExceeded(Exception):
+    """実行期限までに処理を開始できなかったことを表す例外です."""
+
+
+class Deadline:
+    """処理全体の実行期限を表すクラスです.
+
+    Lambdaの残り実行時間などから期限を決め、
+    個々のリクエストのタイムアウトを期限内に収めるために使用します.
+    """
+
+    def __init__(self, expires_at: Optional[float] = None) -> None:
+        """期限を初期化します.
+
+        Args:
+            expires_at: time.monotonic()基準の期限時刻。Noneの場合は無期限
+        """
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """現在から指定秒数後を期限とするインスタンスを返します.
+
+        Args:
+            seconds: 期限までの秒数
+
+        Returns:
+            Deadline: 生成された期限
+        """
+        return cls(time.monotonic() + seconds)
+
+    @classmethod
+    def from_lambda_context(cls, context: Any, margin: float = 0.0) -> "Deadline":
+        """Lambdaのコンテキストから期限を生成します.
+
+        Args:
+            context: Lambda関数のコンテキスト
+            margin: 実際のタイムアウトより手前で打ち切るための余裕（秒）
+
+        Returns:
+            Deadline: 生成された期限。残り時間が取得できない場合は無期限
+        """
+        get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining is None:
+            return cls()
+        return cls.after(get_remaining() / 1000 - margin)
+
+    def before(self, seconds: float) -> "Deadline":
+        """この期限の指定秒数前を期限とするインスタンスを返します.
+
+        後続の処理（Notionへの書き込みなど）の時間を残して、先に打ち切りたい処理に使用します.
+
+        Args:
+            seconds: 繰り上げる秒数
+
+        Returns:
+            Deadline: 生成された期限。この期限が無期限の場合は無期限
+        """
+        if self.expires_at is None:
+            return Deadline()
+        return Deadline(self.expires_at - seconds)
+
+    def remaining(self) -> Optional[float]:
+        """期限までの残り秒数を返します.
+
+        Returns:
+            Optional[float]: 残り秒数（0未満にはならない）。無期限の場合はNone
+        """
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """期限を過ぎているかどうかを返します.
+
+        Returns:
+            bool: 期限切れの場合True
+        """
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def clamp_timeout(self, timeout: float) -> float:
+        """タイムアウト値を期限内に収まるように切り詰めます.
+
+        Args:
+            timeout: 本来のタイムアウト（秒）
+
+        Returns:
+            float: 期限を考慮したタイムアウト（秒）
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return min(timeout, remaining)
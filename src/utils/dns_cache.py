@@ -0,0 +1,103 @@
+"""記事ページの通信で使用する、名前解決の結果を保持するDNSキャッシュを提供するモジュール."""
+
+import socket
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import DNS_CACHE_MAX_ENTRIES
+
+# 名前解決のキー（ホスト名、ポート番号、アドレスファミリー）
+AddressKey = Tuple[str, int, int]
+
+
+class DNSCache:
+    """ホスト名を解決したIPアドレスをTTL付きで保持するキャッシュです.
+
+    socket.getaddrinfoは置き換えず、このキャッシュを渡した通信の接続だけに使用します.
+    保持する件数はmax_entriesまでで、超えた場合は期限切れのもの、最も古く参照されたものの
+    順に削除します. 解決に失敗した結果は保持しません.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = DNS_CACHE_MAX_ENTRIES,
+        resolve: Optional[Callable[..., List[Any]]] = None,
+    ) -> None:
+        """キャッシュを初期化します.
+
+        Args:
+            ttl: 解決結果の有効期間（秒）
+            max_entries: 保持する最大件数
+            resolve: 名前解決を行う関数。Noneの場合はsocket.getaddrinfo
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.resolve = resolve or socket.getaddrinfo
+        self.counts: Counter[str] = Counter()
+        self._entries: "OrderedDict[AddressKey, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def addresses(self, host: str, port: int, family: int = socket.AF_UNSPEC) -> List[str]:
+        """ホスト名を解決し、接続先のIPアドレスを解決結果の順に返します.
+
+        Args:
+            host: ホスト名
+            port: ポート番号
+            family: アドレスファミリー
+
+        Returns:
+            List[str]: IPアドレスのリスト
+
+        Raises:
+            OSError: 名前解決に失敗した場合
+        """
+        key = (host, port, family)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.counts["hit"] += 1
+                return list(entry[1])
+            self.counts["miss"] += 1
+        result = self.resolve(host, port, family, socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(str(sockaddr[0]) for *_, sockaddr in result))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+            self._entries.move_to_end(key)
+            self._evict(now)
+        return list(addresses)
+
+    def _evict(self, now: float) -> None:
+        """上限を超えた分のエントリを削除します. ロックを取得した状態で呼び出します.
+
+        Args:
+            now: 現在時刻（time.monotonic()）
+        """
+        if len(self._entries) <= self.max_entries:
+            return
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """保持している件数を返します.
+
+        Returns:
+            int: 件数
+        """
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """集計した件数を返します.
+
+        Returns:
+            Dict[str, int]: キャッシュを使用した件数（hit）と名前解決を行った件数（miss）
+        """
+        with self._lock:
+            return {"hit": self.counts["hit"], "miss": self.counts["miss"]}
@@ -0,0 +1,263 @@
+"""記事ページの配信元（ホスト）ごとの応答時間と障害を記録するモジュール."""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from config.settings import (
+    HOST_COOLDOWN_MAX_SECONDS,
+    HOST_COOLDOWN_SECONDS,
+    HOST_FAILURE_THRESHOLD,
+    HOST_HEALTH_TTL_SECONDS,
+    HOST_LATENCY_SAMPLES,
+    HOST_MIN_LATENCY_SAMPLES,
+    HOST_MIN_TIMEOUT,
+    HOST_TIMEOUT_MULTIPLIER,
+    HOST_TIMEOUT_PERCENTILE,
+    REQUEST_TIMEOUT,
+)
+from utils.cache import HOST_HEALTH_NAMESPACE, Cache, open_cache
+from utils.metrics import metrics, percentile
+
+# 記事ごとの問題であり、配信元の障害としては数えないステータスコード
+ARTICLE_LEVEL_STATUSES = (404, 410)
+
+
+class HostRecord:
+    """1つの配信元の記録です."""
+
+    __slots__ = (
+        "latencies",
+        "failures",
+        "opened_at",
+        "cooldown",
+        "probing",
+        "requests",
+        "errors",
+        "skipped",
+    )
+
+    def __init__(self, entry: Optional[Dict[str, Any]] = None) -> None:
+        """保存済みの記録から初期化します.
+
+        Args:
+            entry: 保存済みの記録。Noneの場合は空の記録
+        """
+        entry = entry or {}
+        self.latencies: List[float] = list(entry.get("latencies", []))  # 直近の応答時間（秒）
+        self.failures: int = entry.get("failures", 0)  # 連続した失敗の回数
+        self.opened_at: Optional[float] = entry.get("opened_at")  # 取得を停止した時刻（UNIX時間）
+        self.cooldown: float = entry.get("cooldown", HOST_COOLDOWN_SECONDS)  # 停止する時間（秒）
+        self.probing = False  # 停止後に再度試すリクエストの応答待ち
+        # この実行での件数（保存しない）
+        self.requests = 0
+        self.errors = 0
+        self.skipped = 0
+
+    def to_entry(self) -> Dict[str, Any]:
+        """保存する記録を返します.
+
+        Returns:
+            Dict[str, Any]: JSONに変換できる記録
+        """
+        return {
+            "latencies": [round(latency, 3) for latency in self.latencies],
+            "failures": self.failures,
+            "opened_at": self.opened_at,
+            "cooldown": self.cooldown,
+        }
+
+
+class HostHealth:
+    """配信元ごとの応答時間と障害を実行をまたいで記録するクラスです.
+
+    - 直近の応答時間の百分位数から、配信元ごとのタイムアウトを決めます
+    - HOST_FAILURE_THRESHOLD回続けて失敗（通信エラー、404/410以外の4xx/5xx）した配信元は、
+      リクエストを送る前に取得を取りやめます. 本文を抽出できないページは配信元の障害ではないため
+      失敗として数えません
+    - 停止してからHOST_COOLDOWN_SECONDSが経過した配信元には1件だけリクエストを送り、
+      成功すれば再開し、失敗すれば停止時間を倍にします
+
+    リダイレクトURLを返すホスト（news.google.comなど）は、多数の配信元の記事が共有するため記録しません.
+    """
+
+    def __init__(self, cache: Optional[Cache] = None, exempt_hosts: Iterable[str] = ()) -> None:
+        """記録を初期化します.
+
+        Args:
+            cache: 保存先のキャッシュ。Noneの場合は設定に従って生成
+            exempt_hosts: 記録せず、常にリクエストを許可するホスト
+        """
+        self.cache = cache or open_cache(HOST_HEALTH_NAMESPACE, ttl=HOST_HEALTH_TTL_SECONDS)
+        self.exempt_hosts = frozenset(host.lower() for host in exempt_hosts)
+        self._records: Dict[str, HostRecord] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        """URLのホストを返します.
+
+        Args:
+            url: 記事のURL
+
+        Returns:
+            str: 小文字にしたホスト
+        """
+        return urlsplit(url).netloc.lower()
+
+    def _record(self, host: str) -> HostRecord:
+        """ホストの記録を返します。初回は保存先から読み込みます（ロックを取得して呼び出す）.
+
+        Args:
+            host: ホスト
+
+        Returns:
+            HostRecord: 記録
+        """
+        record = self._records.get(host)
+        if record is None:
+            entry = self.cache.get(host)
+            record = HostRecord(entry if isinstance(entry, dict) else None)
+            self._records[host] = record
+        return record
+
+    def allow(self, url: str) -> bool:
+        """配信元にリクエストを送ってよいかどうかを返します.
+
+        停止中で再度試す時刻を過ぎている場合は、応答待ちのリクエストがなければ許可します.
+
+        Args:
+            url: 記事のURL
+
+        Returns:
+            bool: 送ってよい場合True
+        """
+        host = self.host(url)
+        if host in self.exempt_hosts:
+            return True
+        with self._lock:
+            record = self._record(host)
+            if record.opened_at is not None and (
+                record.probing or time.time() < record.opened_at + record.cooldown
+            ):
+                record.skipped += 1
+                metrics.count("host_health", "skipped")
+                return False
+            if record.opened_at is not None:
+                record.probing = True
+                metrics.count("host_health", "probed")
+            record.requests += 1
+            return True
+
+    def timeout(self, url: str, default: float = REQUEST_TIMEOUT) -> float:
+        """配信元の応答時間に応じたタイムアウトを返します.
+
+        Args:
+            url: 記事のURL
+            default: 応答時間の記録が少ない場合のタイムアウト（上限を兼ねる）
+
+        Returns:
+            float: タイムアウト（秒）
+        """
+        host = self.host(url)
+        if host in self.exempt_hosts:
+            return default
+        with self._lock:
+            return self._timeout(self._record(host), default)
+
+    @staticmethod
+    def _timeout(record: HostRecord, default: float) -> float:
+        """記録した応答時間からタイムアウトを求めます.
+
+        Args:
+            record: 配信元の記録
+            default: 応答時間の記録が少ない場合のタイムアウト（上限を兼ねる）
+
+        Returns:
+            float: タイムアウト（秒）
+        """
+        if len(record.latencies) < HOST_MIN_LATENCY_SAMPLES:
+            return default
+        latencies = sorted(record.latencies)
+        estimate = percentile(latencies, HOST_TIMEOUT_PERCENTILE) * HOST_TIMEOUT_MULTIPLIER
+        return min(default, max(HOST_MIN_TIMEOUT, estimate))
+
+    def record(self, url: str, status: Optional[int], latency: Optional[float]) -> None:
+        """1件の取得結果を記録します.
+
+        通信エラー（応答なし）と、404/410以外の400以上のステータスコードを失敗として数えます.
+
+        Args:
+            url: 記事のURL
+            status: ステータスコード。応答がなかった場合はNone
+            latency: 応答ヘッダーを受信するまでの時間（秒）。応答がなかった場合はNone
+        """
+        failed = status is None or (status >= 400 and status not in ARTICLE_LEVEL_STATUSES)
+        host = self.host(url)
+        if host in self.exempt_hosts:
+            return
+        with self._lock:
+            record = self._record(host)
+            if latency is not None:
+                record.latencies = (record.latencies + [latency])[-HOST_LATENCY_SAMPLES:]
+            if failed:
+                record.errors += 1
+                record.failures += 1
+                if record.probing:
+                    # 再度試して失敗した場合は、停止する時間を倍にする
+                    record.cooldown = min(HOST_COOLDOWN_MAX_SECONDS, record.cooldown * 2)
+                    record.opened_at = time.time()
+                elif record.opened_at is None and record.failures >= HOST_FAILURE_THRESHOLD:
+                    record.opened_at = time.time()
+                    metrics.count("host_health", "opened")
+            else:
+                record.failures = 0
+                record.opened_at = None
+                record.cooldown = HOST_COOLDOWN_SECONDS
+            record.probing = False
+            entry = record.to_entry()
+        self.cache.set(host, entry)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """この実行でリクエストを送ったか、取得を取りやめた配信元の記録を返します.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: ホストごとのリクエスト数、失敗数、取りやめた件数、
+                タイムアウト（秒）、取得を停止しているかどうか
+        """
+        with self._lock:
+            return {
+                host: {
+                    "requests": record.requests,
+                    "errors": record.errors,
+                    "skipped": record.skipped,
+                    "timeout": round(self._timeout(record, REQUEST_TIMEOUT), 1),
+                    "open": record.opened_at is not None,
+                }
+                for host, record in self._records.items()
+                if record.requests or record.skipped
+            }
+
+    def format_stats(self, limit: int = 10) -> str:
+        """失敗の多い配信元から順に、記録を表示用の文字列にします.
+
+        Args:
+            limit: 表示する配信元の数
+
+        Returns:
+            str: 「ホスト 取得/失敗/取りやめ タイムアウト」を並べた文字列
+        """
+        stats = self.stats()
+        hosts = sorted(
+            stats,
+            key=lambda h: (-(stats[h]["errors"] + stats[h]["skipped"]), -stats[h]["requests"]),
+        )
+        parts = []
+        for host in hosts[:limit]:
+            s = stats[host]
+            part = f"{host} {s['requests']}件/失敗{s['errors']}/取りやめ{s['skipped']} " f"{s['timeout']}秒"
+            parts.append(part + (" 停止中" if s["open"] else ""))
+        if len(hosts) > limit:
+            parts.append(f"他{len(hosts) - limit}件")
+        return ", ".join(parts)
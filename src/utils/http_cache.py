@@ -0,0 +1,131 @@
+"""記事ページの条件付きGETに使用するHTTPキャッシュを提供するモジュール."""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from config.settings import HTTP_CACHE_MAX_ENTRIES, HTTP_CACHE_TTL_SECONDS
+from utils.cache import HTTP_NAMESPACE, Cache, canonicalize_url, open_cache
+
+
+class HTTPCache:
+    """記事ページの検証子（ETag/Last-Modified）と抽出済みの本文を保持するキャッシュです.
+
+    保存済みのページには If-None-Match / If-Modified-Since を付けて再取得し、
+    304 Not Modified が返された場合は保存済みの本文を使用します.
+    実行ごとに次の件数を集計します.
+
+    - hit: 本文キャッシュから取得し、通信しなかった件数
+    - not_modified: 304が返され、保存済みの本文を使用した件数
+    - miss: ページ全体を取得した件数
+    - bytes_downloaded: ページ全体の取得で読み込んだバイト数
+    - bytes_saved: 304によって読み込まずに済んだバイト数（前回取得時のサイズ）
+    """
+
+    def __init__(self, cache: Optional[Cache] = None) -> None:
+        """キャッシュを初期化します.
+
+        Args:
+            cache: 保存先のキャッシュ。Noneの場合は設定に従って生成
+        """
+        self.cache = cache or open_cache(
+            HTTP_NAMESPACE, ttl=HTTP_CACHE_TTL_SECONDS, max_entries=HTTP_CACHE_MAX_ENTRIES
+        )
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """URLに対応する保存済みのエントリを返します.
+
+        Args:
+            url: 記事のURL
+
+        Returns:
+            Optional[Dict[str, Any]]: 検証子と本文。保存されていない場合はNone
+        """
+        return self.cache.get(canonicalize_url(url))
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """保存済みのエントリから条件付きリクエストのヘッダーを作成します.
+
+        Args:
+            entry: lookupで取得したエントリ
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since ヘッダー
+        """
+        headers: Dict[str, str] = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, response: Any, content: str, size: int) -> None:
+        """取得したページの検証子と本文を保存します.
+
+        検証子のないレスポンスは条件付きGETに使えないため保存しません.
+
+        Args:
+            url: 記事のURL
+            response: 200応答のrequests.Response
+            content: 抽出した本文
+            size: 読み込んだバイト数
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        self.cache.set(
+            canonicalize_url(url),
+            {"etag": etag, "last_modified": last_modified, "content": content, "size": size},
+        )
+
+    def refresh(self, url: str, entry: Dict[str, Any]) -> None:
+        """304応答を受けたエントリを保存し直し、有効期間を延長します.
+
+        Args:
+            url: 記事のURL
+            entry: lookupで取得したエントリ
+        """
+        self.cache.set(canonicalize_url(url), entry)
+
+    def record(self, event: str, size: int = 0) -> None:
+        """キャッシュの利用結果を集計します.
+
+        Args:
+            event: "hit"、"not_modified"、"miss" のいずれか
+            size: missでは読み込んだバイト数、not_modifiedでは読み込まずに済んだバイト数
+        """
+        with self._lock:
+            self.counts[event] += 1
+            if event == "miss":
+                self.counts["bytes_downloaded"] += size
+            elif event == "not_modified":
+                self.counts["bytes_saved"] += size
+
+    def stats(self) -> Dict[str, int]:
+        """集計した件数を返します.
+
+        Returns:
+            Dict[str, int]: hit/not_modified/miss の件数と読み込んだ・節約したバイト数
+        """
+        with self._lock:
+            return {
+                key: self.counts[key]
+                for key in ("hit", "not_modified", "miss", "bytes_downloaded", "bytes_saved")
+            }
+
+    def format_stats(self) -> str:
+        """集計結果を表示用の文字列にします.
+
+        Returns:
+            str: 集計結果
+        """
+        stats = self.stats()
+        return (
+            f"キャッシュ {stats['hit']}件, 304 {stats['not_modified']}件, 取得 {stats['miss']}件 "
+            f"(受信 {stats['bytes_downloaded'] / 1024:.0f}KB, 節約 {stats['bytes_saved'] / 1024:.0f}KB)"
+        )
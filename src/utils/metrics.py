@@ -0,0 +1,198 @@
+"""処理時間と件数を計測するモジュール.
+
+主要な処理（GNewsの検索、記事の取得と解析、フィルタリング、感情分析、Notionへの書き込み）の
+所要時間と件数を記録し、実行ごとに1つのJSONとして出力します.
+計測を無効にした場合（METRICS_ENABLED=false）は、何もしないオブジェクトを返すだけにして
+計測のオーバーヘッドをほぼなくします.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, TypeVar, cast
+
+from config.settings import METRICS_ENABLED
+from utils.logger import logger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Timer:
+    """with文で囲んだ処理の所要時間を記録するコンテキストマネージャーです."""
+
+    __slots__ = ("_metrics", "_name", "_started_at")
+
+    def __init__(self, metrics: "Metrics", name: str) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._started_at = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._metrics.observe(self._name, time.perf_counter() - self._started_at)
+
+
+class _NullTimer:
+    """計測が無効な場合に使用する、何もしないコンテキストマネージャーです."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def percentile(sorted_values: List[float], ratio: float) -> float:
+    """整列済みの値から百分位数を求めます（最近傍順位法）.
+
+    Args:
+        sorted_values: 昇順に並べた値
+        ratio: 0〜1の割合（p95なら0.95）
+
+    Returns:
+        float: 百分位数。値がない場合は0
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(ratio * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Metrics:
+    """処理時間と件数の計測クラスです.
+
+    スレッドセーフで、並行して実行される記事の取得やNotionへの書き込みからも使用できます.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED) -> None:
+        """計測クラスを初期化します.
+
+        Args:
+            enabled: 計測を有効にするかどうか
+        """
+        self.enabled = enabled
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._counts: Dict[str, Counter[str]] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def timer(self, name: str) -> Any:
+        """with文で囲んだ処理の所要時間を記録するコンテキストマネージャーを返します.
+
+        Args:
+            name: 処理の名前
+
+        Returns:
+            Any: コンテキストマネージャー（計測が無効な場合は何もしない）
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """関数の所要時間を記録するデコレーターを返します.
+
+        計測が無効な場合は関数をそのまま返すため、呼び出しのオーバーヘッドはありません.
+
+        Args:
+            name: 処理の名前
+
+        Returns:
+            Callable[[F], F]: デコレーター
+        """
+
+        def decorator(func: F) -> F:
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                started_at = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started_at)
+
+            return cast(F, wrapper)
+
+        return decorator
+
+    def observe(self, name: str, seconds: float) -> None:
+        """処理の所要時間を記録します.
+
+        Args:
+            name: 処理の名前
+            seconds: 所要時間（秒）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._durations[name].append(seconds)
+
+    def count(self, category: str, key: str, value: int = 1) -> None:
+        """件数を加算します.
+
+        Args:
+            category: 分類（"bytes"、"rejection_reasons"など）
+            key: 分類内の項目
+            value: 加算する値
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counts[category][key] += value
+
+    def reset(self) -> None:
+        """記録をすべて消去します（Lambdaのウォームスタート時に前回の記録を持ち越さないため）."""
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """記録した所要時間と件数を集計します.
+
+        Returns:
+            Dict[str, Any]: 処理ごとの件数・合計・p50/p95/最大（ミリ秒）と、分類ごとの件数
+        """
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self._durations.items()}
+            counts = {category: dict(counter) for category, counter in self._counts.items()}
+
+        timings = {}
+        for name, values in sorted(durations.items()):
+            timings[name] = {
+                "count": len(values),
+                "total_ms": round(sum(values) * 1000, 1),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+            }
+        return {"enabled": self.enabled, "timings": timings, "counts": counts}
+
+    def log_summary(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """集計結果を1行のJSONとしてログに出力します.
+
+        Args:
+            extra: 集計結果に追加する項目
+
+        Returns:
+            Dict[str, Any]: 出力した集計結果
+        """
+        summary = self.summary()
+        if extra:
+            summary.update(extra)
+        logger.info(json.dumps({"metrics": summary}, ensure_ascii=False))
+        return summary
+
+
+# プロセス全体で共有する計測クラス
+metrics = Metrics()
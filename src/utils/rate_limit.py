@@ -0,0 +1,75 @@
+"""トークンバケット方式のレート制限を提供するモジュール."""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """スレッドセーフなトークンバケットです.
+
+    1秒あたりrate個のトークンを補充し、最大capacity個まで蓄えます.
+    呼び出し側はリクエストの前にacquireでトークンを1つ取得します.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """バケットを初期化します.
+
+        Args:
+            rate: 1秒あたりに補充するトークン数
+            capacity: 蓄えられる最大トークン数。Noneの場合はrateと同じ（最低1）
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """経過時間に応じてトークンを補充します.
+
+        Args:
+            now: 現在時刻（time.monotonic()基準）
+        """
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """トークンを1つ取得します。取得できるまで待機します.
+
+        Args:
+            timeout: 最大待機時間（秒）。Noneの場合は取得できるまで待機
+
+        Returns:
+            bool: 取得できた場合True。タイムアウトした場合False
+        """
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            if give_up_at is not None:
+                remaining = give_up_at - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """指定秒数の間、すべての取得を停止します.
+
+        サーバーから429（Retry-After）を受け取った場合など、
+        全ワーカーの送信をまとめて止めたいときに使用します.
+
+        Args:
+            seconds: 停止する秒数
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
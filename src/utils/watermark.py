@@ -0,0 +1,126 @@
+"""検索キーワードごとに処理済みの記事の範囲（ハイウォーターマーク）を保持するモジュール."""
+
+import math
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Optional
+
+from config.settings import SEARCH_PERIOD_HOURS, WATERMARK_OVERLAP_SECONDS
+from utils.cache import WATERMARK_NAMESPACE, Cache, open_cache
+
+
+class Watermark(NamedTuple):
+    """1つのキーワードで処理済みの記事の範囲です."""
+
+    published_at: datetime  # 処理した記事の最新の公開日時
+    urls: Dict[str, datetime]  # 重ねて確認する期間内に処理した記事の正規化URLと公開日時
+    searched_at: datetime  # 最後に検索した日時
+
+
+class WatermarkStore:
+    """検索キーワードごとのハイウォーターマークを保持するクラスです.
+
+    前回までに処理した最新の公開日時より前の記事は取得せずに除外し、
+    GNewsの検索期間も前回の検索からの経過時間まで短縮します.
+    検索結果への反映が遅れた記事を取りこぼさないよう、最新の公開日時から
+    WATERMARK_OVERLAP_SECONDSだけ遡った記事はURLで照合し、未処理であれば処理します.
+    """
+
+    def __init__(
+        self, cache: Optional[Cache] = None, overlap: float = WATERMARK_OVERLAP_SECONDS
+    ) -> None:
+        """保存先を初期化します.
+
+        Args:
+            cache: 保存先のキャッシュ。Noneの場合は設定に従って生成
+            overlap: 最新の公開日時から遡って再確認する期間（秒）
+        """
+        self.cache = cache or open_cache(WATERMARK_NAMESPACE)
+        self.overlap = timedelta(seconds=overlap)
+
+    def get(self, query: str) -> Optional[Watermark]:
+        """キーワードのハイウォーターマークを返します.
+
+        Args:
+            query: 検索キーワード
+
+        Returns:
+            Optional[Watermark]: ハイウォーターマーク。記録がない場合や読み込めない場合はNone
+        """
+        entry = self.cache.get(query)
+        if not entry:
+            return None
+        try:
+            return Watermark(
+                datetime.fromisoformat(entry["published_at"]),
+                {url: datetime.fromisoformat(at) for url, at in entry["urls"].items()},
+                datetime.fromisoformat(entry["searched_at"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def period(self, watermark: Optional[Watermark], now: datetime) -> str:
+        """GNewsの検索期間を返します.
+
+        前回の検索からの経過時間（と重ねて確認する期間）を時間単位で切り上げ、
+        SEARCH_PERIOD_HOURSを上限とします.
+
+        Args:
+            watermark: キーワードのハイウォーターマーク
+            now: 現在日時
+
+        Returns:
+            str: GNewsのperiod（"3h"など）
+        """
+        if watermark is None:
+            return f"{SEARCH_PERIOD_HOURS}h"
+        gap = (now - watermark.searched_at + self.overlap).total_seconds() / 3600
+        return f"{min(SEARCH_PERIOD_HOURS, max(1, math.ceil(gap)))}h"
+
+    def is_processed(
+        self, watermark: Optional[Watermark], url: str, published_at: datetime
+    ) -> bool:
+        """記事が前回までに処理済みかどうかを返します.
+
+        Args:
+            watermark: キーワードのハイウォーターマーク
+            url: 記事の正規化URL
+            published_at: 記事の公開日時
+
+        Returns:
+            bool: 再確認する期間より前の記事か、期間内で処理済みのURLの場合True
+        """
+        if watermark is None:
+            return False
+        if url in watermark.urls:
+            return True
+        return published_at < watermark.published_at - self.overlap
+
+    def advance(
+        self,
+        query: str,
+        watermark: Optional[Watermark],
+        processed: Dict[str, datetime],
+        searched_at: datetime,
+    ) -> None:
+        """今回処理した記事でハイウォーターマークを更新します.
+
+        Args:
+            query: 検索キーワード
+            watermark: 検索前のハイウォーターマーク
+            processed: 今回処理した記事の正規化URLと公開日時
+            searched_at: 検索した日時
+        """
+        urls = dict(watermark.urls) if watermark else {}
+        urls.update(processed)
+        if not urls:
+            return
+        latest = max(urls.values())
+        threshold = latest - self.overlap
+        self.cache.set(
+            query,
+            {
+                "published_at": latest.isoformat(),
+                "urls": {url: at.isoformat() for url, at in urls.items() if at >= threshold},
+                "searched_at": searched_at.isoformat(),
+            },
+        )
@@ -0,0 +1,102 @@
+"""テスト共通の設定と、ローカルで起動する擬似Notion APIサーバーです."""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+# 応答の指定（ステータスコードと、429応答のRetry-Afterヘッダーの値）
+Response = Tuple[int, Optional[str]]
+
+
+class FakeNotionServer:
+    """pages.createに、指定した順にステータスコードを返す擬似Notion APIサーバーです.
+
+    指定した応答を使い切った後は、default_statusを返し続けます.
+    """
+
+    def __init__(self) -> None:
+        """サーバーを起動します."""
+        self.script: List[Response] = []
+        self.default: Response = (200, None)
+        self.requests: List[Tuple[float, int]] = []  # 受信時刻（time.monotonic()）と応答
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, retry_after = server._next()
+                if status == 200:
+                    payload: Dict[str, Any] = {"object": "page", "id": str(uuid.uuid4())}
+                else:
+                    payload = {
+                        "object": "error",
+                        "status": status,
+                        "code": "rate_limited" if status == 429 else "service_unavailable",
+                        "message": "Injected error",
+                    }
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if retry_after is not None:
+                    self.send_header("Retry-After", retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def respond(self, *responses: Response, default: Response = (200, None)) -> None:
+        """返す応答を指定します.
+
+        Args:
+            *responses: 順に返す応答
+            default: 指定した応答を使い切った後に返す応答
+        """
+        with self._lock:
+            self.script = list(responses)
+            self.default = default
+
+    def _next(self) -> Response:
+        """次に返す応答を取り出し、受信を記録します.
+
+        Returns:
+            Response: 返す応答
+        """
+        with self._lock:
+            response = self.script.pop(0) if self.script else self.default
+            self.requests.append((time.monotonic(), response[0]))
+            return response
+
+    def shutdown(self) -> None:
+        """サーバーを停止します."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def notion_server() -> Iterator[FakeNotionServer]:
+    """擬似Notion APIサーバーを起動します.
+
+    Yields:
+        FakeNotionServer: 起動したサーバー
+    """
+    server = FakeNotionServer()
+    yield server
+    server.shutdown()
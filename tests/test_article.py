@@ -0,0 +1,69 @@
+"""記事のレコードの派生値と、辞書への変換・復元のテストです."""
+
+from datetime import datetime
+
+from services.article import Article
+
+
+def make_article(content: str = "宇宙ロケットの打ち上げに成功。AI技術を活用した。") -> Article:
+    """記事を生成します.
+
+    Args:
+        content: 記事の本文
+
+    Returns:
+        Article: 記事
+    """
+    return Article(
+        title="ロケット打ち上げ",
+        link="https://example.com/news/1?utm_source=test",
+        snippet="説明文",
+        published_at=datetime(2024, 1, 1, 9, 30),
+        publisher="配信元",
+        content=content,
+        sentiment_score=0.8,
+    )
+
+
+def test_content_hash_and_token_count() -> None:
+    """本文のハッシュと語数を計算し、本文を設定し直すと再計算することを確認します."""
+    article = make_article()
+    same = make_article()
+
+    assert article.content_hash == same.content_hash
+    assert len(article.content_hash) == 32
+    # 宇宙 / ロケット / の / 打 / ち / 上 / げに / 成功 / AI / 技術 / を / 活用 / した
+    assert article.token_count == 13
+
+    article.content = "新しい本文"
+    assert article.content_hash != same.content_hash
+    assert article.token_count == 3
+    assert article.sentences == ["新しい本文"]
+
+    article.content = None
+    assert article.token_count == 0
+    assert article.content_hash == make_article("").content_hash
+
+
+def test_dict_round_trip_keeps_content() -> None:
+    """to_dictで変換した辞書から、本文を含めて記事を復元できることを確認します."""
+    article = make_article()
+
+    restored = Article.from_dict(article.to_dict())
+
+    assert restored.to_dict() == article.to_dict()
+    assert restored.content == article.content
+    assert restored.content_hash == article.content_hash
+    assert restored.published_at == datetime(2024, 1, 1, 9, 30)
+
+
+def test_from_dict_without_content() -> None:
+    """本文を含まない以前の辞書からは、本文の取得前の記事として復元することを確認します."""
+    data = make_article().to_dict()
+    del data["content"]
+
+    restored = Article.from_dict(data)
+
+    assert restored.content == ""
+    assert restored.to_dict()["content"] is None
+    assert restored.token_count == 0
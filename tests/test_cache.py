@@ -0,0 +1,149 @@
+"""実行をまたいで使用するキャッシュのテストです."""
+
+from pathlib import Path
+
+import pytest
+
+from utils.cache import SQLiteCache, canonicalize_url
+
+
+def accessed_at(cache: SQLiteCache, key: str) -> float:
+    """エントリの参照日時を返します.
+
+    Args:
+        cache: キャッシュ
+        key: キャッシュのキー
+
+    Returns:
+        float: 参照日時
+    """
+    row = cache._conn.execute(
+        "SELECT accessed_at FROM cache WHERE namespace = ? AND key = ?", (cache.namespace, key)
+    ).fetchone()
+    return float(row[0])
+
+
+def test_touch_is_batched(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """参照日時をtouch_interval秒以上経過した場合だけ更新することを確認します."""
+    now = [1000.0]
+    monkeypatch.setattr("utils.cache.time.time", lambda: now[0])
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "test", ttl=3600, touch_interval=60)
+    cache.set("a", 1)
+
+    now[0] = 1030.0
+    assert cache.get("a") == 1
+    assert accessed_at(cache, "a") == 1000.0
+
+    now[0] = 1060.0
+    assert cache.get("a") == 1
+    assert accessed_at(cache, "a") == 1060.0
+    cache.close()
+
+
+def test_eviction_leaves_headroom(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """上限を超えた場合に余裕の分までまとめて削除し、次の削除まで削除しないことを確認します."""
+    monkeypatch.setattr("utils.cache.CACHE_EVICT_RATIO", 0.2)
+    now = [1000.0]
+    monkeypatch.setattr("utils.cache.time.time", lambda: now[0])
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), "test", ttl=3600, max_entries=10)
+
+    for i in range(11):
+        now[0] += 1
+        cache.set(str(i), i)
+    # 上限の10件から、さらに2件（20%）を古い順に削除する
+    assert [str(i) in cache for i in range(11)] == [False] * 3 + [True] * 8
+
+    for i in range(11, 13):
+        now[0] += 1
+        cache.set(str(i), i)
+    assert cache._count_entries() == 10
+    cache.close()
+
+
+def test_count_is_restored_on_open(tmp_path: Path) -> None:
+    """開き直した場合も、上限を超えた分を削除することを確認します."""
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, "test", ttl=3600, max_entries=10)
+    for i in range(10):
+        cache.set(str(i), i)
+    cache.close()
+
+    cache = SQLiteCache(path, "test", ttl=3600, max_entries=5)
+    assert cache._count_entries() <= 5
+    cache.set("new", 1)
+    assert cache._count_entries() <= 5
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://Example.COM/news/1/", "https://example.com/news/1"),
+        ("https://example.com", "https://example.com/"),
+        ("https://example.com/a?b=2&a=1", "https://example.com/a?a=1&b=2"),
+        (
+            "https://example.com/a?utm_source=x&id=3&fbclid=y&gclid=z&ocid=w#top",
+            "https://example.com/a?id=3",
+        ),
+        ("  https://example.com/a?q=  ", "https://example.com/a?q="),
+        ("https://example.com/A/Path", "https://example.com/A/Path"),
+    ],
+)
+def test_canonicalize_url(url: str, expected: str) -> None:
+    """スキームとホストの小文字化、トラッキング用パラメータとフラグメントの除去、並べ替えを確認します."""
+    assert canonicalize_url(url) == expected
+
+
+def test_expired_entries_are_not_returned(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """有効期間を過ぎた値を返さず、開き直した時点で削除することを確認します."""
+    now = [1000.0]
+    monkeypatch.setattr("utils.cache.time.time", lambda: now[0])
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, "test", ttl=60)
+    cache.set("a", {"value": 1})
+
+    now[0] = 1060.0
+    assert cache.get("a") == {"value": 1}
+    now[0] = 1061.0
+    assert cache.get("a") is None
+    assert "a" not in cache
+    cache.close()
+
+    cache = SQLiteCache(path, "test", ttl=60)
+    assert cache._count_entries() == 0
+    cache.close()
+
+
+def test_least_recently_used_is_evicted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """件数上限を超えた場合に、最も古く参照されたエントリから削除することを確認します."""
+    now = [1000.0]
+    monkeypatch.setattr("utils.cache.time.time", lambda: now[0])
+    cache = SQLiteCache(
+        str(tmp_path / "cache.sqlite3"), "test", ttl=3600, max_entries=3, touch_interval=0
+    )
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.set(key, key)
+    now[0] += 1
+    assert cache.get("a") == "a"  # aを参照し、最も古く参照されたものをbにする
+    now[0] += 1
+    cache.set("d", "d")
+
+    assert [key in cache for key in ("a", "b", "c", "d")] == [True, False, True, True]
+    cache.close()
+
+
+def test_namespaces_are_separated(tmp_path: Path) -> None:
+    """同じファイルの名前空間ごとに値と件数上限が分かれることを確認します."""
+    path = str(tmp_path / "cache.sqlite3")
+    first = SQLiteCache(path, "first", ttl=3600, max_entries=1)
+    second = SQLiteCache(path, "second", ttl=3600, max_entries=1)
+    first.set("key", 1)
+    second.set("key", 2)
+    second.set("other", 3)
+
+    assert first.get("key") == 1
+    assert second.get("key") is None
+    assert second.get("other") == 3
+    first.close()
+    second.close()
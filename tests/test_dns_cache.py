@@ -0,0 +1,93 @@
+"""名前解決のキャッシュの有効期間と件数の上限のテストです."""
+
+import socket
+from typing import Any, List
+
+import pytest
+
+from utils.dns_cache import DNSCache
+
+
+class FakeResolver:
+    """ホスト名ごとに決まったIPアドレスを返し、呼び出しを記録する名前解決です."""
+
+    def __init__(self) -> None:
+        """名前解決を初期化します."""
+        self.calls: List[str] = []
+
+    def __call__(self, host: str, port: int, family: int, type: int) -> List[Any]:
+        """socket.getaddrinfoと同じ形式で結果を返します.
+
+        Args:
+            host: ホスト名
+            port: ポート番号
+            family: アドレスファミリー
+            type: ソケットの種類
+
+        Returns:
+            List[Any]: 解決結果
+
+        Raises:
+            socket.gaierror: ホスト名が"missing"で始まる場合
+        """
+        self.calls.append(host)
+        if host.startswith("missing"):
+            raise socket.gaierror("not found")
+        address = f"192.0.2.{len(host)}"
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port)),
+        ]
+
+
+def test_addresses_are_cached_until_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """有効期間内は名前解決を行わず、期限が切れると解決し直すことを確認します."""
+    now = [0.0]
+    monkeypatch.setattr("utils.dns_cache.time.monotonic", lambda: now[0])
+    resolver = FakeResolver()
+    cache = DNSCache(ttl=10, resolve=resolver)
+
+    assert cache.addresses("a.example", 443) == ["192.0.2.9"]
+    assert cache.addresses("a.example", 443) == ["192.0.2.9"]
+    now[0] = 11.0
+    cache.addresses("a.example", 443)
+
+    assert resolver.calls == ["a.example", "a.example"]
+    assert cache.stats() == {"hit": 1, "miss": 2}
+
+
+def test_failures_are_not_cached() -> None:
+    """名前解決に失敗した結果を保持しないことを確認します."""
+    resolver = FakeResolver()
+    cache = DNSCache(ttl=10, resolve=resolver)
+
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            cache.addresses("missing.example", 443)
+
+    assert resolver.calls == ["missing.example", "missing.example"]
+    assert len(cache) == 0
+
+
+def test_entries_are_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """上限を超えた場合に、期限切れのもの、最も古く参照されたものの順に削除することを確認します."""
+    now = [0.0]
+    monkeypatch.setattr("utils.dns_cache.time.monotonic", lambda: now[0])
+    resolver = FakeResolver()
+    cache = DNSCache(ttl=10, max_entries=2, resolve=resolver)
+
+    cache.addresses("a.example", 443)
+    cache.addresses("b.example", 443)
+    cache.addresses("c.example", 443)  # 最も古く参照されたa.exampleを削除
+    now[0] = 5.0
+    cache.addresses("d.example", 443)  # 有効期間内のc.exampleより古いb.exampleを削除
+    now[0] = 6.0
+    cache.addresses("c.example", 443)
+    now[0] = 12.0
+    cache.addresses("e.example", 443)  # 最も古く参照されたd.exampleではなく、期限切れのc.exampleを削除
+    resolver.calls.clear()
+    cache.addresses("d.example", 443)
+    cache.addresses("c.example", 443)
+
+    assert resolver.calls == ["c.example"]
+    assert len(cache) == 2
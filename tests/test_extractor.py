@@ -0,0 +1,54 @@
+"""記事ページのHTMLの文字コードの判定のテストです."""
+
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import pytest
+
+from services.extractor import decode, detect_encoding
+
+BODY = "<html><head><title>記事</title></head>" "<body><p>新しい技術で課題を解決しました。</p></body></html>"
+
+
+def make_response(headers: Dict[str, str], encoding: Optional[str] = None) -> Any:
+    """ヘッダーと文字コードだけを持つレスポンスを生成します.
+
+    Args:
+        headers: レスポンスヘッダー
+        encoding: requestsがContent-Typeヘッダーから求めた文字コード
+
+    Returns:
+        Any: レスポンス
+    """
+    return SimpleNamespace(headers=headers, encoding=encoding)
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "euc_jp", "cp932"])
+def test_detect_encoding_without_charset(encoding: str) -> None:
+    """文字コードの指定がないページを、読み込んだHTMLから判定することを確認します."""
+    html_bytes = BODY.encode(encoding)
+    response = make_response({"Content-Type": "text/html"}, "ISO-8859-1")
+
+    detected = detect_encoding(response, html_bytes)
+
+    assert detected == encoding
+    assert decode(html_bytes, detected) == BODY
+
+
+def test_detect_encoding_ignores_truncated_character() -> None:
+    """読み込みの上限で末尾の文字が途切れていても判定できることを確認します."""
+    html_bytes = BODY.encode("cp932")
+    truncated = html_bytes[: html_bytes.index("技".encode("cp932")) + 1]
+
+    assert detect_encoding(make_response({}), truncated) == "cp932"
+
+
+def test_detect_encoding_prefers_header_and_meta() -> None:
+    """Content-Typeヘッダーのcharset、<meta charset>の順に優先することを確認します."""
+    html_bytes = b'<html><head><meta charset="Shift_JIS"></head></html>'
+
+    with_charset = make_response({"Content-Type": "text/html; charset=EUC-JP"}, "EUC-JP")
+    without_charset = make_response({"Content-Type": "text/html"}, "ISO-8859-1")
+
+    assert detect_encoding(with_charset, html_bytes) == "EUC-JP"
+    assert detect_encoding(without_charset, html_bytes) == "Shift_JIS"
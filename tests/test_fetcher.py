@@ -0,0 +1,49 @@
+"""記事本文の並列取得の実行期限とスレッドプールの扱いのテストです."""
+
+import threading
+import time
+from typing import List, Optional
+
+from services.fetcher import ArticleFetcher
+from utils.deadline import Deadline
+
+
+def test_no_task_runs_after_return() -> None:
+    """期限切れで戻った後に、取得中だったタスクが結果を書き込まないことを確認します."""
+    written: List[str] = []
+    started = threading.Event()
+
+    def fetch(url: str, timeout: float) -> Optional[str]:
+        started.set()
+        time.sleep(0.3)
+        written.append(url)
+        return url
+
+    fetcher = ArticleFetcher(fetch, max_workers=1)
+    urls = [f"https://example.com/{i}" for i in range(3)]
+    results = fetcher.fetch_all(urls, deadline=Deadline.after(0.1))
+    count = len(written)
+    time.sleep(0.5)
+    fetcher.close()
+
+    assert started.is_set()
+    # 実行中だった1件は終わるまで待ち、開始していない2件は取り消す
+    assert results == [urls[0], None, None]
+    assert len(written) == count == 1
+
+
+def test_executor_is_shared_between_calls() -> None:
+    """複数回の取得で同じスレッドプールを使い、closeで終了することを確認します."""
+    threads: List[str] = []
+
+    def fetch(url: str, timeout: float) -> Optional[str]:
+        threads.append(threading.current_thread().name)
+        return url
+
+    fetcher = ArticleFetcher(fetch, max_workers=1)
+    assert fetcher.fetch_all(["https://a.example/1"]) == ["https://a.example/1"]
+    assert fetcher.fetch_all(["https://b.example/1"]) == ["https://b.example/1"]
+    fetcher.close()
+
+    assert len(set(threads)) == 1
+    assert all(not thread.is_alive() for thread in threading.enumerate() if thread.name in threads)
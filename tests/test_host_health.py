@@ -0,0 +1,126 @@
+"""配信元ごとの障害の記録（サーキットブレーカー）とタイムアウトのテストです."""
+
+from typing import List
+
+import pytest
+
+from config.settings import (
+    HOST_COOLDOWN_SECONDS,
+    HOST_FAILURE_THRESHOLD,
+    HOST_MIN_LATENCY_SAMPLES,
+    HOST_MIN_TIMEOUT,
+)
+from utils.cache import MemoryCache
+from utils.host_health import HostHealth
+
+URL = "https://news.example.com/article/1"
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    """HostHealthが参照する現在時刻を固定します.
+
+    Returns:
+        List[float]: 現在時刻（先頭の要素を書き換えて進める）
+    """
+    now = [1_000_000.0]
+    monkeypatch.setattr("utils.host_health.time.time", lambda: now[0])
+    return now
+
+
+def open_circuit(health: HostHealth) -> None:
+    """しきい値の回数だけ失敗させ、配信元の取得を停止させます.
+
+    Args:
+        health: 配信元の記録
+    """
+    for _ in range(HOST_FAILURE_THRESHOLD):
+        assert health.allow(URL)
+        health.record(URL, 503, 0.1)
+
+
+def test_circuit_opens_after_consecutive_failures(clock: List[float]) -> None:
+    """続けて失敗した配信元へのリクエストを取りやめることを確認します."""
+    health = HostHealth(MemoryCache())
+    for _ in range(HOST_FAILURE_THRESHOLD - 1):
+        health.record(URL, None, None)
+    health.record(URL, 200, 0.1)  # 成功すると連続した失敗の回数を戻す
+    for _ in range(HOST_FAILURE_THRESHOLD - 1):
+        health.record(URL, 500, 0.1)
+    assert health.allow(URL)
+
+    health.record(URL, 500, 0.1)
+
+    assert not health.allow(URL)
+    assert health.stats()["news.example.com"]["open"] is True
+    assert health.stats()["news.example.com"]["skipped"] == 1
+
+
+def test_article_level_statuses_are_not_failures(clock: List[float]) -> None:
+    """404/410は記事ごとの問題として、失敗に数えないことを確認します."""
+    health = HostHealth(MemoryCache())
+    for _ in range(HOST_FAILURE_THRESHOLD):
+        health.record(URL, 404, 0.1)
+        health.record(URL, 410, 0.1)
+
+    assert health.allow(URL)
+
+
+def test_probe_closes_circuit_on_success(clock: List[float]) -> None:
+    """停止時間の経過後に1件だけ試し、成功すれば再開することを確認します."""
+    health = HostHealth(MemoryCache())
+    open_circuit(health)
+
+    clock[0] += HOST_COOLDOWN_SECONDS
+    assert health.allow(URL)
+    assert not health.allow(URL)  # 応答待ちの間は他のリクエストを送らない
+    health.record(URL, 200, 0.1)
+
+    assert health.allow(URL)
+    assert health.stats()["news.example.com"]["open"] is False
+
+
+def test_failed_probe_doubles_cooldown(clock: List[float]) -> None:
+    """再度試して失敗した場合は、停止時間を倍にすることを確認します."""
+    health = HostHealth(MemoryCache())
+    open_circuit(health)
+
+    clock[0] += HOST_COOLDOWN_SECONDS
+    assert health.allow(URL)
+    health.record(URL, None, None)
+
+    clock[0] += HOST_COOLDOWN_SECONDS
+    assert not health.allow(URL)
+    clock[0] += HOST_COOLDOWN_SECONDS
+    assert health.allow(URL)
+
+
+def test_state_is_shared_across_runs(clock: List[float]) -> None:
+    """停止した状態を保存先に記録し、次の実行でも取得を取りやめることを確認します."""
+    cache = MemoryCache()
+    open_circuit(HostHealth(cache))
+
+    assert not HostHealth(cache).allow(URL)
+
+
+def test_exempt_hosts_are_not_recorded(clock: List[float]) -> None:
+    """リダイレクトURLのホストは記録せず、常にリクエストを許可することを確認します."""
+    health = HostHealth(MemoryCache(), exempt_hosts=["News.Example.com"])
+    open_circuit(health)
+
+    assert health.allow(URL)
+    assert health.stats() == {}
+
+
+def test_timeout_follows_latency(clock: List[float]) -> None:
+    """応答時間の記録が十分な場合は、その百分位数からタイムアウトを決めることを確認します."""
+    health = HostHealth(MemoryCache())
+    assert health.timeout(URL, default=10.0) == 10.0
+
+    for _ in range(HOST_MIN_LATENCY_SAMPLES):
+        health.record(URL, 200, 0.01)
+    assert health.timeout(URL, default=10.0) == HOST_MIN_TIMEOUT
+
+    for _ in range(HOST_MIN_LATENCY_SAMPLES):
+        health.record(URL, 200, 100.0)
+    assert health.timeout(URL, default=10.0) == 10.0
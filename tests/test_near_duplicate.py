@@ -0,0 +1,122 @@
+"""MinHashのLSHによる近似重複の判定のテストです."""
+
+import random
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from services.near_duplicate import (
+    NUM_PERMUTATIONS,
+    NearDuplicateIndex,
+    band_keys,
+    minhash,
+    shingles,
+)
+
+CHARS = "政府企業研究開発地域住民市場技術環境教育医療支援計画調査結果関係者専門家今後影響新しい成功発表"
+
+
+def make_text(seed: int, length: int = 400) -> str:
+    """乱数で記事本文に相当する文字列を生成します.
+
+    Args:
+        seed: 乱数シード
+        length: 文字数
+
+    Returns:
+        str: 生成した文字列
+    """
+    rng = random.Random(seed)
+    return "".join(rng.choice(CHARS) for _ in range(length))
+
+
+def edit(text: str, ratio: float, seed: int = 1) -> str:
+    """文字列の一部の文字を置き換えた転載記事に相当する文字列を返します.
+
+    Args:
+        text: 元の文字列
+        ratio: 置き換える文字の割合
+        seed: 乱数シード
+
+    Returns:
+        str: 置き換えた文字列
+    """
+    rng = random.Random(seed)
+    chars = list(text)
+    for i in rng.sample(range(len(chars)), int(len(chars) * ratio)):
+        chars[i] = "＊"
+    return "".join(chars)
+
+
+def jaccard(a: str, b: str) -> float:
+    """2つの文字列のシングルのJaccard係数を返します.
+
+    Args:
+        a: 文字列
+        b: 文字列
+
+    Returns:
+        float: Jaccard係数
+    """
+    first, second = shingles(a), shingles(b)
+    return len(first & second) / len(first | second)
+
+
+def test_shingles() -> None:
+    """空白を除いた3文字ずつのシングルを返すことを確認します."""
+    assert shingles("新 技術の開発") == {"新技術", "技術の", "術の開", "の開発"}
+    assert shingles("短い") == {"短い"}
+    assert shingles(" ") == set()
+
+
+def test_signature_estimates_jaccard() -> None:
+    """署名の一致する割合が、シングルのJaccard係数の推定になることを確認します."""
+    base = make_text(0)
+    for ratio in (0.02, 0.1, 0.3):
+        copy = edit(base, ratio)
+        matches = sum(x == y for x, y in zip(minhash(base), minhash(copy)))
+        assert abs(matches / NUM_PERMUTATIONS - jaccard(base, copy)) < 0.2
+
+
+@pytest.mark.parametrize("ratio", [0.0, 0.01, 0.03])
+def test_near_copies_are_duplicates(ratio: float) -> None:
+    """Jaccard係数の高い転載記事を近似重複と判定することを確認します."""
+    index = NearDuplicateIndex(None, ttl=3600)
+    base = make_text(0)
+    assert index.add_if_new(band_keys(minhash(base)))
+
+    assert jaccard(base, edit(base, ratio)) > 0.8
+    assert index.is_duplicate(band_keys(minhash(edit(base, ratio))))
+    assert not index.add_if_new(band_keys(minhash(edit(base, ratio))))
+    assert len(index) == 1
+
+
+def test_distinct_articles_are_not_duplicates() -> None:
+    """Jaccard係数の低い記事や、大きく書き換えた記事を近似重複と判定しないことを確認します."""
+    index = NearDuplicateIndex(None, ttl=3600)
+    base = make_text(0)
+    index.add_if_new(band_keys(minhash(base)))
+
+    others: List[str] = [make_text(seed) for seed in range(1, 20)] + [edit(base, 0.4)]
+    assert all(jaccard(base, other) < 0.3 for other in others)
+    assert not any(index.is_duplicate(band_keys(minhash(other))) for other in others)
+
+
+def test_index_is_persisted_and_expires(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """登録した記事をファイルから読み込み、有効期間を過ぎた記事を除外することを確認します."""
+    now = [1_000_000.0]
+    monkeypatch.setattr("services.near_duplicate.time.time", lambda: now[0])
+    path = str(tmp_path / "index.bin")
+    old, new = band_keys(minhash(make_text(0))), band_keys(minhash(make_text(1)))
+
+    index = NearDuplicateIndex(path, ttl=3600)
+    index.add_if_new(old)
+    now[0] += 1800
+    index.add_if_new(new)
+
+    now[0] += 1801  # oldだけが有効期間を過ぎる
+    reloaded = NearDuplicateIndex(path, ttl=3600)
+    assert not reloaded.is_duplicate(old)
+    assert reloaded.is_duplicate(new)
+    assert len(reloaded) == 1
@@ -0,0 +1,127 @@
+"""NotionWriterのリトライ・デッドレター・実行期限の扱いのテストです."""
+
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from conftest import FakeNotionServer
+from notion_client import Client
+
+from services.article import Article
+from services.notion import NotionClient
+from services.notion_index import NotionPageIndex
+from services.notion_writer import NotionWriter
+from utils.cache import MemoryCache
+from utils.deadline import Deadline
+
+
+def make_client(server: FakeNotionServer, tmp_path: Path) -> NotionClient:
+    """擬似サーバーに接続するNotionクライアントを生成します.
+
+    Args:
+        server: 擬似Notion APIサーバー
+        tmp_path: 索引ファイルを置くディレクトリ
+
+    Returns:
+        NotionClient: 空の索引から開始するクライアント
+    """
+    api = Client(auth="dummy", base_url=server.url, timeout_ms=5_000)
+    index = NotionPageIndex(str(tmp_path / "index.bin"))
+    index.load()  # 空の索引から開始し、データベースの読み込みは行わない
+    return NotionClient(seen_urls=MemoryCache(), client=api, page_index=index)
+
+
+def make_articles(count: int) -> List[Article]:
+    """保存する記事を生成します.
+
+    Args:
+        count: 記事数
+
+    Returns:
+        List[Article]: 記事のリスト
+    """
+    return [
+        Article(
+            title=f"記事{i}",
+            link=f"https://example.com/news/{uuid.uuid4()}",
+            snippet="説明文",
+            published_at=datetime(2024, 1, 1),
+            sentiment_score=1.0,
+        )
+        for i in range(count)
+    ]
+
+
+def test_retry_after_is_honored(notion_server: FakeNotionServer, tmp_path: Path) -> None:
+    """429応答のRetry-Afterの秒数だけ待ってからリトライすることを確認します."""
+    notion_server.respond((429, "0.6"))
+    writer = NotionWriter(make_client(notion_server, tmp_path), workers=1, requests_per_second=100)
+
+    writer.submit_all(make_articles(1))
+    dead_letters = writer.close()
+
+    assert dead_letters == []
+    assert writer.written == 1
+    assert writer.retries == 1
+    (first_at, first_status), (second_at, second_status) = notion_server.requests
+    assert (first_status, second_status) == (429, 200)
+    assert second_at - first_at >= 0.6
+
+
+def test_dead_letters_are_returned(notion_server: FakeNotionServer, tmp_path: Path) -> None:
+    """リトライしても429が続く記事がデッドレターとして返されることを確認します."""
+    notion_server.respond(default=(429, "0"))
+    items = make_articles(2)
+    writer = NotionWriter(
+        make_client(notion_server, tmp_path), workers=1, requests_per_second=100, max_retries=2
+    )
+
+    writer.submit_all(items)
+    dead_letters = writer.close()
+
+    assert [letter.item for letter in dead_letters] == items
+    assert all(letter.attempts == 3 for letter in dead_letters)
+    assert writer.written == 0
+    assert writer.pending == []
+    assert len(notion_server.requests) == 6
+
+
+def test_pending_is_filled_at_deadline(notion_server: FakeNotionServer, tmp_path: Path) -> None:
+    """Retry-Afterの待機が実行期限を超える記事が、未保存の記事として保持されることを確認します."""
+    notion_server.respond(default=(429, "30"))
+    items = make_articles(3)
+    writer = NotionWriter(
+        make_client(notion_server, tmp_path),
+        workers=1,
+        requests_per_second=100,
+        deadline=Deadline.after(1.0),
+    )
+
+    writer.submit_all(items)
+    dead_letters = writer.close()
+
+    assert dead_letters == []
+    assert writer.written == 0
+    assert sorted(item.link for item in writer.pending) == sorted(item.link for item in items)
+    # 期限を超える待機はせず、2件目以降はリクエストを送らずに保持する
+    assert len(notion_server.requests) == 1
+
+
+def test_is_saved_does_not_query_database(notion_server: FakeNotionServer, tmp_path: Path) -> None:
+    """索引を作成できなかった場合も、is_savedがデータベースを検索しないことを確認します."""
+    notion_server.respond((500, None))  # 索引の作成（databases.query）を失敗させる
+    api = Client(auth="dummy", base_url=notion_server.url, timeout_ms=5_000)
+    client = NotionClient(
+        seen_urls=MemoryCache(),
+        client=api,
+        page_index=NotionPageIndex(str(tmp_path / "index.bin")),
+    )
+    item = make_articles(1)[0]
+
+    assert client.is_saved(item) is False
+    assert [status for _, status in notion_server.requests] == [500]
+
+    # 索引にないURLの検索と作成は、レート制限の内側のupsert_pageで行う
+    assert client.upsert_page(item) == "created"
+    assert len(notion_server.requests) == 3
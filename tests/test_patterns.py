@@ -0,0 +1,131 @@
+"""複数の正規表現パターンを1回の走査で照合するPatternMatcherのテストです."""
+
+import re
+from typing import List, Optional, Sequence
+
+import pytest
+
+from config.settings import (
+    POOR_QUALITY_PATTERNS,
+    POSITIVE_IRRELEVANT_PATTERNS,
+    TREND_IRRELEVANT_PATTERNS,
+)
+from services.google_news import ADDITIONAL_IRRELEVANT_PATTERNS
+from services.patterns import PatternMatcher, _first_chars
+
+PATTERN_SETS = {
+    "trend": TREND_IRRELEVANT_PATTERNS + ADDITIONAL_IRRELEVANT_PATTERNS,
+    "positive": POSITIVE_IRRELEVANT_PATTERNS + ADDITIONAL_IRRELEVANT_PATTERNS,
+    "poor_quality": POOR_QUALITY_PATTERNS,
+}
+
+TEXTS = [
+    "",
+    "研究チームが新しい治療法の開発に成功した。",
+    "地域の住民が協力して公園を整備した。詳しくはこちら",
+    "本日は月曜日です。天気は晴れ。",
+    "2024年に開始した計画が順調に進んでいる。",
+    "新製品のキャンペーンを実施。[ PR ]",
+    "[PR] お得な情報をお届けします",
+    "お得なニュースと写真提供のお知らせ",
+    "企業とのコラボレーションで生まれた商品。提供：株式会社",
+    "クリックにより詳細を表示。タイアップ企画",
+    "ランキング形式でまとめ記事を紹介。過去の記事はアーカイブへ",
+    "更新日：3月1日。著作権は各社に帰属します",
+    "無料のセミナーで割引クーポンを配布。モニター募集",
+    "スポンサードコンテンツとプレスリリース",
+    "速報：日曜日に大会が開催",
+    "PRではなくprやＰＲと書かれた文",
+    "123年前の出来事を振り返る",  # 4桁の年号ではない
+]
+
+
+def legacy_search(patterns: Sequence[str], text: str) -> Optional[str]:
+    """従来の実装と同じく、パターンを順にre.searchで照合します.
+
+    Args:
+        patterns: 正規表現パターンのリスト
+        text: 照合する文字列
+
+    Returns:
+        Optional[str]: 一致したパターン。一致しない場合はNone
+    """
+    for pattern in patterns:
+        if re.search(pattern, text):
+            return pattern
+    return None
+
+
+def assert_same_as_legacy(patterns: List[str], texts: Sequence[str]) -> None:
+    """判定結果が従来の実装と一致し、返したパターンが実際に一致することを確認します.
+
+    返すパターンは、リストの順ではなくテキスト中で最初に一致したものです.
+
+    Args:
+        patterns: 正規表現パターンのリスト
+        texts: 照合する文字列のリスト
+    """
+    matcher = PatternMatcher(patterns)
+    for text in texts:
+        found = matcher.search(text)
+        assert (found is None) == (legacy_search(patterns, text) is None), text
+        if found is not None:
+            assert re.search(found, text), (found, text)
+
+
+@pytest.mark.parametrize("name", sorted(PATTERN_SETS))
+def test_settings_patterns_match_legacy_loop(name: str) -> None:
+    """設定の除外パターンで、判定結果が従来のパターンごとのループと一致することを確認します."""
+    patterns = PATTERN_SETS[name]
+    assert_same_as_legacy(patterns, TEXTS)
+    for pattern in patterns:  # 1つのパターンだけの場合は、返すパターンも一致する
+        matcher = PatternMatcher([pattern])
+        assert [matcher.search(text) for text in TEXTS] == [
+            legacy_search([pattern], text) for text in TEXTS
+        ]
+
+
+def test_settings_patterns_use_lookahead() -> None:
+    """設定の除外パターンはすべて先頭文字を特定でき、先読みが付くことを確認します."""
+    for patterns in PATTERN_SETS.values():
+        assert all(_first_chars(pattern) is not None for pattern in patterns)
+        regex = PatternMatcher(patterns)._regex
+        assert regex is not None and regex.pattern.startswith("(?=[")
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["x?y", "x*y", "x{0}y", "x{0,2}y", "x{,2}y", "x{,}y", "(?:ab|c){,3}d", "(?:a|b)?c"],
+)
+def test_optional_first_element(pattern: str) -> None:
+    """先頭の要素が0回になりうるパターンでは、先頭文字を特定しないことを確認します."""
+    assert _first_chars(pattern) is None
+    assert_same_as_legacy([pattern, "z"], ["y", "d", "c", "xy", "abd", "zzz", "w"])
+
+
+@pytest.mark.parametrize(
+    "pattern, chars",
+    [
+        ("x+y", {"x"}),
+        ("x{1}y", {"x"}),
+        ("x{2,}y", {"x"}),
+        ("x{1,3}y", {"x"}),
+        ("x{}y", {"x"}),  # Pythonでは{}は量指定子ではなくリテラル
+        (r"\d{4}年", {r"\d"}),
+        (r"\[\s*PR", {r"\["}),
+        ("(?:月|日)曜日", {"月", "日"}),
+        ("a|b", {"a", "b"}),
+    ],
+)
+def test_required_first_element(pattern: str, chars: set) -> None:
+    """先頭の要素が必ず現れるパターンでは、先頭文字を特定することを確認します."""
+    assert _first_chars(pattern) == chars
+    assert_same_as_legacy([pattern, "z"], ["xy", "xxxy", "x{}y", "1999年", "[ PR", "月曜日", "b"])
+
+
+def test_unsupported_patterns_disable_lookahead() -> None:
+    """先頭文字を特定できないパターンを含む場合は、先読みを付けずに照合することを確認します."""
+    patterns = ["広告", "[A-Z]{3}", ".*セール"]
+    regex = PatternMatcher(patterns)._regex
+    assert regex is not None and regex.pattern.startswith("(?P<p0>")
+    assert_same_as_legacy(patterns, ["ABC", "大セール", "広告", "abc"])
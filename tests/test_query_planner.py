@@ -0,0 +1,143 @@
+"""検索キーワードの選び方とまとめ方、まとめた検索結果の振り分けのテストです."""
+
+from typing import Dict
+
+import pytest
+
+from services.query_planner import QueryPlanner, QueryYield, attribute_results
+from utils.cache import MemoryCache
+
+
+def make_result(title: str, description: str = "") -> dict:
+    """GNewsの検索結果を生成します.
+
+    Args:
+        title: タイトル
+        description: 説明文
+
+    Returns:
+        dict: 検索結果
+    """
+    return {"title": title, "description": description}
+
+
+def test_attribute_results_to_best_matching_query() -> None:
+    """含まれる語の割合が最も高いキーワードに振り分けることを確認します."""
+    rocket = make_result("ロケットの打ち上げに成功", "宇宙開発の新たな一歩")
+    robot = make_result("介護ロボットを導入", "福祉の現場で活躍")
+    attributed, unmatched = attribute_results([rocket, robot], ["宇宙 ロケット", "ロボット 福祉"])
+
+    assert attributed == {"宇宙 ロケット": [rocket], "ロボット 福祉": [robot]}
+    assert unmatched == 0
+
+
+def test_attribute_results_tie_goes_to_earlier_query() -> None:
+    """同じ割合の場合は先に並んだキーワードに振り分けることを確認します."""
+    both = make_result("宇宙ロボットの開発")
+    attributed, unmatched = attribute_results([both], ["宇宙 ロケット", "ロボット 福祉"])
+
+    assert attributed == {"宇宙 ロケット": [both], "ロボット 福祉": []}
+    assert unmatched == 0
+
+
+def test_attribute_results_drops_unmatched() -> None:
+    """どのキーワードの語も含まない結果を振り分けずに除外することを確認します."""
+    matched = make_result("福祉ロボット", "")
+    unrelated = make_result("今日の天気", "全国的に晴れ")
+    attributed, unmatched = attribute_results([unrelated, matched], ["宇宙 ロケット", "ロボット 福祉"])
+
+    assert attributed == {"宇宙 ロケット": [], "ロボット 福祉": [matched]}
+    assert unmatched == 1
+
+
+def test_attribute_results_normalizes_width_and_case() -> None:
+    """全角・半角と大文字・小文字の違いを無視して照合することを確認します."""
+    item = make_result("ＡＩで新薬を発見")
+    attributed, unmatched = attribute_results([item], ["ai 新薬", "宇宙 ロケット"])
+
+    assert attributed["ai 新薬"] == [item]
+    assert unmatched == 0
+
+
+def pipeline_stats(results: int, duplicates: int = 0) -> Dict[str, Dict[str, int]]:
+    """絞り込みの段階ごとの入出力件数（Pipeline.stats()）を生成します.
+
+    Args:
+        results: 検索結果の件数
+        duplicates: 処理済みとして除外した件数
+
+    Returns:
+        Dict[str, Dict[str, int]]: 段階ごとの入出力件数
+    """
+    return {
+        "日付": {"in": results, "out": results},
+        "処理済み": {"in": results, "out": results - duplicates},
+    }
+
+
+def make_planner(exploration: float = 1.0) -> QueryPlanner:
+    """メモリ上に実績を保存する配分クラスを生成します.
+
+    Args:
+        exploration: 探索項の係数
+
+    Returns:
+        QueryPlanner: 減衰率0.5の配分クラス
+    """
+    return QueryPlanner(MemoryCache(), decay=0.5, exploration=exploration)
+
+
+def test_record_decays_previous_yield() -> None:
+    """検索のたびに過去の実績に減衰率を掛けて加えることを確認します."""
+    planner = make_planner()
+    planner.record("宇宙", pipeline_stats(10, duplicates=4), accepted=2)
+    assert planner.get("宇宙") == QueryYield(1.0, 10.0, 2.0, 4.0)
+
+    planner.record("宇宙", pipeline_stats(6), accepted=4)
+    stats = planner.get("宇宙")
+    assert stats == QueryYield(1.5, 11.0, 5.0, 2.0)
+    assert stats is not None and stats.accepted_per_query == pytest.approx(5.0 / 1.5)
+
+
+def test_plan_tries_unexplored_queries_first() -> None:
+    """検索したことのないキーワードを、設定の優先度の順に最優先で選ぶことを確認します."""
+    planner = make_planner()
+    planner.record("宇宙", pipeline_stats(10), accepted=10)
+
+    planned = planner.plan([("宇宙", 0), ("医療", 2), ("環境", 1)], budget=2, group_size=1)
+
+    assert planned == [("環境", 0), ("医療", 1)]
+
+
+def test_plan_ranks_by_yield_without_exploration() -> None:
+    """探索項がない場合は、1回あたりの新しい記事の件数の順に選ぶことを確認します."""
+    planner = make_planner(exploration=0.0)
+    for query, accepted in (("宇宙", 1), ("医療", 5), ("環境", 3)):
+        planner.record(query, pipeline_stats(10), accepted)
+
+    planned = planner.plan([("宇宙", 0), ("医療", 1), ("環境", 2)], budget=3, group_size=1)
+
+    assert [query for query, _ in planned] == ["医療", "環境", "宇宙"]
+
+
+def test_plan_explores_rarely_searched_queries() -> None:
+    """検索回数の少ないキーワードは、探索項によって実績の多いキーワードより先に選ぶことを確認します."""
+    planner = make_planner(exploration=5.0)
+    for _ in range(10):
+        planner.record("医療", pipeline_stats(10), accepted=4)
+    planner.record("宇宙", pipeline_stats(10), accepted=3)
+
+    assert planner.plan([("医療", 0), ("宇宙", 1)], budget=1, group_size=1) == [("宇宙", 0)]
+    # 探索項がない場合は実績の多いキーワードを選ぶ
+    planner.exploration = 0.0
+    assert planner.plan([("医療", 0), ("宇宙", 1)], budget=1, group_size=1) == [("医療", 0)]
+
+
+def test_plan_fills_groups_within_budget() -> None:
+    """実行枠を超えても、既存のまとまりに加えられるキーワードは選ぶことを確認します."""
+    planner = make_planner()
+
+    planned = planner.plan([("宇宙 ロケット", 0), ("宇宙", 1), ("ロボット 福祉", 2)], budget=1, group_size=2)
+
+    # 「宇宙」は「宇宙 ロケット」と区別できないため、同じまとまりに加えられない
+    assert planned == [("宇宙 ロケット", 0), ("ロボット 福祉", 1)]
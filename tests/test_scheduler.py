@@ -0,0 +1,88 @@
+"""キーワード検索のスケジューラーの持ち越しのテストです."""
+
+from typing import Any, List
+
+from services.article import Article
+from services.scheduler import KeywordScheduler
+from utils.deadline import DeadlineExceeded
+
+
+class FakeScraper:
+    """残りのクエリ数を指定でき、検索したキーワードを記録するスクレイパーです."""
+
+    def __init__(self, remaining: int, expired: bool = False) -> None:
+        """スクレイパーを初期化します.
+
+        Args:
+            remaining: 残りのクエリ数
+            expired: 検索時に実行期限を過ぎているかどうか
+        """
+        self.remaining = remaining
+        self.expired = expired
+        self.searched: List[str] = []
+
+    def remaining_queries(self) -> int:
+        """残りのクエリ数を返します.
+
+        Returns:
+            int: 残りのクエリ数
+        """
+        return self.remaining
+
+    def search_news(self, query: str, max_results: int) -> List[Article]:
+        """検索したキーワードを記録します.
+
+        Args:
+            query: 検索キーワード
+            max_results: 取得する最大記事数
+
+        Returns:
+            List[Article]: 空のリスト
+
+        Raises:
+            DeadlineExceeded: 実行期限を過ぎている場合
+        """
+        if self.expired:
+            raise DeadlineExceeded(query)
+        self.searched.append(query)
+        return []
+
+
+def make_scheduler(scraper: Any) -> KeywordScheduler:
+    """キーワードをまとめずに1件ずつ検索するスケジューラーを生成します.
+
+    Args:
+        scraper: 検索に使用するスクレイパー
+
+    Returns:
+        KeywordScheduler: スケジューラー
+    """
+    return KeywordScheduler(scraper, workers=1, group_size=1)
+
+
+def test_skipped_keywords_are_pending() -> None:
+    """残りのクエリ数に収まらないキーワードを、優先度順に持ち越すことを確認します."""
+    scraper = FakeScraper(remaining=1)
+    scheduler = make_scheduler(scraper)
+
+    scheduler.run([("宇宙", 2), ("医療", 0), ("環境", 1)])
+
+    assert scraper.searched == ["医療"]
+    assert scheduler.pending == [("環境", 1), ("宇宙", 2)]
+
+
+def test_all_keywords_are_pending_without_budget() -> None:
+    """クエリ数が残っていない場合に、すべてのキーワードを持ち越すことを確認します."""
+    scheduler = make_scheduler(FakeScraper(remaining=0))
+
+    assert scheduler.run([("宇宙", 1), ("医療", 0)]) == []
+    assert scheduler.pending == [("医療", 0), ("宇宙", 1)]
+
+
+def test_keywords_past_deadline_are_pending() -> None:
+    """実行期限を過ぎたキーワードとスキップしたキーワードを合わせて持ち越すことを確認します."""
+    scheduler = make_scheduler(FakeScraper(remaining=1, expired=True))
+
+    scheduler.run([("宇宙", 1), ("医療", 0)])
+
+    assert scheduler.pending == [("医療", 0), ("宇宙", 1)]
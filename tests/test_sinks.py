@@ -0,0 +1,176 @@
+"""記事をまとめて書き込む出力先（JSON Lines・SQLite）と、複数の出力先をまとめるクラスのテストです."""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from services.article import Article
+from services.sinks import RECORD_FIELDS, BufferedSink, JSONLSink, SinkGroup, SQLiteSink
+from utils.cache import MemoryCache
+
+
+def make_articles(count: int) -> List[Article]:
+    """保存する記事を生成します.
+
+    Args:
+        count: 記事数
+
+    Returns:
+        List[Article]: 本文と感情スコアを持つ記事のリスト
+    """
+    return [
+        Article(
+            title=f"記事{i}",
+            link=f"https://example.com/news/{i}?utm_source=test",
+            snippet="説明文",
+            published_at=datetime(2024, 1, 1, 9, i),
+            publisher="配信元",
+            content=f"本文{i}。",
+            sentiment_score=0.9 if i % 2 else 0.1,
+        )
+        for i in range(count)
+    ]
+
+
+def read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    """JSON Linesファイルを読み込みます.
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        List[Dict[str, Any]]: 1行ごとのレコード
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def read_sqlite(path: Path) -> List[Dict[str, Any]]:
+    """SQLiteファイルの記事の表を公開日時の順に読み込みます.
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        List[Dict[str, Any]]: 1行ごとのレコード
+    """
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(RECORD_FIELDS)} FROM articles ORDER BY published_at"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(zip(RECORD_FIELDS, row)) for row in rows]
+
+
+def test_jsonl_sink_round_trip(tmp_path: Path) -> None:
+    """batch_size件ごとと閉じる時に書き込み、記事の内容をそのまま読み戻せることを確認します."""
+    path = tmp_path / "out" / "articles.jsonl"
+    items = make_articles(3)
+    sink = JSONLSink(str(path), batch_size=2, flush_interval=0)
+
+    sink.submit_all(items)
+    assert len(read_jsonl(path)) == 2  # 2件たまった時点で書き込む
+    dead_letters = sink.close()
+
+    assert dead_letters == []
+    assert (sink.written, sink.batches) == (3, 2)
+    records = read_jsonl(path)
+    assert [record["canonical_url"] for record in records] == [item.canonical_url for item in items]
+    first = records[0]
+    assert list(first) == list(RECORD_FIELDS)
+    assert first["url"] == items[0].link
+    assert first["published_at"] == "2024-01-01T09:00:00"
+    assert (first["sentiment"], first["content"]) == ("neutral", "本文0。")
+
+
+def test_jsonl_sink_appends_to_existing_file(tmp_path: Path) -> None:
+    """既存のファイルを上書きせずに追記することを確認します."""
+    path = tmp_path / "articles.jsonl"
+    for item in make_articles(2):
+        sink = JSONLSink(str(path), flush_interval=0)
+        sink.submit(item)
+        sink.close()
+
+    assert [record["title"] for record in read_jsonl(path)] == ["記事0", "記事1"]
+
+
+def test_sqlite_sink_round_trip(tmp_path: Path) -> None:
+    """記事を書き込んで読み戻せ、同じ正規URLの記事は新しい内容で置き換えることを確認します."""
+    path = tmp_path / "articles.db"
+    seen_urls = MemoryCache()
+    items = make_articles(2)
+    sink = SQLiteSink(str(path), batch_size=10, flush_interval=0, seen_urls=seen_urls)
+
+    sink.submit_all(items)
+    sink.flush()
+    updated = make_articles(1)[0]
+    updated.title = "更新した記事"
+    updated.link = "https://example.com/news/0"  # クエリ文字列を除いても同じ正規URL
+    sink.submit(updated)
+    dead_letters = sink.close()
+
+    assert dead_letters == []
+    assert (sink.written, sink.batches) == (3, 2)
+    rows = read_sqlite(path)
+    assert [row["title"] for row in rows] == ["更新した記事", "記事1"]
+    assert rows[0]["url"] == "https://example.com/news/0"
+    assert (rows[1]["sentiment_score"], rows[1]["sentiment"]) == (0.9, "positive")
+    assert rows[1]["content"] == "本文1。"
+    assert all(seen_urls.get(item.canonical_url) for item in items)
+
+
+def test_failed_batch_becomes_dead_letters() -> None:
+    """書き込みに失敗したバッチの記事を、リトライせずにデッドレターとして返すことを確認します."""
+
+    class FailingSink(BufferedSink):
+        name = "failing"
+
+        def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+            raise OSError("disk full")
+
+    items = make_articles(2)
+    sink = FailingSink(batch_size=10, flush_interval=0)
+
+    sink.submit_all(items)
+    dead_letters = sink.close()
+
+    assert [letter.item for letter in dead_letters] == items
+    assert {(letter.error, letter.attempts, letter.sink) for letter in dead_letters} == {
+        ("disk full", 1, "failing")
+    }
+    assert sink.written == 0
+
+
+def test_sink_group_writes_to_all_sinks(tmp_path: Path) -> None:
+    """すべての出力先に書き込み、件数は先頭の出力先の値を返すことを確認します."""
+    jsonl_path = tmp_path / "articles.jsonl"
+    sqlite_path = tmp_path / "articles.db"
+    group = SinkGroup(
+        [
+            SQLiteSink(str(sqlite_path), flush_interval=0),
+            JSONLSink(str(jsonl_path), flush_interval=0),
+        ]
+    )
+    items = make_articles(3)
+
+    group.submit_all(items)
+    # ファイルの出力先は記事を持ち越さないため、前回の記事は書き込まない
+    group.carry_over(make_articles(5)[3:])
+    dead_letters = group.close()
+
+    assert dead_letters == []
+    assert group.written == 3
+    assert group.pending == []
+    stats = group.stats()
+    assert list(stats) == ["sqlite", "jsonl"]
+    assert {name: (s["written"], s["failed"]) for name, s in stats.items()} == {
+        "sqlite": (3, 0),
+        "jsonl": (3, 0),
+    }
+    assert group.format_stats().startswith("sqlite 3件/失敗0 ")
+    assert [row["title"] for row in read_sqlite(sqlite_path)] == ["記事0", "記事1", "記事2"]
+    assert [record["title"] for record in read_jsonl(jsonl_path)] == ["記事0", "記事1", "記事2"]
@@ -0,0 +1,100 @@
+"""記事ページの通信のリトライのテストです."""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+import httpx
+import pytest
+
+from services.transport import HTTPXTransport, RequestsTransport, Transport
+from utils.deadline import Deadline
+from utils.dns_cache import DNSCache
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    """/503には503、それ以外には200を返すサーバーを起動します.
+
+    Yields:
+        str: サーバーのURL
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            status = 503 if self.path == "/503" else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+TRANSPORTS: List[type] = [RequestsTransport, HTTPXTransport]
+
+
+@pytest.mark.parametrize("transport_class", TRANSPORTS)
+def test_retries_5xx(server: str, transport_class: type) -> None:
+    """503応答を最大リトライ回数までリトライすることを確認します."""
+    transport: Transport = transport_class(max_retries=2, backoff_factor=0.01)
+    with transport.get(f"{server}/503", timeout=2) as response:
+        assert response.status_code == 503
+    assert transport.stats()["retries"] == 2
+    transport.close()
+
+
+@pytest.mark.parametrize("transport_class", TRANSPORTS)
+def test_no_retry_past_deadline(server: str, transport_class: type) -> None:
+    """待機ともう1回分のタイムアウトが実行期限を超える場合はリトライしないことを確認します."""
+    transport: Transport = transport_class(
+        max_retries=2, backoff_factor=0.01, deadline=Deadline.after(1.0)
+    )
+    with transport.get(f"{server}/503", timeout=2) as response:
+        assert response.status_code == 503
+    assert transport.stats()["retries"] == 0
+    transport.close()
+
+
+def test_error_in_caller_block_is_not_retried(server: str) -> None:
+    """呼び出し側のwithブロックで発生した接続エラーがそのまま送出されることを確認します."""
+    transport = HTTPXTransport(max_retries=2, backoff_factor=0.01)
+    with pytest.raises(httpx.ConnectError, match="inner"):
+        with transport.get(f"{server}/ok", timeout=2):
+            raise httpx.ConnectError("inner")
+    assert transport.stats()["retries"] == 0
+    transport.close()
+
+
+@pytest.mark.parametrize("transport_class", TRANSPORTS)
+def test_dns_cache_is_scoped_to_transport(server: str, transport_class: type) -> None:
+    """DNSCacheがこの通信の接続だけで使用され、socket.getaddrinfoを置き換えないことを確認します."""
+    resolved: List[str] = []
+
+    def resolve(host: str, port: int, *args: object) -> list:
+        resolved.append(host)
+        return socket.getaddrinfo("127.0.0.1", port, *args)
+
+    original = socket.getaddrinfo
+    dns_cache = DNSCache(ttl=60, resolve=resolve)
+    transport: Transport = transport_class(max_retries=0, dns_cache=dns_cache)
+    port = server.rsplit(":", 1)[1]
+    for path in ("/a", "/b"):
+        with transport.get(f"http://news.invalid:{port}{path}", timeout=2) as response:
+            assert response.status_code == 200
+            assert b"".join(response.iter_content(1024)) == b"ok"
+    with transport.get(f"http://other.invalid:{port}/c", timeout=2) as response:
+        assert response.status_code == 200
+    transport.close()
+
+    assert socket.getaddrinfo is original
+    assert resolved == ["news.invalid", "other.invalid"]
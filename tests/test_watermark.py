@@ -0,0 +1,91 @@
+"""検索キーワードごとのハイウォーターマークのテストです."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from config.settings import SEARCH_PERIOD_HOURS
+from utils.cache import MemoryCache
+from utils.watermark import Watermark, WatermarkStore
+
+NOW = datetime(2024, 1, 1, 12, 0)
+OVERLAP = timedelta(minutes=30)
+
+
+@pytest.fixture
+def store() -> WatermarkStore:
+    """メモリ上に保存するハイウォーターマークの保存先を生成します.
+
+    Returns:
+        WatermarkStore: 30分を重ねて確認する保存先
+    """
+    return WatermarkStore(MemoryCache(), overlap=OVERLAP.total_seconds())
+
+
+def make_watermark(searched_at: datetime = NOW) -> Watermark:
+    """12時に公開された記事まで処理したハイウォーターマークを生成します.
+
+    Args:
+        searched_at: 最後に検索した日時
+
+    Returns:
+        Watermark: ハイウォーターマーク
+    """
+    return Watermark(NOW, {"https://example.com/latest": NOW}, searched_at)
+
+
+@pytest.mark.parametrize(
+    "elapsed, expected",
+    [
+        (timedelta(0), "1h"),
+        (timedelta(minutes=20), "1h"),
+        (timedelta(minutes=40), "2h"),
+        (timedelta(hours=3), "4h"),
+        (timedelta(days=2), f"{SEARCH_PERIOD_HOURS}h"),
+    ],
+)
+def test_period(store: WatermarkStore, elapsed: timedelta, expected: str) -> None:
+    """前回の検索からの経過時間と重ねる期間を切り上げ、上限で打ち切ることを確認します."""
+    assert store.period(make_watermark(), NOW + elapsed) == expected
+
+
+def test_period_without_watermark(store: WatermarkStore) -> None:
+    """記録がない場合は既定の検索期間を返すことを確認します."""
+    assert store.period(None, NOW) == f"{SEARCH_PERIOD_HOURS}h"
+
+
+def test_is_processed(store: WatermarkStore) -> None:
+    """重ねて確認する期間より前の記事と、期間内で処理済みのURLを処理済みとすることを確認します."""
+    watermark = make_watermark()
+
+    assert store.is_processed(watermark, "https://example.com/latest", NOW)
+    assert store.is_processed(watermark, "https://example.com/old", NOW - OVERLAP * 2)
+    # 期間内に遅れて反映された未処理の記事と、より新しい記事は処理する
+    assert not store.is_processed(watermark, "https://example.com/late", NOW - OVERLAP / 2)
+    assert not store.is_processed(watermark, "https://example.com/new", NOW + OVERLAP)
+    assert not store.is_processed(None, "https://example.com/old", NOW - OVERLAP * 2)
+
+
+def test_advance(store: WatermarkStore) -> None:
+    """最新の公開日時を進め、重ねて確認する期間より前のURLを破棄することを確認します."""
+    store.advance("宇宙", None, {"https://example.com/a": NOW}, NOW)
+    first = store.get("宇宙")
+    assert first == Watermark(NOW, {"https://example.com/a": NOW}, NOW)
+
+    later = NOW + timedelta(hours=1)
+    processed = {"https://example.com/b": later, "https://example.com/c": later - OVERLAP / 2}
+    store.advance("宇宙", first, processed, later)
+
+    assert store.get("宇宙") == Watermark(later, processed, later)
+
+
+def test_advance_without_processed_articles(store: WatermarkStore) -> None:
+    """処理した記事がない場合は記録しないことを確認します."""
+    store.advance("宇宙", None, {}, NOW)
+    assert store.get("宇宙") is None
+
+
+def test_get_ignores_broken_entry(store: WatermarkStore) -> None:
+    """読み込めない記録はないものとして扱うことを確認します."""
+    store.cache.set("宇宙", {"published_at": "invalid"})
+    assert store.get("宇宙") is None